@@ -12,13 +12,9 @@ from PIL import Image
 import threading
 import sys
 import time
-import gzip
-import requests
-import webbrowser
-import zipfile
-import tempfile
-import subprocess
 import re
+# requests, zipfile, gzip, tempfile, webbrowser y los módulos de deploy, backups y paks
+# se importan donde se usan: ninguno hace falta para abrir la ventana (ver `benchmarks.py startup`)
 try:
     from tkinterdnd2 import TkinterDnD, DND_ALL
 except ImportError:
@@ -38,61 +34,43 @@ theme = "dark"
 dynamic_text_color = ("black", "white")
 APP_VERSION = "1.2.0"
 
-
-from pathlib import Path as _Path
-ASSETS_DIR = _Path("assets")
+ASSETS_DIR = Path("assets")
 
 # Import Steam Helper
 try:
     from scripts.steam_helper import get_mhur_paks_path
 except ImportError:
     def get_mhur_paks_path(): return None
+
+from scripts.config import save_config, load_config, load_all
+from scripts.app_assets import ensure_assets_exist
+from scripts.i18n import t, set_language
+from scripts import installer
+from scripts.installer import MODS_DIR
+from scripts.mod_catalog import scan_mods
+from scripts.mods_watcher import create_watcher
+from scripts.mod_import import ImportQueue
+from scripts.install_queue import InstallQueue
+from scripts.search_index import SearchIndex
+from scripts.conflict_index import ConflictIndex, mod_signature, read_mod_assets
 # endregion
 
 # region --- Helper Functions ---
 def check_for_updates(root):
-    url = "https://raw.githubusercontent.com/Bacrian/PUM/refs/heads/main/version.json"
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data["version"] > APP_VERSION:
-                root.open_update_window(data)
-    except Exception as e:
-        print(f"Error upon looking for updates: {e}")
-
-def ensure_assets_exist():
-    try:
-        ASSETS_DIR.mkdir(exist_ok=True)
-        # default preview image for unknown mods
-        dp = ASSETS_DIR / "default_preview.png"
-        if not dp.exists():
-            img = Image.new("RGBA", (320, 180), (40, 40, 40, 255))
-            img.save(dp)
-
-        # small icons used by the UI
-        icons = {
-            "icon_black.png": (0, 0, 0, 255),
-            "icon_white.png": (255, 255, 255, 255),
-            "icon.png": (26, 159, 132, 255)
-        }
-        for name, col in icons.items():
-            p = ASSETS_DIR / name
-            if not p.exists():
-                img = Image.new("RGBA", (64, 64), col)
-                img.save(p)
-
-        ico = ASSETS_DIR / "icon.ico"
-        if not ico.exists():
-            try:
-                Image.open(ASSETS_DIR / "icon.png").save(ico)
-            except Exception:
-                Image.new("RGBA", (64, 64), (0, 0, 0, 255)).save(ico)
-    except Exception:
-        pass
+    # La petición va en un hilo: con la red lenta no congela la ventana recién abierta
+    def worker():
+        url = "https://raw.githubusercontent.com/Bacrian/PUM/refs/heads/main/version.json"
+        try:
+            import requests
+            response = requests.get(url, timeout=5)
+            if response.status_code == 200:
+                data = response.json()
+                if data["version"] > APP_VERSION:
+                    root.after(0, lambda: root.open_update_window(data))
+        except Exception as e:
+            print(f"Error upon looking for updates: {e}")
 
-# Ensure app assets exist at import time (creates placeholders if missing)
-ensure_assets_exist()
+    threading.Thread(target=worker, daemon=True).start()
 
 class ConsoleRedirector:
     def __init__(self, write_callback):
@@ -111,240 +89,277 @@ class ConsoleRedirector:
 
 # region --- Configuration Management ---
 # --- FUNCIONES DE CONFIGURACIÓN ---
-def save_config(path, selected_mods, mod_options=None, app_settings=None):
-    # Ensure defaults
-    if mod_options is None:
-        mod_options = {}
-
-    # Try to preserve any existing keys in config.json
-    data = {}
-    try:
-        if os.path.exists("config.json"):
-            with open("config.json", "r", encoding="utf-8") as rf:
-                data = json.load(rf)
-    except Exception:
-        data = {}
-
-    data.update({
-        "game_path": path,
-        "selected_mods": selected_mods,
-        "mod_options": mod_options
-    })
-
-    # If caller provided app_settings, set them; otherwise keep existing if present
-    if app_settings is not None:
-        data["app_settings"] = app_settings
-
-    with open("config.json", "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
-
-def load_config():
-    try:
-        if os.path.exists("config.json"):
-            with open("config.json", "r") as f:
-                data = json.load(f)
-                return (data.get("game_path", ""),
-                        data.get("selected_mods", []),
-                        data.get("mod_options", {}))
-    except Exception:
-        pass
-    return "", [], {}
-
-def load_app_settings():
-    try:
-        if os.path.exists("config.json"):
-            with open("config.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("app_settings", {}) or {}
-    except Exception:
-        pass
-    return {}
+# config.json y perfiles viven en scripts/config.py (compartido con la CLI)
 # endregion
 
 # region --- Localization ---
-LANG_CODE_MAP = {
-    "english": "en",
-    "en": "en",
-    "spanish": "es",
-    "es": "es",
-    "español": "es",
-    "espanol": "es",
-    "french": "fr",
-    "français": "fr",
-    "francais": "fr",
-    "fr": "fr",
-    "german": "de",
-    "deutsch": "de",
-    "de": "de",
-    "italian": "it",
-    "italiano": "it",
-    "it": "it",
-    "portuguese": "pt",
-    "português": "pt",
-    "portugues": "pt",
-    "pt": "pt",
-    "russian": "ru",
-    "русский": "ru",
-    "ru": "ru",
-    "chinese": "zh",
-    "中文": "zh",
-    "zh": "zh",
-    "japanese": "ja",
-    "日本語": "ja",
-    "ja": "ja",
-}
-
-def _guess_lang_code(name: str):
-    if not name:
-        return "en"
-    n = name.lower()
-    for k, v in LANG_CODE_MAP.items():
-        if k in n:
-            return v
-    # fallback to first two letters
-    return n[:2]
-
-def load_translations_for(language_name: str):
-    code = _guess_lang_code(language_name)
-    path = Path("lang") / f"{code}.json"
-    try:
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    # fallback to English built-in
-    try:
-        with open(Path("lang") / "en.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
-
-def list_available_languages():
-    """Return list of (code, display_name) for available language JSONs in ./lang.
-    Falls back to a sensible default list if ./lang is missing or incomplete.
-    """
-    mapping = {
-        "en": "English",
-        "es": "Español",
-        "fr": "Français",
-        "de": "Deutsch",
-        "it": "Italiano",
-        "pt": "Português",
-        "ru": "Русский",
-        "zh": "中文",
-        "ja": "日本語",
-    }
-    results = []
-    try:
-        lang_dir = Path("lang")
-        if lang_dir.exists():
-            for p in sorted(lang_dir.glob("*.json")):
-                code = p.stem
-                display = mapping.get(code, code)
-                results.append((code, display))
-    except Exception:
-        results = []
-
-    # Ensure common languages exist in the list in a sane order
-    for code in ["en", "es", "fr", "de", "it", "pt", "ru", "zh", "ja"]:
-        if not any(r[0] == code for r in results):
-            results.append((code, mapping.get(code, code)))
-
-    return results
-
-# Load initial translations using saved config (if any)
-_initial_app_settings = load_app_settings()
-TRANSLATIONS = load_translations_for(_initial_app_settings.get("language", "English"))
-
-def t(key: str, **kwargs):
-    txt = TRANSLATIONS.get(key, key)
-    try:
-        return txt.format(**kwargs) if kwargs else txt
-    except Exception:
-        return txt
+# Traducciones y t(): scripts/i18n.py (set_language() se llama al crear la App)
 # endregion
 
 # region --- Mod Scanning ---
-def mod_info():
+def mod_info(rebuild=False, on_batch=None):
     mods_folder = Path("./mods").resolve()
     if not mods_folder.exists(): mods_folder.mkdir()
     
+    # Solo lectura: los .pak sueltos los importa ImportQueue (scripts/mod_import.py).
+    # The catalog only re-parses modinfo.json files whose size/mtime changed.
     mod_list = []
-    # First, normalize any loose .pak files by wrapping them into a folder with an assets/ subfolder
     try:
-        for p in list(mods_folder.iterdir()):
-            if p.is_file() and p.suffix.lower() == ".pak":
-                    base_name = p.stem
-                    target_dir = mods_folder / base_name
-                    assets_dir = target_dir / "assets"
-                    # Create target structure if missing
-                    try:
-                        target_dir.mkdir(exist_ok=True)
-                        assets_dir.mkdir(exist_ok=True)
-                    except Exception:
-                        pass
+        mod_list = scan_mods(mods_folder, rebuild=rebuild, on_batch=on_batch)
+    except Exception as e:
+        print(f"Error scanning mods: {e}")
+    return mod_list
+# endregion
 
-                    # Move pak into assets (avoid overwriting existing file)
-                    dest = assets_dir / p.name
-                    if dest.exists():
-                        # find a non-colliding name
-                        i = 1
-                        while True:
-                            new_name = f"{p.stem}_{i}{p.suffix}"
-                            dest = assets_dir / new_name
-                            if not dest.exists():
-                                break
-                            i += 1
-                    try:
-                        shutil.move(str(p), str(dest))
-                    except Exception:
-                        # fallback to copy+unlink
-                        try:
-                            shutil.copy(str(p), str(dest))
-                            p.unlink()
-                        except Exception:
-                            pass
+# region --- Virtual Mod List ---
+class ModListView(customtkinter.CTkFrame):
+    """Virtualized mod list.
 
-                    # Create a simple modinfo.json if missing (set sensible defaults)
-                    info_path = target_dir / "modinfo.json"
-                    if not info_path.exists():
-                        simple = {
-                            "name": base_name,
-                            "version": "1.0",
-                            "author": "",
-                            "screenshot": "",
-                            "description": f"Imported from {p.name}",
-                            "category": "Other",
-                            "url": "",
-                            "has_options": False,
-                            "options": []
-                        }
-                        try:
-                            with open(info_path, "w", encoding="utf-8") as wf:
-                                json.dump(simple, wf, indent=4, ensure_ascii=False)
-                        except Exception:
-                            pass
-    except Exception:
-        pass
+    Only the rows that fit in the viewport get widgets; while scrolling those rows
+    are re-bound to other mods instead of creating new ones, so refreshing or
+    scrolling costs the same with 50 mods or 5,000. Items are the
+    {"mod_info", "variable"} entries kept in App.mod_checkboxes.
+    """
+    ROW_HEIGHT = 26
+    ROW_HOVER_COLOR = ("gray80", "gray25")
+
+    def __init__(self, master, app, **kwargs):
+        super().__init__(master, **kwargs)
+        self.app = app
+        self.items = []
+        self.first = 0
+        self.rows = []
+        self._visible = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.body = customtkinter.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew", padx=(5, 0), pady=5)
+        self.body.grid_columnconfigure(0, weight=0)
+        self.body.grid_columnconfigure(1, weight=0) # Star
+        self.body.grid_columnconfigure(2, weight=1) # Name expands
+        self.body.grid_columnconfigure(3, weight=0, minsize=110) # Author (fixed so recycled rows don't jitter)
+        self.body.grid_columnconfigure(4, weight=0) # Version
+        self.body.grid_columnconfigure(5, weight=0, minsize=34) # Conflict badge
+
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns", pady=5)
 
-    # Now iterate folders for mods (including those we may have just created)
-    for folder in mods_folder.iterdir():
+        # --- HEADERS ---
+        self.header_name = customtkinter.CTkButton(self.body, text=t("editor_mod_name"), font=("Arial", 11, "bold"),
+                                                   text_color="gray60", fg_color="transparent", hover_color=("gray80", "gray25"),
+                                                   anchor="w", height=20, command=lambda: self.app.sort_by("name"))
+        self.header_name.grid(row=0, column=2, padx=5, pady=(5,2), sticky="ew")
+        self.header_author = customtkinter.CTkButton(self.body, text=t("editor_mod_author"), font=("Arial", 11, "bold"),
+                                                     text_color="gray60", fg_color="transparent", hover_color=("gray80", "gray25"),
+                                                     anchor="w", height=20, command=lambda: self.app.sort_by("author"))
+        self.header_author.grid(row=0, column=3, padx=5, pady=(5,2), sticky="ew")
+        self.header_version = customtkinter.CTkLabel(self.body, text=t("editor_mod_version"), font=("Arial", 11, "bold"), text_color="gray60", anchor="w")
+        self.header_version.grid(row=0, column=4, padx=5, pady=(5,2), sticky="ew")
+
+        self.body.bind("<Configure>", self._on_resize)
+        # Mouse wheel (Windows/macOS use <MouseWheel>, X11 uses buttons 4/5)
+        self.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
+        self.bind_all("<Button-4>", self._on_mousewheel, add="+")
+        self.bind_all("<Button-5>", self._on_mousewheel, add="+")
+
+    # --- Public API ---
+    def update_headers(self, sort_key, sort_order):
+        name_txt = t("editor_mod_name")
+        auth_txt = t("editor_mod_author")
+        arrow = " ▼" if sort_order == "A-Z" else " ▲"
+        if sort_key == "name":
+            name_txt += arrow
+        elif sort_key == "author":
+            auth_txt += arrow
+        self.header_name.configure(text=name_txt)
+        self.header_author.configure(text=auth_txt)
+        self.header_version.configure(text=t("editor_mod_version"))
+
+    def set_items(self, items, keep_position=True):
+        self.items = items
+        if not keep_position:
+            self.first = 0
+        self._render()
+
+    def scroll_to(self, index):
+        self.first = index
+        self._render()
+
+    def refresh(self):
+        # Re-bind visible rows (e.g. conflict badges after toggling a mod)
+        self._render()
+
+    # --- Rows ---
+    def _row_height(self):
         try:
-            if folder.is_dir():
-                info_path = folder / "modinfo.json"
-                if info_path.exists():
-                    try:
-                        with open(info_path, "r", encoding="utf-8") as f:
-                            data = json.load(f)
-                            data["folder_path"] = folder 
-                            mod_list.append(data)
-                    except Exception:
-                        # If modinfo is corrupt, skip
-                        pass
+            return max(1, int(self._apply_widget_scaling(self.ROW_HEIGHT)))
+        except Exception:
+            return self.ROW_HEIGHT
+
+    def _build_row(self, index):
+        row = {"entry": None, "sig": None}
+        grid_row = index + 1
+
+        # Checkbox del mod
+        cb = customtkinter.CTkCheckBox(
+            self.body,
+            text="",
+            width=3,
+            height=3,
+            fg_color=self.app._accent_color(),
+            hover_color=self.app._hover_color(),
+            command=lambda r=row: self.app.update_select(changed_mod=r["entry"]["mod_info"]["name"])
+        )
+        # Botón de Favorito (Estrella)
+        btn_fav = customtkinter.CTkButton(
+            self.body,
+            text="☆",
+            width=24,
+            height=24,
+            fg_color="transparent",
+            text_color="gray50",
+            hover_color=self.ROW_HOVER_COLOR,
+            font=("Arial", 16),
+            command=lambda r=row: self.app.toggle_favorite(r["entry"]["mod_info"])
+        )
+        # Nombre, Autor, Versión
+        btn_name = customtkinter.CTkButton(self.body, text="", fg_color="transparent", hover=False,
+                                           text_color=dynamic_text_color, anchor="w", height=24,
+                                           command=lambda r=row: self.app.show_mod_details(r["entry"]["mod_info"]))
+        btn_author = customtkinter.CTkButton(self.body, text="", fg_color="transparent", hover=False,
+                                             text_color="gray60", anchor="w", height=24, width=110,
+                                             command=lambda r=row: self.app.show_mod_details(r["entry"]["mod_info"]))
+        btn_ver = customtkinter.CTkButton(self.body, text="", fg_color="transparent", hover=False,
+                                          text_color="gray60", anchor="w", height=24, width=60,
+                                          command=lambda r=row: self.app.show_mod_details(r["entry"]["mod_info"]))
+        # Conflictos con otros mods activos (mismo asset en varios paks)
+        badge = customtkinter.CTkLabel(self.body, text="", width=30, height=24, font=("Arial", 11, "bold"))
+
+        cb.grid(row=grid_row, column=0, padx=(2,0), pady=(2, 0), sticky="w")
+        btn_fav.grid(row=grid_row, column=1, padx=(0, 2), pady=(2, 0))
+        btn_name.grid(row=grid_row, column=2, padx=(5, 5), pady=(2, 0), sticky="ew")
+        btn_author.grid(row=grid_row, column=3, padx=(5, 5), pady=(2, 0), sticky="ew")
+        btn_ver.grid(row=grid_row, column=4, padx=(5, 5), pady=(2, 0), sticky="ew")
+        badge.grid(row=grid_row, column=5, padx=(0, 5), pady=(2, 0))
+        badge.bind("<Button-1>", lambda e, r=row: r["entry"] is not None and self.app.show_mod_details(r["entry"]["mod_info"]))
+
+        # Lógica para iluminar toda la fila al pasar el mouse
+        row_btns = [btn_fav, btn_name, btn_author, btn_ver]
+        def on_enter(e, btns=row_btns):
+            for b in btns: b.configure(fg_color=self.ROW_HOVER_COLOR)
+        def on_leave(e, btns=row_btns):
+            for b in btns: b.configure(fg_color="transparent")
+        def on_right_click(e, r=row):
+            if r["entry"] is not None:
+                self.app.show_context_menu(e, r["entry"]["mod_info"])
+
+        for b in row_btns:
+            b.bind("<Enter>", on_enter)
+            b.bind("<Leave>", on_leave)
+            b.bind("<Button-3>", on_right_click)
+
+        row["checkbox"] = cb
+        row["widgets"] = [cb] + row_btns + [badge]
+        row["badge"] = badge
+        row["fav"], row["name"], row["author"], row["version"] = row_btns
+        row["accent"] = self.app._accent_color()
+        row["visible"] = True
+        return row
+
+    def _bind_row(self, row, entry):
+        mod = entry["mod_info"]
+        is_fav = mod.get("is_favorite", False)
+        accent = self.app._accent_color()
+        active = entry["variable"].get() == 1
+        conflicts = self.app.conflict_index.conflict_count(entry.get("key"), self.app._is_key_active)
+        sig = (mod["name"], mod.get("author", "???"), mod.get("version", "1.0"), is_fav, accent, active, conflicts)
+        if not row["visible"]:
+            for w in row["widgets"]:
+                w.grid()
+            row["visible"] = True
+        same_entry = row["entry"] is entry
+        row["entry"] = entry
+        if same_entry and row["sig"] == sig:
+            return
+        row["sig"] = sig
+
+        if not same_entry:
+            row["checkbox"].configure(variable=entry["variable"])
+        if row["accent"] != accent:
+            row["checkbox"].configure(fg_color=accent, hover_color=self.app._hover_color())
+            row["accent"] = accent
+        row["fav"].configure(text="★" if is_fav else "☆", text_color="#FFD700" if is_fav else "gray50")
+        row["name"].configure(text=mod["name"])
+        row["author"].configure(text=mod.get("author", "???"))
+        row["version"].configure(text=f"v{mod.get('version', '1.0')}")
+        row["badge"].configure(text=f"⚠{conflicts}" if conflicts else "",
+                               text_color="#E8A33D" if active else "gray50")
+
+    def _hide_row(self, row):
+        row["entry"] = None
+        if row["visible"]:
+            for w in row["widgets"]:
+                w.grid_remove()
+            row["visible"] = False
+
+    def _render(self):
+        total = len(self.items)
+        visible = max(1, self._visible)
+        self.first = min(max(0, self.first), max(0, total - visible))
+        for i, row in enumerate(self.rows):
+            idx = self.first + i
+            if i < self._visible and idx < total:
+                self._bind_row(row, self.items[idx])
+            else:
+                self._hide_row(row)
+        if total > visible:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # --- Events ---
+    def _on_resize(self, event=None):
+        try:
+            header_h = self.header_name.winfo_height()
+            visible = max(1, (self.body.winfo_height() - header_h) // self._row_height())
+        except Exception:
+            return
+        if visible == self._visible:
+            return
+        self._visible = visible
+        while len(self.rows) < visible:
+            self.rows.append(self._build_row(len(self.rows)))
+        self._render()
+
+    def _on_scrollbar(self, *args):
+        try:
+            if args[0] == "moveto":
+                self.scroll_to(int(round(float(args[1]) * len(self.items))))
+            elif args[0] == "scroll":
+                amount = int(float(args[1]))
+                if len(args) > 2 and args[2] == "pages":
+                    amount *= max(1, self._visible - 1)
+                self.scroll_to(self.first + amount)
         except Exception:
             pass
-    return mod_list
+
+    def _on_mousewheel(self, event):
+        # bind_all: only react when the pointer is over this list
+        widget = str(event.widget)
+        own = str(self)
+        if widget != own and not widget.startswith(own + "."):
+            return
+        if getattr(event, "num", None) == 4:
+            step = -3
+        elif getattr(event, "num", None) == 5:
+            step = 3
+        elif sys.platform == "darwin":
+            step = -event.delta
+        else:
+            step = -3 * int(event.delta / 120) if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        self.scroll_to(self.first + step)
 # endregion
 
 # --- CLASE PRINCIPAL ---
@@ -357,13 +372,14 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         self.setting_window = None
         self.credits_window = None
         self.option_vars = {}
-        config_data = load_app_settings()
-        if config_data.get("check_updates", True):
-            self.after(200, lambda: check_for_updates(self))
 
-        # Cargar configuración inicial
-        self.current_path, self.saved_mods, self.mod_options = load_config()
-        self.app_settings = load_app_settings()
+        # Cargar configuración inicial (una sola lectura de config.json)
+        self.current_path, self.saved_mods, self.mod_options, self.app_settings = load_all()
+        set_language(self.app_settings.get("language", "English"))
+        # Placeholders de assets/: solo stats salvo en la primera ejecución
+        ensure_assets_exist(ASSETS_DIR)
+        if self.app_settings.get("check_updates", True):
+            self.after(200, lambda: check_for_updates(self))
 
         # --- Auto-detect path if missing ---
         if not self.current_path:
@@ -439,7 +455,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             # Buttons inside dropdown (pack into inner frame)
             self.pref_path = customtkinter.CTkButton(inner, text=t("game_path"), corner_radius=2, height=28, fg_color="transparent", command=self.select_path_callback)
             self.pref_path.pack(fill="x", padx=8, pady=(6,2))
-            self.pref_refresh = customtkinter.CTkButton(inner, text=t("refresh_mods"), corner_radius=2, height=28, fg_color="transparent", command=self.refresh_logic)
+            self.pref_refresh = customtkinter.CTkButton(inner, text=t("refresh_mods"), corner_radius=2, height=28, fg_color="transparent", command=lambda: self.refresh_logic(rebuild=True))
             self.pref_refresh.pack(fill="x", padx=8, pady=2)
             # download moved to topbar; don't add here
             self.pref_save = customtkinter.CTkButton(inner, text=t("save_selected_mods"), corner_radius=2, height=28, fg_color="transparent", command=self.deploy_mods)
@@ -458,7 +474,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             self.pref_dropdown_visible = False
             self.pref_path = customtkinter.CTkButton(self.pref_dropdown_frame, text=t("game_path"), corner_radius=2, height=28, fg_color="transparent", command=self.select_path_callback)
             self.pref_path.pack(fill="x", padx=8, pady=(6,2))
-            self.pref_refresh = customtkinter.CTkButton(self.pref_dropdown_frame, text=t("refresh_mods"), corner_radius=2, height=28, fg_color="transparent", command=self.refresh_logic)
+            self.pref_refresh = customtkinter.CTkButton(self.pref_dropdown_frame, text=t("refresh_mods"), corner_radius=2, height=28, fg_color="transparent", command=lambda: self.refresh_logic(rebuild=True))
             self.pref_refresh.pack(fill="x", padx=8, pady=2)
             # download moved to topbar; don't add here (fallback)
             self.pref_save = customtkinter.CTkButton(self.pref_dropdown_frame, text=t("save_selected_mods"), corner_radius=2, height=28, fg_color="transparent", command=self.deploy_mods)
@@ -496,13 +512,9 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
         # Frame de Lista de Mods (Izquierda)
         
-        self.modlist_frame = customtkinter.CTkScrollableFrame(self)
-        self.modlist_frame.grid(row=1, column=0, padx=10, pady=(10,0), sticky="nsew")
-        self.modlist_frame.grid_columnconfigure(0, weight=0)
-        self.modlist_frame.grid_columnconfigure(1, weight=0) # Star
-        self.modlist_frame.grid_columnconfigure(2, weight=1) # Name expands
-        self.modlist_frame.grid_columnconfigure(3, weight=0) # Author fits content
-        self.modlist_frame.grid_columnconfigure(4, weight=0) # Version fits content
+        # Lista virtualizada: solo crea widgets para las filas visibles
+        self.modlist_view = ModListView(self, self)
+        self.modlist_view.grid(row=1, column=0, padx=10, pady=(10,0), sticky="nsew")
 
         # Frame de botones de selección (Izquierda abajo)
 
@@ -535,7 +547,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
         # Input de Búsqueda
         self.search_var = customtkinter.StringVar()
-        self.search_var.trace_add("write", lambda *args: self.refresh_logic()) # Busca mientras escribes
+        self.search_var.trace_add("write", lambda *args: self._schedule_search()) # Busca mientras escribes (con debounce)
+        self._search_after_id = None
         
         self.search_entry = customtkinter.CTkEntry(
             self.modbuttons_frame, 
@@ -556,7 +569,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         self.cat_filter = customtkinter.CTkOptionMenu(
             self.filter_frame,
             values=self.cat_display_values,
-            command=lambda _: self.refresh_logic(),
+            command=lambda _: self._apply_view(),
             width=120,
             height=28,
             fg_color=self._accent_color(),
@@ -668,6 +681,18 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             command=self.import_profile
         )
         self.import_profile_btn.grid(row=0, column=6, padx=5, pady=5)
+
+        # Orden de carga del perfil (prioridad de los paks en ~mods)
+        self.load_order_btn = customtkinter.CTkButton(
+            self.filter_frame,
+            text="⇅",
+            width=28,
+            height=28,
+            fg_color=self._accent_color(),
+            hover_color=self._hover_color(),
+            command=self.open_load_order_window
+        )
+        self.load_order_btn.grid(row=0, column=7, padx=5, pady=5)
 # endregion
 
 # region -- Logo frame + integrated metadata editor --
@@ -755,9 +780,38 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         # Qué mod estamos viendo actualmente
         self.focused_mod = None
 
-        self.mod_checkboxes = []
+        # Estado de la lista por identidad de mod (nombre de carpeta): la
+        # IntVar y el dict mod_info sobreviven a cada refresco
+        self.mod_entries = {}
+        self.mod_checkboxes = []   # todas las entradas {"mod_info", "variable", "key"}
+        self.visible_entries = []  # entradas filtradas y ordenadas que muestra la lista
+        self.search_index = SearchIndex()  # índice en memoria sobre nombre/autor/categoría/descripción
+        # Escaneo en segundo plano: solo se aplican los resultados de la última generación
+        self._scan_generation = 0
+        self._scan_changed = set()
+        self._scan_callbacks = []
+        self._deploy_callbacks = []  # on_done del despliegue en curso (y los pedidos mientras corre)
+        self._mods_loaded = False  # True cuando el primer escaneo completo terminó
+        # Mapa de assets -> mods (leído de los índices de los paks, se actualiza por mod)
+        self.conflict_index = ConflictIndex()
+        self._conflict_generation = 0
+        self._conflict_box = None
         self.suppress_install_dialog = False
         self.is_batch_mode = False
+
+        # --- Cola de instalación (drag & drop): workers en segundo plano, diálogos en el hilo de Tk ---
+        def on_loose_paks(paks):
+            if len(paks) > 1: self.is_batch_mode = True
+        self.queue_win = None
+        self.queue_rows = {}
+        self.install_queue = InstallQueue(
+            MODS_DIR,
+            on_update=lambda item: self.after(0, lambda: self._update_queue_row(item)),
+            on_idle=lambda installed: self.after(0, lambda: self._on_installs_done(installed)),
+            confirm=self.ask_install_confirmation, on_collision=self.ask_collision_action,
+            on_loose_paks=on_loose_paks, after_install=self._intern_mods,
+            ui=lambda fn: self.after(0, fn))
+
         # Ensure window close/minimize behavior can use tray if enabled
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.bind("<Unmap>", self._on_unmap)
@@ -765,8 +819,21 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         self.refresh_logic() # Cargamos los mods por primera vez usando la lógica de refresco
         
         # --- Auto Refresh Watcher ---
-        self.last_mods_state = self._get_mods_state()
-        self.after(2000, self._poll_mods_changes)
+        self.mods_watcher = None
+        self._start_mods_watcher()
+
+        # --- Import de .pak sueltos (en segundo plano, una pasada al arrancar) ---
+        self.mod_importer = ImportQueue(
+            Path("./mods").resolve(),
+            lambda folders, paks: self.after(0, lambda: self._on_mods_imported(folders, paks)))
+        self.mod_importer.enqueue()
+        # Restos de instalaciones interrumpidas en mods/.pum_staging
+        threading.Thread(target=installer.clean_staging, args=(MODS_DIR,), daemon=True).start()
+        # Backups .zip de versiones anteriores -> snapshots (se listan, restauran y podan igual)
+        def migrate_backups():
+            from scripts.snapshot_backup import BACKUP_DIR, migrate_legacy
+            migrate_legacy(BACKUP_DIR)
+        threading.Thread(target=migrate_backups, daemon=True).start()
 
         # If console was enabled in saved settings, start it and show button
         try:
@@ -1024,39 +1091,102 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         # Parse dropped files
         if hasattr(event, 'data'):
             # tkinterdnd2 returns paths in curly braces if they have spaces
-            if event.data.startswith('{'):
-                files = self.tk.splitlist(event.data)
-            else:
-                files = self.tk.splitlist(event.data)
-            
-            self.suppress_install_dialog = False # Reiniciar flag para esta nueva carga
-            self.is_batch_mode = len(files) > 1
-            
-            any_processed = False
+            files = self.tk.splitlist(event.data)
+
+            paths = []
             unsupported = False
-            
             for f in files:
                 path = Path(f)
-                if path.is_dir():
-                    if self.install_mod_from_folder(path): any_processed = True
-                elif path.suffix.lower() == ".pak":
-                    if self.install_pak(path): any_processed = True
-                elif path.suffix.lower() == ".rar":
-                    if self.install_rar(path): 
-                        any_processed = True
-                    else:
-                        print("RAR extraction failed. Please install 7-Zip or WinRAR.")
-                        unsupported = False # Handled explicitly
-                elif path.suffix.lower() == ".zip":
-                    if self.install_archive(path): any_processed = True
+                if path.is_dir() or path.suffix.lower() in (".pak", ".zip", ".rar", ".7z"):
+                    paths.append(path)
                 else:
                     unsupported = True
-            
-            if unsupported and not any_processed:
-                print("File extension not supported! Supported: .pak, .zip, Folders")
+
+            if not paths:
+                if unsupported:
+                    print("File extension not supported! Supported: .pak, .zip, .rar, .7z, Folders")
+                return
+            # Una tanda nueva (cola vacía) reinicia el "no volver a preguntar"
+            if not self.install_queue.busy():
+                self.suppress_install_dialog = False
+                self.is_batch_mode = len(paths) > 1
             else:
-                if any_processed:
-                    self.refresh_logic()
+                self.is_batch_mode = True
+            self._show_install_queue()
+            self.install_queue.enqueue(paths)
+    # endregion
+
+    # region -- Install queue panel --
+    def _show_install_queue(self):
+        """Open (or raise) the panel listing queued installs."""
+        if self.queue_win is not None and self.queue_win.winfo_exists():
+            self.queue_win.lift()
+            return
+        self.install_queue.clear_finished()
+        self.queue_rows = {}
+        self.queue_win = customtkinter.CTkToplevel(self)
+        self.queue_win.title(t("install_queue_title"))
+        self.queue_win.geometry("460x360")
+        self.queue_win.after(200, lambda: self.queue_win.iconbitmap(str(ASSETS_DIR / "icon.ico")))
+        self.queue_win.geometry(f"+{self.winfo_x() + 80}+{self.winfo_y() + 80}")
+
+        self.queue_status_lbl = customtkinter.CTkLabel(self.queue_win, text="", font=("Arial", 12, "bold"))
+        self.queue_status_lbl.pack(pady=(12, 6))
+        self.queue_list = customtkinter.CTkScrollableFrame(self.queue_win, width=420, height=230)
+        self.queue_list.pack(fill="both", expand=True, padx=10)
+
+        btn_frame = customtkinter.CTkFrame(self.queue_win, fg_color="transparent")
+        btn_frame.pack(pady=10)
+        customtkinter.CTkButton(btn_frame, text=t("install_queue_cancel"), fg_color="#a51f45", hover_color="#8b132d",
+                                command=lambda: self.install_queue.cancel()).pack(side="left", padx=5)
+        customtkinter.CTkButton(btn_frame, text=t("close_button"), fg_color="gray50", hover_color="gray30",
+                                command=self.queue_win.destroy).pack(side="left", padx=5)
+
+        for item in self.install_queue.items():
+            self._update_queue_row(item)
+
+    def _update_queue_row(self, item):
+        """Called on the Tk thread whenever a queued install changes."""
+        if self.queue_win is None or not self.queue_win.winfo_exists():
+            return
+        row = self.queue_rows.get(item.id)
+        if row is None:
+            frame = customtkinter.CTkFrame(self.queue_list, fg_color="transparent")
+            frame.pack(fill="x", pady=2)
+            name = customtkinter.CTkLabel(frame, text=item.path.name, anchor="w", width=250)
+            name.grid(row=0, column=0, sticky="w")
+            status = customtkinter.CTkLabel(frame, text="", anchor="e", width=140)
+            status.grid(row=0, column=1, sticky="e")
+            bar = customtkinter.CTkProgressBar(frame, width=400, height=8, progress_color=self._accent_color())
+            bar.grid(row=1, column=0, columnspan=2, sticky="we")
+            row = self.queue_rows[item.id] = {"status": status, "bar": bar}
+        text = t(f"install_queue_{item.status}")
+        if item.status == "running" and item.progress:
+            text = f"{text} {int(item.progress * 100)}%"
+        elif item.status == "done" and not item.installed:
+            text = t("install_queue_skipped")
+        row["status"].configure(text=text, text_color="#d9534f" if item.status == "failed" else ("gray10", "gray90"))
+        row["bar"].set(item.progress)
+
+        items = self.install_queue.items()
+        left = sum(1 for i in items if i.status in ("queued", "running"))
+        self.queue_status_lbl.configure(text=t("install_queue_status", done=len(items) - left, total=len(items)))
+
+    def _on_installs_done(self, installed):
+        """Called on the Tk thread once the install queue drained: one refresh for the whole batch."""
+        try:
+            if self.mods_watcher is not None and installed:
+                self.mods_watcher.acknowledge([Path(d).name for d in installed])
+        except Exception:
+            pass
+        if installed:
+            self.refresh_logic()
+        failed = [i for i in self.install_queue.items() if i.status == "failed"]
+        if self.queue_win is not None and self.queue_win.winfo_exists():
+            self.queue_status_lbl.configure(text=t("install_queue_finished", count=len(installed), failed=len(failed)))
+            # Sin errores la ventana se cierra sola
+            if not failed:
+                self.queue_win.after(1500, lambda: self.queue_win is not None and self.queue_win.winfo_exists() and self.queue_win.destroy())
     # endregion
 
     # region --- Installation Logic ---
@@ -1094,6 +1224,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         return self.collision_result
 
     def ask_install_confirmation(self, mod_info):
+        from scripts.deploy import format_size
         # Verificar ajuste persistente
         if not self.app_settings.get("confirm_installs", True):
             return True
@@ -1104,7 +1235,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         # Crear ventana modal
         dialog = customtkinter.CTkToplevel(self)
         dialog.title(t("install_mod_title"))
-        dialog.geometry("400x300")
+        archive = mod_info.get("archive")
+        dialog.geometry("420x420" if archive else "400x300")
         dialog.after(200, lambda: dialog.iconbitmap(str(ASSETS_DIR / "icon.ico")))
         dialog.attributes("-topmost", True)
         dialog.resizable(False, False)
@@ -1117,6 +1249,17 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         details = f"{t('editor_mod_name')}: {mod_info.get('name', '???')}\n{t('editor_mod_author')}: {mod_info.get('author', '???')}\n{t('editor_mod_version')}: {mod_info.get('version', '???')}"
         customtkinter.CTkLabel(dialog, text=details, justify="left", text_color="gray70", wraplength=380).pack(pady=5)
 
+        # Contenido del archivo leído de sus metadatos (scripts/installer.py inspect_archive): aún no se extrajo nada
+        if archive:
+            paks = archive.get("paks", [])
+            lines = [t("install_archive_paks", count=len(paks), size=format_size(sum(size for _, size in paks)))]
+            lines += [f"  {name.rsplit('/', 1)[-1]}  ({format_size(size)})" for name, size in paks[:6]]
+            if len(paks) > 6:
+                lines.append(f"  ... (+{len(paks) - 6})")
+            if archive.get("skipped_size"):
+                lines.append(t("install_archive_skipped", size=format_size(archive["skipped_size"])))
+            customtkinter.CTkLabel(dialog, text="\n".join(lines), justify="left", text_color="gray60", wraplength=390).pack(pady=5, padx=10)
+
         # Checkbox para no volver a preguntar en esta tanda
         dont_ask_var = customtkinter.BooleanVar(value=False)
         if self.is_batch_mode:
@@ -1147,161 +1290,6 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
         self.wait_window(dialog)
         return self.install_confirmed
-
-    def install_pak(self, path):
-        try:
-            mod_name = path.stem
-            # Remove _P if present for the folder name to be clean
-            if mod_name.endswith("_P"): mod_name = mod_name[:-2]
-            
-            # Preparar info para confirmación
-            info = {
-                "name": mod_name,
-                "version": "1.0",
-                "author": "Unknown",
-                "description": f"Imported from {path.name}",
-                "category": "Other"
-            }
-            
-            if not self.ask_install_confirmation(info):
-                return False
-
-            dest_dir = Path("./mods") / mod_name
-            
-            if dest_dir.exists():
-                action = self.ask_collision_action(mod_name)
-                if action == "cancel":
-                    return False
-                elif action == "copy":
-                    mod_name = f"{mod_name}_{int(time.time())}"
-                    dest_dir = Path("./mods") / mod_name
-                elif action == "overwrite":
-                    try: shutil.rmtree(dest_dir)
-                    except: pass
-
-            assets_dir = dest_dir / "assets"
-            assets_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Ensure _P for the file
-            dest_filename = path.name
-            if not path.stem.endswith("_P"):
-                dest_filename = f"{path.stem}_P{path.suffix}"
-            
-            shutil.copy(path, assets_dir / dest_filename)
-            
-            # Create modinfo
-            with open(dest_dir / "modinfo.json", "w") as f:
-                json.dump(info, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"Error installing pak: {e}")
-            return False
-
-    def install_mod_from_folder(self, path, fallback_name=None):
-        # Recursive search for modinfo.json
-        for root, dirs, files in os.walk(path):
-            if "modinfo.json" in files and "assets" in dirs:
-                # Found a valid mod root
-                source = Path(root)
-                
-                # Leer info para confirmación
-                info = {"name": source.name, "author": "Unknown", "version": "1.0"}
-                try:
-                    with open(source / "modinfo.json", "r", encoding="utf-8") as f:
-                        info.update(json.load(f))
-                except: pass
-
-                if not self.ask_install_confirmation(info):
-                    return False
-
-                mod_name = source.name
-                # If source is a temp dir (random name), use fallback
-                if fallback_name and (len(mod_name) > 20 or "tmp" in mod_name):
-                    mod_name = fallback_name
-
-                dest = Path("./mods") / mod_name
-                if dest.exists():
-                    action = self.ask_collision_action(mod_name)
-                    if action == "cancel":
-                        return False
-                    elif action == "copy":
-                        dest = Path("./mods") / f"{mod_name}_{int(time.time())}"
-                    elif action == "overwrite":
-                        try: shutil.rmtree(dest)
-                        except: pass
-
-                shutil.copytree(source, dest)
-                return True
-        return False
-
-    def install_archive(self, path):
-        try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                with zipfile.ZipFile(path, 'r') as zip_ref:
-                    zip_ref.extractall(tmpdir)
-                
-                tmp_path = Path(tmpdir)
-                # Try to find a structured mod first
-                if self.install_mod_from_folder(tmp_path, fallback_name=path.stem):
-                    return True
-                
-                # If not found, look for loose .pak files and install them
-                paks = list(tmp_path.rglob("*.pak"))
-                if len(paks) > 1: self.is_batch_mode = True
-                any_paks = False
-                for pak in paks:
-                    if self.install_pak(pak): any_paks = True
-                return any_paks
-
-        except Exception as e:
-            print(f"Error installing archive: {e}")
-            return False
-
-    def install_rar(self, path):
-        try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                if self.extract_rar_external(path, tmpdir):
-                    tmp_path = Path(tmpdir)
-                    # Try to find a structured mod first
-                    if self.install_mod_from_folder(tmp_path, fallback_name=path.stem):
-                        return True
-                    
-                    # If not found, look for loose .pak files and install them
-                    paks = list(tmp_path.rglob("*.pak"))
-                    if len(paks) > 1: self.is_batch_mode = True
-                    any_paks = False
-                    for pak in paks:
-                        if self.install_pak(pak): any_paks = True
-                    return any_paks
-                return False
-        except Exception as e:
-            print(f"Error installing RAR: {e}")
-            return False
-
-    def extract_rar_external(self, rar_path, out_dir):
-        # Common paths for 7-Zip and WinRAR
-        seven_zip_paths = [r"C:\Program Files\7-Zip\7z.exe", r"C:\Program Files (x86)\7-Zip\7z.exe"]
-        winrar_paths = [r"C:\Program Files\WinRAR\WinRAR.exe", r"C:\Program Files (x86)\WinRAR\WinRAR.exe"]
-        
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        # Try 7-Zip
-        exe = next((p for p in seven_zip_paths if os.path.exists(p)), None)
-        if exe:
-            try:
-                subprocess.run([exe, "x", str(rar_path), f"-o{str(out_dir)}", "-y"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, startupinfo=startupinfo)
-                return True
-            except: pass
-
-        # Try WinRAR
-        exe = next((p for p in winrar_paths if os.path.exists(p)), None)
-        if exe:
-            try:
-                subprocess.run([exe, "x", "-ibck", "-y", str(rar_path), str(out_dir) + "\\"], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, startupinfo=startupinfo)
-                return True
-            except: pass
-        return False
     # endregion
 
     # region --- Preview Renderer ---
@@ -1478,6 +1466,10 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             profile_path = os.path.join("profiles", f"{current_profile}.json")
             if os.path.exists(profile_path):
                 os.remove(profile_path)
+            if current_profile in (self.app_settings.get("load_order") or {}):
+                orders = dict(self.app_settings["load_order"])
+                del orders[current_profile]
+                self.app_settings["load_order"] = orders
             
             # Refrescar y volver al perfil por defecto
             self.profile_menu.configure(values=self.get_saved_profiles())
@@ -1500,7 +1492,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
         export_data = {
             "profile_name": current_profile,
-            "mods": []
+            "mods": [],
+            "load_order": self._load_order(current_profile)
         }
         
         installed_map = {m["mod_info"]["name"]: m["mod_info"] for m in self.mod_checkboxes}
@@ -1570,6 +1563,9 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             tkinter.messagebox.showerror("Error", str(e))
             return
 
+        if data.get("load_order"):
+            self._set_load_order(data["load_order"], target_name)
+
         self.profile_menu.configure(values=self.get_saved_profiles())
         self.profile_var.set(target_name)
         self.load_profile_event(target_name)
@@ -1640,6 +1636,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         except: pass
 
     def _batch_download_worker(self, mods_list):
+        from scripts.deploy import format_size
         total = len(mods_list)
         success_count = 0
         
@@ -1668,126 +1665,37 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
                 target_file = files[0]
                 file_url = target_file.get("download_url")
                 
-                # 2. Download
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    # Determine filename
-                    filename = "download.archive"
-                    try:
-                        file_url = file_url.strip()
-                    except: pass
-                    if isinstance(file_url, str) and file_url.startswith('//'):
-                        file_url = 'https:' + file_url
-                    if isinstance(file_url, str) and not file_url.startswith('http'):
-                        file_url = 'https://' + file_url
-
-                    with requests.get(file_url, stream=True) as r:
-                        r.raise_for_status()
-                        if "Content-Disposition" in r.headers:
-                            cd = r.headers["Content-Disposition"]
-                            fname_match = re.search(r'filename="?([^"]+)"?', cd)
-                            if fname_match: filename = fname_match.group(1)
-                        
-                        if filename == "download.archive":
-                            url_name = file_url.split("/")[-1].split("?")[0]
-                            if url_name and "." in url_name: filename = url_name
-                        
-                        filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-                        local_zip = Path(tmpdir) / filename
-                        total_len = int(r.headers.get('content-length', 0))
-                        dl_len = 0
-                        start_time = time.time()
-                        
-                        with open(local_zip, 'wb') as f:
-                            for chunk in r.iter_content(chunk_size=8192):
-                                if getattr(self, '_batch_cancel_flag', False):
-                                    raise Exception("Cancelled")
-                                f.write(chunk)
-                                dl_len += len(chunk)
-                                
-                                elapsed = time.time() - start_time
-                                speed_str = ""
-                                if elapsed > 0:
-                                    speed = dl_len / elapsed
-                                    if speed < 1024: speed_str = f"{speed:.0f} B/s"
-                                    elif speed < 1024*1024: speed_str = f"{speed/1024:.1f} KB/s"
-                                    else: speed_str = f"{speed/(1024*1024):.1f} MB/s"
-
-                                if total_len > 0:
-                                    perc = dl_len / total_len
-                                    total_perc = (i + perc) / total
-                                    self.after(0, lambda p=perc, tp=total_perc, s=speed_str: [
-                                        self.batch_bar_current.set(p), 
-                                        self.batch_perc_lbl.configure(text=f"{int(p*100)}%"),
-                                        self.batch_speed_lbl.configure(text=s),
-                                        self.batch_bar_total.set(tp),
-                                        self.batch_total_perc_lbl.configure(text=f"{int(tp*100)}%")
-                                    ])
-                                else:
-                                    self.after(0, lambda s=speed_str: self.batch_speed_lbl.configure(text=s))
-                    
-                    # 3. Extract & Install
-                    extract_dir = Path(tmpdir) / "extracted"
-                    extract_dir.mkdir()
-                    extracted = False
-                    
-                    if zipfile.is_zipfile(local_zip):
-                        try:
-                            with zipfile.ZipFile(local_zip, 'r') as z: z.extractall(extract_dir)
-                            extracted = True
-                        except: pass
-                    
-                    if not extracted:
-                        if self.extract_rar_external(local_zip, extract_dir):
-                            extracted = True
-                            
-                    if not extracted:
-                        raise Exception("Extraction failed")
-                        
-                    paks = list(extract_dir.rglob("*.pak"))
-                    if not paks:
-                        raise Exception("No .pak files found")
-                        
-                    # Install
-                    mod_name = re.sub(r'[<>:"/\\|?*]', '', meta["name"]).strip()
-                    dest_mod = Path("./mods") / mod_name
-                    dest_assets = dest_mod / "assets"
-                    dest_assets.mkdir(parents=True, exist_ok=True)
-                    
-                    pak_list = []
-                    for p in paks:
-                        shutil.move(str(p), str(dest_assets / p.name))
-                        pak_list.append({"name": p.stem, "file": p.name})
-                        
-                    if len(pak_list) > 1:
-                        meta["has_options"] = True
-                        meta["options"] = pak_list
+                if not file_url:
+                    print(f"Skipping {name}: No download URL.")
+                    continue
+                meta = meta or {}
+                meta["url"] = url
+                start_time = time.time()
+
+                def on_bytes(done, total_len, i=i):
+                    # Cancelar corta la descarga; installer limpia el staging
+                    if getattr(self, '_batch_cancel_flag', False):
+                        raise Exception("Cancelled")
+                    elapsed = time.time() - start_time
+                    speed_str = f"{format_size(done / elapsed)}/s" if elapsed > 0 else ""
+                    if total_len > 0:
+                        perc = done / total_len
+                        total_perc = (i + perc) / total
+                        self.after(0, lambda p=perc, tp=total_perc, s=speed_str: [
+                            self.batch_bar_current.set(p),
+                            self.batch_perc_lbl.configure(text=f"{int(p*100)}%"),
+                            self.batch_speed_lbl.configure(text=s),
+                            self.batch_bar_total.set(tp),
+                            self.batch_total_perc_lbl.configure(text=f"{int(tp*100)}%")
+                        ])
                     else:
-                        meta["has_options"] = False
-                        meta["options"] = []
-                        
-                    # Image
-                    image_source = img_url
-                    if not image_source:
-                        try: image_source = self._fetch_mod_page_image(meta.get('url'))
-                        except: pass
-                        
-                    if image_source:
-                        try:
-                            img_data = requests.get(image_source, timeout=10).content
-                            with open(dest_mod / "preview.png", "wb") as f: f.write(img_data)
-                            meta["screenshot"] = "preview.png"
-                        except: pass
-                        
-                    # Save info
-                    try:
-                        meta.setdefault("source_urls", [])
-                        meta["source_urls"].append(file_url)
-                        if not meta.get("url"): meta["url"] = url
-                    except: pass
-                    
-                    with open(dest_mod / "modinfo.json", "w", encoding="utf-8") as f:
-                        json.dump(meta, f, indent=4, ensure_ascii=False)
-                        
+                        self.after(0, lambda s=speed_str: self.batch_speed_lbl.configure(text=s))
+
+                # 2. Descarga, extracción y estructura del mod (staging + rename): scripts/installer.py
+                dest_mod = installer.download_and_install(meta, [file_url], MODS_DIR, img_url=img_url,
+                                                          page_url=url, on_bytes=on_bytes)
+                self._intern_mods_async([dest_mod])
+
                 success_count += 1
                 
             except Exception as e:
@@ -1910,6 +1818,101 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             self.config_button.grid(row=0, column=1, padx=10, pady=20, sticky="ew") # Lo mostramos
         else:
             self.config_button.grid_remove() # Lo quitamos
+
+        # Contenido de los paks (footer + índice, leídos en segundo plano)
+        self._show_pak_details(mod)
+
+        # Assets que este mod comparte con otros mods
+        self._conflict_box = customtkinter.CTkTextbox(self.config_frame, height=110, width=320, corner_radius=5, font=("Consolas", 11))
+        self._conflict_box.grid(row=7, column=0, padx=10, pady=5, sticky="ew")
+        self._fill_conflicts()
+
+    def _fill_conflicts(self, max_paths=8):
+        box = self._conflict_box
+        mod = self.focused_mod
+        if box is None or mod is None:
+            return
+        try:
+            if not box.winfo_exists():
+                self._conflict_box = None
+                return
+        except Exception:
+            return
+        key = self._mod_key(mod)
+        others = self.conflict_index.conflicting_mods(key)
+        if key not in self.conflict_index:
+            text = t("conflicts_pending")
+        elif not others:
+            text = t("conflicts_none")
+        else:
+            # Primero los mods activos, luego por número de assets compartidos
+            order = sorted(others, key=lambda k: (not self._is_key_active(k), -others[k], k.lower()))
+            lines = [t("conflicts_title", count=self.conflict_index.conflict_count(key, self._is_key_active))]
+            for other in order:
+                entry = self.mod_entries.get(other)
+                name = entry["mod_info"]["name"] if entry else other
+                state = t("conflicts_enabled") if self._is_key_active(other) else t("conflicts_disabled")
+                lines.append(t("conflicts_line", name=name, state=state, count=others[other]))
+                shared = self.conflict_index.shared_assets(key, other)
+                for path, _mine, _theirs in shared[:max_paths]:
+                    lines.append(f"    {path}")
+                if len(shared) > max_paths:
+                    lines.append(f"    ... (+{len(shared) - max_paths})")
+            text = "\n".join(lines)
+        box.configure(state="normal")
+        box.delete("0.0", "end")
+        box.insert("0.0", text)
+        box.configure(state="disabled")
+
+    def _show_pak_details(self, mod, max_paths=40):
+        from scripts.deploy import format_size
+        from scripts.pak_reader import pak_info, asset_paths, save_cache as save_pak_cache
+        from scripts.pak_store import list_paks
+        pak_box = customtkinter.CTkTextbox(self.config_frame, height=140, width=320, corner_radius=5, font=("Consolas", 11))
+        pak_box.grid(row=6, column=0, padx=10, pady=5, sticky="ew")
+        pak_box.insert("0.0", t("pak_info_loading"))
+        pak_box.configure(state="disabled")
+        mods_folder = Path("./mods").resolve()
+        assets = Path(mod["folder_path"]) / "assets"
+
+        def worker():
+            lines = []
+            for name, real in list_paks(assets, mods_folder):
+                info = pak_info(real, mods_folder, save=False)
+                if not info or "error" in info:
+                    lines.append(f"{name}: {t('pak_info_unreadable')}")
+                    continue
+                if info["encrypted_index"]:
+                    lines.append(f"{name}: v{info['version']}, {t('pak_info_encrypted')}")
+                    continue
+                lines.append(t("pak_info_summary", name=name, version=info["version"], count=info["asset_count"],
+                               size=format_size(info["compressed_size"]), usize=format_size(info["uncompressed_size"])))
+                lines.append(f"  mount: {info['mount_point']}")
+                paths = asset_paths(info)
+                lines += [f"  {p}" for p in paths[:max_paths]]
+                if len(paths) > max_paths:
+                    lines.append(f"  ... (+{len(paths) - max_paths})")
+            save_pak_cache(mods_folder)
+            text = "\n".join(lines) if lines else t("editor_mod_no_pak")
+
+            def apply():
+                # El usuario pudo cambiar de mod mientras leíamos
+                if self.focused_mod is not mod:
+                    return
+                try:
+                    pak_box.configure(state="normal")
+                    pak_box.delete("0.0", "end")
+                    pak_box.insert("0.0", text)
+                    pak_box.configure(state="disabled")
+                except Exception:
+                    pass
+            try:
+                self.after(0, apply)
+            except Exception:
+                pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def toggle_from_details(self, mod, var):
         # Invertimos el valor de la checkbox original
         new_val = 0 if var.get() == 1 else 1
@@ -1924,10 +1927,11 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
     def toggle_all_mods(self):
         # Si hay alguno desactivado, activamos todos. Si no, desactivamos todos.
-        any_unselected = any(item["variable"].get() == 0 for item in self.mod_checkboxes)
+        # Solo afecta a los mods visibles con el filtro actual
+        any_unselected = any(item["variable"].get() == 0 for item in self.visible_entries)
         new_val = 1 if any_unselected else 0
         
-        for item in self.mod_checkboxes:
+        for item in self.visible_entries:
             item["variable"].set(new_val)
         
         # Actualizamos el guardado automático
@@ -1948,9 +1952,16 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         self.open_metadata_editor()
 
     def delete_mod(self, mod):
+        from scripts.pak_store import remove_tree as remove_pak_tree, seal_store
         if tkinter.messagebox.askyesno(t("delete_mod_title"), t("delete_mod_confirm", name=mod["name"])):
             try:
-                shutil.rmtree(mod["folder_path"])
+                # Los .pak del pak store son de solo lectura: rmtree normal falla en Windows
+                remove_pak_tree(mod["folder_path"])
+                if os.path.isdir(mod["folder_path"]):
+                    raise OSError(f"Could not remove {mod['folder_path']}")
+                if self.app_settings.get("pak_store", False):
+                    seal_store(Path("./mods").resolve())
+                self._acknowledge_mod_change(mod)
                 if self.focused_mod and self.focused_mod["name"] == mod["name"]:
                     self.focused_mod = None
                     for widget in self.config_frame.winfo_children():
@@ -1972,49 +1983,202 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             to_save = {k: v for k, v in mod.items() if k != "folder_path"}
             with open(json_path, "w", encoding="utf-8") as f:
                 json.dump(to_save, f, indent=4, ensure_ascii=False)
+            self._acknowledge_mod_change(mod)
         except Exception as e:
             print(f"Error saving favorite: {e}")
         
-        self.refresh_logic()
+        # El dict ya está actualizado en memoria: basta con reordenar la vista
+        self.search_index.update(self._mod_key(mod), mod)
+        self._apply_view()
     # endregion
 
     # region --- Refresh & Selection Logic ---
-    def refresh_logic(self):
-        # Limpiar UI
-        for widget in self.modlist_frame.winfo_children():
-            widget.destroy()
-        self.mod_checkboxes = []
+    @staticmethod
+    def _mod_key(mod):
+        # Identidad estable de un mod: el nombre de su carpeta en ./mods
+        try:
+            return Path(mod["folder_path"]).name
+        except Exception:
+            return mod.get("name", "")
+
+    def refresh_logic(self, rebuild=False, on_done=None):
+        """Rescan ./mods in a background thread (rebuild=True re-reads every modinfo.json).
+
+        Rows are merged into the list in batches as the scan reads them, so the
+        window never waits on the disk. `on_done` runs on the Tk thread once the
+        latest scan has been fully applied.
+        """
+        self._scan_generation += 1
+        generation = self._scan_generation
+        self._scan_changed = set()
+        if on_done is not None:
+            self._scan_callbacks.append(on_done)
+
+        def post(fn):
+            try:
+                self.after(0, fn)
+            except Exception:
+                pass  # La ventana ya se cerró
 
-        # Recargar datos
-        _, saved_selected_mods, _ = load_config()
-        loaded_mods = mod_info()
+        def worker():
+            try:
+                loaded_mods = mod_info(rebuild=rebuild,
+                                       on_batch=lambda batch: post(lambda: self._on_scan_batch(generation, batch)))
+            except Exception as e:
+                print(f"Error scanning mods: {e}")
+                loaded_mods = None
+            post(lambda: self._on_scan_done(generation, loaded_mods))
 
-        # Aplicar estadísticas
-        self.update_stats_display()
+        threading.Thread(target=worker, daemon=True).start()
 
-        # --- HEADERS ---
-        # Name Header
-        name_txt = t("editor_mod_name")
-        if self.sort_key == "name":
-            name_txt += " ▼" if self.sort_order == "A-Z" else " ▲"
-        btn_name = customtkinter.CTkButton(self.modlist_frame, text=name_txt, font=("Arial", 11, "bold"), 
-                                           text_color="gray60", fg_color="transparent", hover_color=("gray80", "gray25"),
-                                           anchor="w", height=20, command=lambda: self.sort_by("name"))
-        btn_name.grid(row=0, column=2, padx=5, pady=(5,2), sticky="ew")
-
-        # Author Header
-        auth_txt = t("editor_mod_author")
-        if self.sort_key == "author":
-            auth_txt += " ▼" if self.sort_order == "A-Z" else " ▲"
-        btn_auth = customtkinter.CTkButton(self.modlist_frame, text=auth_txt, font=("Arial", 11, "bold"), 
-                                           text_color="gray60", fg_color="transparent", hover_color=("gray80", "gray25"),
-                                           anchor="w", height=20, command=lambda: self.sort_by("author"))
-        btn_auth.grid(row=0, column=3, padx=5, pady=(5,2), sticky="ew")
+    def _on_scan_batch(self, generation, batch):
+        # Un escaneo más nuevo ya está en marcha: este lote está obsoleto
+        if generation != self._scan_generation:
+            return
+        changed = self._reconcile_mods(batch, partial=True)
+        if changed:
+            self._scan_changed |= changed
+            self.update_stats_display()
+            self._apply_view()
+
+    def _on_scan_done(self, generation, loaded_mods):
+        if generation != self._scan_generation:
+            return
+        if loaded_mods is not None:
+            changed = self._scan_changed | self._reconcile_mods(loaded_mods)
+            self._mods_loaded = True
+            self._update_conflicts()
 
-        customtkinter.CTkLabel(self.modlist_frame, text=t("editor_mod_version"), font=("Arial", 11, "bold"), text_color="gray60", anchor="w").grid(row=0, column=4, padx=5, pady=(5,2), sticky="ew")
+            # Aplicar estadísticas
+            self.update_stats_display()
+
+            self._apply_view()
+
+            # El panel del mod enfocado sobrevive al refresco; solo se redibuja si cambió
+            if self.focused_mod is not None:
+                key = self._mod_key(self.focused_mod)
+                if key not in self.mod_entries:
+                    self.focused_mod = None
+                    for widget in self.config_frame.winfo_children():
+                        widget.destroy()
+                elif key in changed:
+                    self.show_mod_details(self.focused_mod)
+            print(t("mod_list_refreshed"))
+
+        callbacks, self._scan_callbacks = self._scan_callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error after refresh: {e}")
+
+    def _reconcile_mods(self, loaded_mods, partial=False):
+        """Merge a fresh scan into self.mod_entries keyed by mod folder.
+
+        New mods get an entry (and IntVar) seeded from the saved selection,
+        removed mods are dropped and existing ones are updated in place, so the
+        IntVar, the focused mod dict and the rows bound to them stay valid.
+        With `partial=True` (a batch of a scan still running) nothing is removed.
+        Returns the set of keys that were added, removed or changed.
+        """
+        saved_selected_mods = None
+        seen = set()
+        changed = set()
+        for mod in loaded_mods:
+            key = self._mod_key(mod)
+            seen.add(key)
+            entry = self.mod_entries.get(key)
+            if entry is None:
+                if saved_selected_mods is None:
+                    _, saved_list, _ = load_config()
+                    saved_selected_mods = set(saved_list)
+                var = tkinter.IntVar(value=1 if mod["name"] in saved_selected_mods else 0)
+                self.mod_entries[key] = {"mod_info": mod, "variable": var, "key": key}
+                self.search_index.update(key, mod)
+                changed.add(key)
+            elif entry["mod_info"] != mod:
+                entry["mod_info"].clear()
+                entry["mod_info"].update(mod)
+                self.search_index.update(key, entry["mod_info"])
+                changed.add(key)
+
+        if not partial:
+            for key in [k for k in self.mod_entries if k not in seen]:
+                del self.mod_entries[key]
+                self.search_index.remove(key)
+                changed.add(key)
+
+        self.mod_checkboxes = list(self.mod_entries.values())
+        return changed
+
+    def _is_key_active(self, key):
+        entry = self.mod_entries.get(key)
+        return entry is not None and entry["variable"].get() == 1
+
+    def _update_conflicts(self):
+        """Bring the conflict index in line with mod_entries.
+
+        Removed mods leave the index right away; mods whose paks changed
+        (by name/size/mtime) are re-read from their pak indexes in a worker.
+        """
+        from scripts.pak_reader import save_cache as save_pak_cache
+        for key in [k for k in self.conflict_index.keys() if k not in self.mod_entries]:
+            self.conflict_index.remove(key)
+        self._conflict_generation += 1
+        generation = self._conflict_generation
+        mods_folder = Path("./mods").resolve()
+        todo = [(key, entry["mod_info"]["folder_path"], self.conflict_index.signature(key))
+                for key, entry in self.mod_entries.items()]
+
+        def worker():
+            updates = {}
+            for key, folder, known in todo:
+                if generation != self._conflict_generation:
+                    return  # Hay un recálculo más nuevo en marcha
+                try:
+                    sig = mod_signature(folder, mods_folder)
+                    if sig != known:
+                        updates[key] = (read_mod_assets(folder, mods_folder), sig)
+                except Exception as e:
+                    print(f"Error reading paks of {key}: {e}")
+            save_pak_cache(mods_folder)
+            if updates:
+                try:
+                    self.after(0, lambda: self._apply_conflicts(generation, updates))
+                except Exception:
+                    pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _apply_conflicts(self, generation, updates):
+        if generation != self._conflict_generation:
+            return
+        for key, (assets, sig) in updates.items():
+            if key in self.mod_entries:
+                self.conflict_index.set_mod(key, assets, sig)
+        self.modlist_view.refresh()
+        self._fill_conflicts()
+
+    def _schedule_search(self):
+        # Debounce: solo filtramos cuando el usuario deja de teclear un momento
+        if self._search_after_id is not None:
+            try:
+                self.after_cancel(self._search_after_id)
+            except Exception:
+                pass
+        self._search_after_id = self.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
+        self._apply_view()
+
+    def _apply_view(self):
+        """Filter and sort the in-memory entries and push them to the list (no disk access)."""
+        # --- HEADERS ---
+        self.modlist_view.update_headers(self.sort_key, self.sort_order)
 
         # --- APLICAR FILTROS ---
-        search_term = self.search_var.get().lower()
+        search_term = self.search_var.get().strip()
         # Map displayed (localized) category back to canonical category key for matching
         selected_cat_display = self.cat_filter.get()
         selected_cat = None
@@ -2024,127 +2188,46 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         except Exception:
             selected_cat = selected_cat_display
 
-        filtered_mods = []
-        for mod in loaded_mods:
-            name_match = search_term in mod["name"].lower()
-            cat_match = selected_cat == "All Categories" or mod.get("category") == selected_cat
-            if name_match and cat_match:
-                filtered_mods.append(mod)
+        def cat_match(entry):
+            return selected_cat == "All Categories" or entry["mod_info"].get("category") == selected_cat
 
         # --- APLICAR ORDEN ---
-        # 1. Ordenar por criterio seleccionado (Nombre/Autor)
-        filtered_mods.sort(key=lambda x: str(x.get(self.sort_key, "")).lower(), reverse=(self.sort_order == "Z-A"))
-        # 2. Ordenar por Favoritos (Estable: mantiene el orden relativo anterior)
-        filtered_mods.sort(key=lambda x: x.get("is_favorite", False), reverse=True)
-
-        for i, mod in enumerate(filtered_mods):
-            row_idx = i + 1
-            # Aquí usamos la permanencia
-            val_inicial = 1 if mod["name"] in saved_selected_mods else 0
-            var = tkinter.IntVar(value=val_inicial)
-            
-            # Checkbox del mod
-            cb = customtkinter.CTkCheckBox(
-                self.modlist_frame, 
-                text="", 
-                variable=var,
-                width=3, 
-                height=3,
-                fg_color=self._accent_color(),
-                    hover_color=self._hover_color(),
-                command=lambda name=mod['name']: self.update_select(changed_mod=name) # Guarda cada vez que haces clic
-                
-            )
-            cb.grid(row=row_idx, column=0, padx=(2,0), pady=(2, 0), sticky="w")
-
-            # Botón de Favorito (Estrella)
-            is_fav = mod.get("is_favorite", False)
-            fav_char = "★" if is_fav else "☆"
-            fav_color = "#FFD700" if is_fav else "gray50" # Dorado vs Gris
-            
-            btn_fav = customtkinter.CTkButton(
-                self.modlist_frame,
-                text=fav_char,
-                width=24,
-                height=24,
-                fg_color="transparent",
-                text_color=fav_color,
-                hover_color=("gray80", "gray25"),
-                font=("Arial", 16),
-                command=lambda m=mod: self.toggle_favorite(m)
-            )
-            btn_fav.grid(row=row_idx, column=1, padx=(0, 2), pady=(2, 0))
-
-            # Color de hover unificado para la fila
-            row_hover_color = ("gray80", "gray25")
-
-            # 1. Nombre
-            btn_name = customtkinter.CTkButton(
-                self.modlist_frame, 
-                text=mod['name'], 
-                fg_color="transparent",
-                hover=False, # Desactivamos hover individual
-                text_color=dynamic_text_color,
-                anchor="w",
-                height=24,
-                command=lambda m=mod: self.show_mod_details(m)
-            )
-            btn_name.grid(row=row_idx, column=2, padx=(5, 5), pady=(2, 0), sticky="ew")
-
-            # 2. Autor
-            btn_author = customtkinter.CTkButton(
-                self.modlist_frame, 
-                text=mod.get('author', '???'), 
-                fg_color="transparent",
-                hover=False,
-                text_color="gray60",
-                anchor="w",
-                height=24,
-                command=lambda m=mod: self.show_mod_details(m)
-            )
-            btn_author.grid(row=row_idx, column=3, padx=(5, 5), pady=(2, 0), sticky="ew")
-
-            # 3. Versión
-            btn_ver = customtkinter.CTkButton(
-                self.modlist_frame, 
-                text=f"v{mod.get('version', '1.0')}", 
-                fg_color="transparent",
-                hover=False,
-                text_color="gray60",
-                anchor="w",
-                height=24,
-                width=60,
-                command=lambda m=mod: self.show_mod_details(m)
-            )
-            btn_ver.grid(row=row_idx, column=4, padx=(5, 5), pady=(2, 0), sticky="ew")
-
-            # Lógica para iluminar toda la fila al pasar el mouse
-            row_btns = [btn_fav, btn_name, btn_author, btn_ver]
-            def on_enter(e, btns=row_btns):
-                for b in btns: b.configure(fg_color=row_hover_color)
-            def on_leave(e, btns=row_btns):
-                for b in btns: b.configure(fg_color="transparent")
-            
-            def on_right_click(e, m=mod):
-                self.show_context_menu(e, m)
-
-            for b in row_btns:
-                b.bind("<Enter>", on_enter)
-                b.bind("<Leave>", on_leave)
-                b.bind("<Button-3>", on_right_click)
+        if search_term:
+            # Con búsqueda: resultados del índice ordenados por relevancia
+            filtered = []
+            for key, _score in self.search_index.search(search_term):
+                entry = self.mod_entries.get(key)
+                if entry is not None and cat_match(entry):
+                    filtered.append(entry)
+        else:
+            filtered = [entry for entry in self.mod_checkboxes if cat_match(entry)]
+            # 1. Ordenar por criterio seleccionado (Nombre/Autor)
+            filtered.sort(key=lambda e: str(e["mod_info"].get(self.sort_key, "")).lower(), reverse=(self.sort_order == "Z-A"))
+            # 2. Ordenar por Favoritos (Estable: mantiene el orden relativo anterior)
+            filtered.sort(key=lambda e: e["mod_info"].get("is_favorite", False), reverse=True)
 
-            self.mod_checkboxes.append({"mod_info": mod, "variable": var})
-        print(t("mod_list_refreshed"))
+        # La vista solo re-configura las filas visibles cuyo contenido cambió
+        self.visible_entries = filtered
+        self.modlist_view.set_items(filtered)
 
     def update_select(self, changed_mod=None):
         # Guardar correctamente sin anidar listas
         current_selection = [mod["mod_info"]["name"] for mod in self.mod_checkboxes if mod["variable"].get() == 1]
+        if not self._mods_loaded:
+            # La primera carga aún no terminó: no perder la selección de mods que faltan por leer
+            known = {mod["mod_info"]["name"] for mod in self.mod_checkboxes}
+            _, saved_list, _ = load_config()
+            current_selection += [name for name in saved_list if name not in known]
         save_config(self.current_path, current_selection, self.mod_options)
         self.save_to_active_profile()
 
         # Aplicar estadísticas
         self.update_stats_display()
 
+        # Los avisos de conflicto dependen de qué mods están activos
+        self.modlist_view.refresh()
+        self._fill_conflicts()
+
         # Sincronización Checkbox - Botón de Enable/Disable
         if self.focused_mod:
             # Buscamos el estado actual de ESE mod específico en la lista de checkboxes
@@ -2170,8 +2253,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             pass
 
         #Lógica para el texto del botón "Select/Deselect All"
-        total_mods = len(self.mod_checkboxes)
-        total_selected = len(current_selection)
+        total_mods = len(self.visible_entries)
+        total_selected = sum(1 for m in self.visible_entries if m["variable"].get() == 1)
 
         if total_selected == 0:
             # Si no hay ninguno puesto, el botón debe invitar a seleccionar
@@ -2249,89 +2332,354 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             print(t("path_updated", path=self.current_path))
 
     def perform_backup(self, target_folder):
-        files = list(target_folder.glob("*.pak"))
-        if not files:
+        from scripts.deploy import format_size
+        from scripts.snapshot_backup import BACKUP_DIR, create_snapshot
+        # Snapshot deduplicado: cada pak único se guarda una vez en backups/objects
+        # y cada backup es solo un manifiesto (ver scripts/snapshot_backup.py)
+        try:
+            report = create_snapshot(target_folder, BACKUP_DIR, keep=10)
+            if report["files"] == 0:
+                return
+            if report["unchanged"]:
+                print(t("backup_unchanged", id=report["id"]))
+            else:
+                print(t("backup_created", file=report["id"]))
+                print(t("backup_stats", files=report["files"], new=report["new_objects"],
+                        new_size=format_size(report["bytes_new"]), total_size=format_size(report["bytes_total"])))
+        except Exception as e:
+            print(t("backup_error", error=str(e)))
+
+    def open_restore_window(self):
+        """Pick a backup snapshot, preview the restore plan (dry run) and apply it."""
+        from scripts.deploy import format_size
+        from scripts.snapshot_backup import BACKUP_DIR, list_snapshots, restore as restore_snapshot
+        if not self.current_path:
+            tkinter.messagebox.showwarning(t("restore_backup"), t("restore_no_path"))
             return
+        snapshots = list_snapshots(BACKUP_DIR)
+        if not snapshots:
+            tkinter.messagebox.showinfo(t("restore_backup"), t("restore_no_backups"))
+            return
+        target = Path(self.current_path) / "~mods"
 
-        backup_dir = Path("backups")
-        backup_dir.mkdir(exist_ok=True)
-        
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        zip_name = backup_dir / f"mods_backup_{timestamp}.zip"
-        
+        win = customtkinter.CTkToplevel(self)
+        win.title(t("restore_backup"))
+        win.geometry("520x420")
+        win.attributes("-topmost", True)
         try:
-            with zipfile.ZipFile(zip_name, 'w', zipfile.ZIP_DEFLATED) as zf:
-                for file in files:
-                    zf.write(file, file.name)
-            print(t("backup_created", file=zip_name.name))
-            
-            # Cleanup old backups (Keep last 10)
-            try:
-                backups = sorted(list(backup_dir.glob("mods_backup_*.zip")), key=lambda f: f.stat().st_mtime, reverse=True)
-                if len(backups) > 10:
-                    for old_backup in backups[10:]:
-                        old_backup.unlink()
-            except Exception as e:
-                print(f"Error cleaning up old backups: {e}")
+            win.iconbitmap(str(ASSETS_DIR / "icon.ico"))
+        except: pass
 
-        except Exception as e:
-            print(t("backup_error", error=str(e)))
+        labels = {f'{s["created"] or s["id"]}  -  {s["files"]} paks, {format_size(s["size"])}': s["id"] for s in snapshots}
+        snap_var = customtkinter.StringVar(value=next(iter(labels)))
+        customtkinter.CTkOptionMenu(win, values=list(labels.keys()), variable=snap_var, width=460,
+                                    fg_color=self._accent_color(), button_color=self._accent_color(),
+                                    button_hover_color=self._hover_color()).pack(pady=(15, 5))
+
+        plan_box = customtkinter.CTkTextbox(win, height=250)
+        plan_box.pack(fill="both", expand=True, padx=15, pady=5)
+
+        def show(report):
+            lines = [t("restore_summary", write=len(report["write"]), write_size=format_size(report["bytes_written"]),
+                       keep=len(report["keep"]), keep_size=format_size(report["bytes_kept"]),
+                       delete=len(report["delete"]), seconds=f'{report["seconds"]:.2f}')]
+            lines += [f"+ {name}" for name, _, _ in report["write"]]
+            lines += [f"- {name}" for name in report["delete"]]
+            lines += [f"! {name} ({t('restore_missing')})" for name in report["missing"]]
+            lines += [f"x {error}" for error in report.get("errors", [])]
+            plan_box.delete("0.0", "end")
+            plan_box.insert("0.0", "\n".join(lines))
+
+        def run(dry_run):
+            # No restaurar encima de un despliegue en curso
+            if not dry_run and getattr(self, "_deploy_running", False):
+                return
+            snapshot_id = labels[snap_var.get()]
+            plan_box.delete("0.0", "end")
+            plan_box.insert("0.0", t("deploy_preparing"))
+
+            def worker():
+                try:
+                    report = restore_snapshot(BACKUP_DIR, snapshot_id, target, dry_run=dry_run)
+                except Exception as e:
+                    self.after(0, lambda: [plan_box.delete("0.0", "end"), plan_box.insert("0.0", str(e))])
+                    return
+                if not dry_run:
+                    print(t("restore_done", id=snapshot_id, written=report["written"], deleted=report["deleted"],
+                            seconds=f'{report["seconds"]:.2f}'))
+                self.after(0, lambda: show(report))
+
+            threading.Thread(target=worker, daemon=True).start()
+
+        btn_row = customtkinter.CTkFrame(win, fg_color="transparent")
+        btn_row.pack(pady=10)
+        customtkinter.CTkButton(btn_row, text=t("restore_preview"), fg_color="gray40", hover_color="gray30",
+                                command=lambda: run(True)).pack(side="left", padx=5)
+        customtkinter.CTkButton(btn_row, text=t("restore_apply"), fg_color=self._accent_color(), hover_color=self._hover_color(),
+                                command=lambda: tkinter.messagebox.askyesno(t("restore_backup"), t("restore_confirm"), parent=win) and run(False)).pack(side="left", padx=5)
+
+        run(True)
+
+    def _load_order(self, profile=None):
+        """Saved load order (mod names, lowest priority first) of `profile` (default: the active one)."""
+        orders = self.app_settings.get("load_order", {}) or {}
+        return list(orders.get(profile or self.profile_var.get(), []))
+
+    def _set_load_order(self, names, profile=None):
+        orders = dict(self.app_settings.get("load_order", {}) or {})
+        orders[profile or self.profile_var.get()] = list(names)
+        self.app_settings["load_order"] = orders
+        save_config(self.current_path, [m["mod_info"]["name"] for m in self.mod_checkboxes if m["variable"].get() == 1],
+                    self.mod_options, app_settings=self.app_settings)
+
+    def open_load_order_window(self):
+        """Reorder the active mods of the current profile and preview/export the deploy plan."""
+        from scripts.deploy import load_manifest, plan_deploy
+        from scripts.deploy_plan import ordered_mods, collect_sources, build_plan, plan_wanted, format_plan, export_plan
+        win = customtkinter.CTkToplevel(self)
+        win.title(t("load_order_title", profile=self.profile_var.get()))
+        win.geometry("560x600")
+        win.attributes("-topmost", True)
+        try:
+            win.iconbitmap(str(ASSETS_DIR / "icon.ico"))
+        except: pass
+
+        customtkinter.CTkLabel(win, text=t("load_order_hint"), text_color="gray60", wraplength=520, justify="left").pack(padx=15, pady=(10, 5), anchor="w")
+        list_frame = customtkinter.CTkScrollableFrame(win, height=260)
+        list_frame.pack(fill="both", expand=True, padx=15, pady=5)
+        list_frame.grid_columnconfigure(1, weight=1)
+        plan_box = customtkinter.CTkTextbox(win, height=170, font=("Consolas", 11))
+        plan_box.pack(fill="both", expand=False, padx=15, pady=5)
+
+        # Solo los mods activos tienen prioridad; el orden guardado se completa con el resto por nombre
+        order = [m["name"] for m in ordered_mods(self.get(), self._load_order())]
+
+        def move(i, step):
+            j = i + step
+            if 0 <= j < len(order):
+                order[i], order[j] = order[j], order[i]
+                # Los nombres guardados que hoy no están activos conservan su sitio al final
+                saved = [n for n in self._load_order() if n not in order]
+                self._set_load_order(order + saved)
+                draw()
+
+        def draw():
+            for w in list_frame.winfo_children():
+                w.destroy()
+            keys = {e["mod_info"]["name"]: e["key"] for e in self.mod_checkboxes}
+            width = max(3, len(str(len(order))))
+            for i, name in enumerate(order):
+                conflicts = self.conflict_index.conflict_count(keys.get(name), self._is_key_active)
+                customtkinter.CTkLabel(list_frame, text=f"{i + 1:0{width}d}", text_color="gray60", width=36).grid(row=i, column=0, padx=(0, 5))
+                label = name + (f"   ⚠{conflicts}" if conflicts else "")
+                customtkinter.CTkLabel(list_frame, text=label, anchor="w").grid(row=i, column=1, sticky="ew")
+                customtkinter.CTkButton(list_frame, text="▲", width=28, height=24, fg_color="gray40", hover_color="gray30",
+                                        state="normal" if i > 0 else "disabled",
+                                        command=lambda i=i: move(i, -1)).grid(row=i, column=2, padx=2, pady=1)
+                customtkinter.CTkButton(list_frame, text="▼", width=28, height=24, fg_color="gray40", hover_color="gray30",
+                                        state="normal" if i < len(order) - 1 else "disabled",
+                                        command=lambda i=i: move(i, 1)).grid(row=i, column=3, padx=2, pady=1)
+
+        def preview(export_path=None):
+            # Dry run: el plan y lo que cambiaría en ~mods, sin tocar ningún archivo
+            by_name = {m["name"]: m for m in self.get()}
+            mods = [by_name[n] for n in order if n in by_name]
+            options = {k: list(v) for k, v in self.mod_options.items()}
+            target = Path(self.current_path) / "~mods" if self.current_path else None
+            plan_box.delete("0.0", "end")
+            plan_box.insert("0.0", t("deploy_preparing"))
+
+            def worker():
+                try:
+                    plan = build_plan(collect_sources(mods, options), self.conflict_index)
+                    diff = plan_deploy(target, plan_wanted(plan), load_manifest(target)) if target else None
+                    if export_path:
+                        export_plan(plan, export_path, diff)
+                        print(t("load_order_exported", path=export_path))
+                    text = format_plan(plan, diff)
+                except Exception as e:
+                    text = str(e)
+                print(text)
+                self.after(0, lambda: [plan_box.delete("0.0", "end"), plan_box.insert("0.0", text)])
 
-    def deploy_mods(self):
+            threading.Thread(target=worker, daemon=True).start()
+
+        def export():
+            path = filedialog.asksaveasfilename(parent=win, defaultextension=".json",
+                                                filetypes=[("JSON", "*.json"), ("Text", "*.txt")],
+                                                initialfile=f"{self.profile_var.get()} deploy plan.json",
+                                                title=t("load_order_export"))
+            if path:
+                preview(path)
+
+        btn_row = customtkinter.CTkFrame(win, fg_color="transparent")
+        btn_row.pack(pady=10)
+        customtkinter.CTkButton(btn_row, text=t("load_order_preview"), fg_color="gray40", hover_color="gray30",
+                                command=preview).pack(side="left", padx=5)
+        customtkinter.CTkButton(btn_row, text=t("load_order_export"), fg_color=self._accent_color(), hover_color=self._hover_color(),
+                                command=export).pack(side="left", padx=5)
+
+        draw()
+        preview()
+
+    def deploy_mods(self, on_done=None):
+        """Deploy the active mods to ~mods as a background job with a progress window.
+
+        `on_done` runs on the Tk thread only if the job finished without being
+        cancelled; after errors or a rollback the user is asked first
+        (game_callback uses it to launch the game afterwards). If a deploy is
+        already running, `on_done` is queued to run when that one finishes.
+        """
+        from scripts.deploy_plan import ordered_mods
         if not self.current_path:
             return False
-        
+        if on_done is not None and on_done not in self._deploy_callbacks:
+            self._deploy_callbacks.append(on_done)
+
+        # Ya hay un despliegue en marcha: traer su ventana al frente (on_done corre cuando termine)
+        if getattr(self, "_deploy_running", False):
+            try:
+                self.deploy_win.lift()
+            except Exception:
+                pass
+            return False
+
         target = Path(self.current_path) / "~mods"
-        
+        # Qué mods y en qué orden se decide aquí (lee las IntVar de Tk); el plan y la copia van en el hilo
+        mods = ordered_mods(self.get(), self._load_order())
+        options = {k: list(v) for k, v in self.mod_options.items()}
+        backup = self.app_settings.get("backup_mods", False) and target.exists()
+        mode = self.app_settings.get("deploy_mode", "auto")
+
+        self.deploy_win = customtkinter.CTkToplevel(self)
+        self.deploy_win.title(t("deploy_title"))
+        self.deploy_win.geometry("400x220")
+        self.deploy_win.attributes("-topmost", True)
+        try:
+            self.deploy_win.iconbitmap(str(ASSETS_DIR / "icon.ico"))
+        except: pass
+        # Cerrar la ventana equivale a cancelar
+        self.deploy_win.protocol("WM_DELETE_WINDOW", self._cancel_deploy)
+
+        self.deploy_lbl = customtkinter.CTkLabel(self.deploy_win, text=t("deploy_preparing"), font=("Arial", 12, "bold"))
+        self.deploy_lbl.pack(pady=(20, 10))
+
+        self.deploy_bar = customtkinter.CTkProgressBar(self.deploy_win, width=300, progress_color=self._accent_color())
+        self.deploy_bar.pack(pady=5)
+        self.deploy_bar.set(0)
+
+        self.deploy_speed_lbl = customtkinter.CTkLabel(self.deploy_win, text="")
+        self.deploy_speed_lbl.pack(pady=(0, 5))
+
+        self.deploy_cancel_btn = customtkinter.CTkButton(self.deploy_win, text=t("cancel_button"), fg_color="#a51f45", hover_color="#8b132d", command=self._cancel_deploy)
+        self.deploy_cancel_btn.pack(pady=10)
+
+        self._deploy_cancel_flag = False
+        self._deploy_running = True
+        threading.Thread(target=self._deploy_worker, args=(target, mods, options, backup, mode), daemon=True).start()
+        return True
+
+    def _cancel_deploy(self):
+        self._deploy_cancel_flag = True
+        try:
+            self.deploy_cancel_btn.configure(state="disabled")
+            self.deploy_lbl.configure(text=t("deploy_cancelling"))
+        except: pass
+
+    def _deploy_worker(self, target, mods, options, backup, mode):
+        from scripts.deploy import deploy, format_size
+        from scripts.deploy_plan import collect_sources, build_plan, plan_wanted, deploy_fingerprint, save_fingerprint
+        # Plan: nombre destino con prefijo de prioridad para cada pak (ver scripts/deploy_plan.py)
+        try:
+            sources = collect_sources(mods, options)
+            fingerprint = deploy_fingerprint(sources, options)
+            wanted = plan_wanted(build_plan(sources))
+        except Exception as e:
+            print(f"Error planning deploy: {e}")
+            self.after(0, lambda: self._on_deploy_finished(None))
+            return
+
         # --- Backup Logic ---
-        if self.app_settings.get("backup_mods", False) and target.exists():
+        if backup:
+            self.after(0, lambda: self.deploy_lbl.configure(text=t("deploy_backing_up")))
             self.perform_backup(target)
 
-        target.mkdir(exist_ok=True)
+        start = time.time()
+        last_update = [0.0]
 
-        # Limpiar carpeta ~mods
-        for old_file in target.glob("*.pak"):
+        def progress(files_done, files_total, bytes_done, bytes_total):
+            # Llamado desde los hilos de copia: limitar a ~10 actualizaciones por segundo
+            now = time.time()
+            if now - last_update[0] < 0.1 and files_done < files_total:
+                return
+            last_update[0] = now
+            speed = bytes_done / max(now - start, 1e-6)
+            frac = bytes_done / bytes_total if bytes_total else 1.0
+            self.after(0, lambda: [
+                self.deploy_lbl.configure(text=t("deploy_progress", current=files_done, total=files_total)),
+                self.deploy_bar.set(frac),
+                self.deploy_speed_lbl.configure(text=f"{format_size(bytes_done)} / {format_size(bytes_total)} - {format_size(speed)}/s"),
+            ])
+
+        # Solo se copia lo nuevo o cambiado y se borra lo que ya no está activo
+        # (ver scripts/deploy.py y ~mods/.pum_manifest.json)
+        try:
+            report = deploy(target, wanted, mode=mode, probe_dir=Path("./mods").resolve(),
+                            progress=progress, cancelled=lambda: self._deploy_cancel_flag)
+        except Exception as e:
+            print(f"Error deploying mods: {e}")
+            report = None
+        # Launch Game puede saltarse el próximo despliegue si nada cambia
+        if report is not None and not report["errors"] and not report["cancelled"]:
+            save_fingerprint(target, fingerprint)
+        self.after(0, lambda: self._on_deploy_finished(report))
+
+    def _on_deploy_finished(self, report):
+        from scripts.deploy import format_size
+        self._deploy_running = False
+        callbacks, self._deploy_callbacks = self._deploy_callbacks, []
+        try:
+            self.deploy_win.destroy()
+        except Exception:
+            pass
+        if report is None:
+            return
+        for error in report["errors"]:
+            print(f"Error deploying {error}")
+        print(t("deploy_summary", mode=report["mode"], copied=report["copied"], copied_size=format_size(report["bytes_copied"]),
+                skipped=report["skipped"], skipped_size=format_size(report["bytes_skipped"]),
+                removed=report["removed"]))
+        if report.get("staged"):
+            print(t("deploy_timing", staging=f'{report["staging_seconds"]:.2f}', swap=f'{report["swap_seconds"] * 1000:.1f}'))
+        if report.get("rolled_back"):
+            print(t("deploy_rolled_back"))
+        if report["cancelled"]:
+            print(t("deploy_cancelled"))
+            return
+        if report["errors"] or report.get("rolled_back"):
+            # Resumen por archivo (limitado para que el diálogo no crezca sin fin)
+            lines = report["errors"][:15]
+            if len(report["errors"]) > 15:
+                lines.append(f"... (+{len(report['errors']) - 15})")
+            parts = []
+            if lines:
+                parts.append(t("deploy_errors", count=len(report["errors"])) + "\n\n" + "\n".join(lines))
+            if report.get("rolled_back"):
+                parts.append(t("deploy_rolled_back"))
+            message = "\n\n".join(parts)
+            if not callbacks:
+                tkinter.messagebox.showwarning(t("deploy_title"), message)
+                return
+            # ~mods no quedó como se pidió: el juego solo se lanza si el usuario lo confirma
+            if not tkinter.messagebox.askyesno(t("deploy_title"), message + "\n\n" + t("deploy_launch_anyway"), icon="warning"):
+                return
+        else:
+            print(t("deploy_success"))
+        for callback in callbacks:
             try:
-                if old_file.exists():
-                    os.chmod(old_file, 0o777)
-                    os.remove(old_file)
+                callback()
             except Exception as e:
-                print(f"Error removing {old_file}: {e}")
-
-        # Cargar las opciones guardadas
-        all_mod_options = self.mod_options
-
-        for mod in self.get(): # self.get() devuelve los mods activos
-            source = Path(mod["folder_path"]) / "assets"
-            
-            if mod.get("has_options"):
-                # SOLO copiamos los archivos seleccionados en la configuración
-                selected_files = all_mod_options.get(mod["name"], [])
-                for file_name in selected_files:
-                    file_path = source / file_name
-                    if file_path.exists():
-                        # Ensure _P suffix for Unreal Engine mods
-                        dest_name = file_path.name
-                        if not file_path.stem.endswith("_P"):
-                            dest_name = f"{file_path.stem}_P{file_path.suffix}"
-                        try:
-                            shutil.copy(file_path, target / dest_name)
-                        except Exception as e:
-                            print(f"Error copying {file_name}: {e}")
-            else:
-                # Si no tiene opciones, comportamiento por defecto: copiar todo assets
-                if source.exists():
-                    for item in source.glob("*.pak"):
-                        # Ensure _P suffix for Unreal Engine mods
-                        dest_name = item.name
-                        if not item.stem.endswith("_P"):
-                            dest_name = f"{item.stem}_P{item.suffix}"
-                        try:
-                            shutil.copy(item, target / dest_name)
-                        except Exception as e:
-                            print(f"Error copying {item.name}: {e}")
-        print(t("deploy_success"))
-        return True
+                print(f"Error after deploy: {e}")
     # endregion
     
     # region --- Mod Configuration ---
@@ -2417,6 +2765,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
     # region --- Metadata Editor ---
     def open_metadata_editor(self):
+        from scripts.pak_store import list_paks
         if not self.focused_mod:
             return
 
@@ -2498,7 +2847,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         opts_frame.pack(fill="x", pady=5)
 
         mod_assets = Path(self.focused_mod["folder_path"]) / "assets"
-        pak_files = [f.name for f in mod_assets.glob("*.pak")] if mod_assets.exists() else []
+        pak_files = [name for name, _ in list_paks(mod_assets)] if mod_assets.exists() else []
         
         existing_opts_map = {opt["file"]: opt["name"] for opt in self.focused_mod.get("options", [])}
         opt_entries = {}
@@ -2544,8 +2893,10 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
                 # Excluir folder_path al guardar en disco
                 to_save = {k: v for k, v in self.focused_mod.items() if k != "folder_path"}
                 with open(json_path, "w", encoding="utf-8") as f: json.dump(to_save, f, indent=4, ensure_ascii=False)
+                self._acknowledge_mod_change(self.focused_mod)
+                self.search_index.update(self._mod_key(self.focused_mod), self.focused_mod)
                 self.show_mod_details(self.focused_mod)
-                self.refresh_logic()
+                self._apply_view()
                 editor.destroy()
             except Exception as e: print(t("editor_mod_metaerr"),f": {e}")
 
@@ -2707,6 +3058,52 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
                                command=open_backups_folder)
         btn_open_backups.pack(anchor="w", pady=(0, 4), padx=28)
 
+        btn_restore_backup = customtkinter.CTkButton(extras_frame, text=t("restore_backup"),
+                               fg_color=self._accent_color(), hover_color=self._hover_color(), height=24,
+                               command=self.open_restore_window)
+        btn_restore_backup.pack(anchor="w", pady=(0, 4), padx=28)
+
+        # Deploy mode: copy / hardlink / reflink (auto prueba qué soporta el disco)
+        deploy_modes = {t("deploy_mode_auto"): "auto", t("deploy_mode_copy"): "copy",
+                        t("deploy_mode_hardlink"): "hardlink", t("deploy_mode_reflink"): "reflink"}
+        cur_deploy_mode = app_settings.get("deploy_mode", "auto")
+        deploy_mode_row = customtkinter.CTkFrame(extras_frame, fg_color="transparent")
+        deploy_mode_row.pack(anchor="w", pady=4, fill="x")
+        customtkinter.CTkLabel(deploy_mode_row, text=t("deploy_mode_label")).pack(side="left")
+        self.deploy_mode_var = customtkinter.StringVar(
+            value=next((k for k, v in deploy_modes.items() if v == cur_deploy_mode), t("deploy_mode_auto")))
+        self.deploy_mode_lookup = deploy_modes
+        deploy_mode_menu = customtkinter.CTkOptionMenu(
+            deploy_mode_row,
+            values=list(deploy_modes.keys()),
+            variable=self.deploy_mode_var,
+            command=lambda _v: self._save_app_settings(),
+            fg_color=self._accent_color(),
+            button_color=self._accent_color(),
+            button_hover_color=self._hover_color()
+        )
+        deploy_mode_menu.pack(side="left", padx=8)
+        self.settings_deploy_mode_menu = deploy_mode_menu
+
+        # Pak store: paks idénticos se guardan una sola vez en mods/.pum_store
+        self.pak_store_var = customtkinter.BooleanVar(value=app_settings.get("pak_store", False))
+
+        def toggle_pak_store():
+            self._save_app_settings()
+            if self.pak_store_var.get():
+                self._enable_pak_store()
+
+        pak_store_cb = customtkinter.CTkCheckBox(extras_frame, text=t("pak_store_label"), variable=self.pak_store_var,
+               fg_color=self._accent_color(), hover_color=self._hover_color(),
+               command=toggle_pak_store)
+        pak_store_cb.pack(anchor="w", pady=4)
+        self.settings_pak_store_cb = pak_store_cb
+
+        btn_gc_store = customtkinter.CTkButton(extras_frame, text=t("pak_store_gc"),
+                               fg_color=self._accent_color(), hover_color=self._hover_color(), height=24,
+                               command=self._gc_pak_store)
+        btn_gc_store.pack(anchor="w", pady=(0, 4), padx=28)
+
         # Small helper save button to persist current app settings
         save_btn = customtkinter.CTkButton(self.setting_window, text=t("save_settings"), fg_color=self._accent_color(), hover_color=self._hover_color(),
                            command=lambda: self._save_app_settings(show_msg=True))
@@ -2743,6 +3140,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
                 "minimize_to_tray": bool(self.minimize_tray_var.get()),
                 "enable_console": bool(self.console_var.get()),
                 "backup_mods": bool(self.backup_mods_var.get()),
+                "deploy_mode": self.deploy_mode_lookup.get(self.deploy_mode_var.get(), "auto"),
+                "pak_store": bool(self.pak_store_var.get()),
                 "appearance": appearance_val or self.app_settings.get("appearance", "Dark"),
                 "accent_color": accent_val or self.app_settings.get("accent_color", self._accent_color()),
                 "button_color": accent_val or self.app_settings.get("button_color", self._accent_color())
@@ -2909,8 +3308,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         print(t("language_changed", lang=new_lang))
         # reload translations and update runtime translations
         try:
-            global TRANSLATIONS
-            TRANSLATIONS = load_translations_for(new_lang)
+            set_language(new_lang)
             # update topbar texts and common widgets
             try:
                 if hasattr(self, 'pref_path'): self.pref_path.configure(text=t("game_path"))
@@ -3049,6 +3447,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         btn_frame = customtkinter.CTkFrame(update_win, fg_color="transparent")
         btn_frame.pack(fill="x", side="bottom", pady=20)
 
+        import webbrowser
         update_btn = customtkinter.CTkButton(
             btn_frame, 
             text=t("download_button"), 
@@ -3132,13 +3531,8 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 
 # region --- Stats Display ---
     def update_stats_display(self):
-        # Contar total de mods escaneando carpetas con modinfo.json
-        total_mods = 0
-        mods_path = Path("./mods")
-        if mods_path.exists():
-            for item in mods_path.iterdir():
-                if item.is_dir() and (item / "modinfo.json").exists():
-                    total_mods += 1
+        # Total de mods: ya los tenemos indexados en memoria tras el último escaneo
+        total_mods = len(self.mod_entries)
 
         # Contar mods activos desde la configuración (global)
         _, saved_mods, _ = load_config()
@@ -3249,6 +3643,11 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
 # endregion
 # region --- Quit from tray ---
     def _quit_from_tray(self):
+        self._stop_mods_watcher()
+        try:
+            self.mod_importer.stop()
+        except Exception:
+            pass
         try:
             if self.tray_icon:
                 try:
@@ -3279,6 +3678,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
                         except Exception:
                             pass
                         continue
+                    import gzip
                     with open(p, "rb") as f_in, gzip.open(gz_path, "wb") as f_out:
                         shutil.copyfileobj(f_in, f_out)
                     try:
@@ -3301,7 +3701,7 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         
         try: self.sort_btn.configure(text=t("sort_ZA") if self.sort_order == "Z-A" else t("sort_AZ"))
         except: pass
-        self.refresh_logic()
+        self._apply_view()
 
     def toggle_sort(self):
         self.sort_order = "Z-A" if self.sort_order == "A-Z" else "A-Z"
@@ -3310,13 +3710,36 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
             self.sort_btn.configure(text=t("sort_ZA") if self.sort_order == "Z-A" else t("sort_AZ"))
         except Exception:
             self.sort_btn.configure(text=self.sort_order)
-        self.refresh_logic()
+        self._apply_view()
 # endregion
 # region -- Game Launch --
     def game_callback(self):
-        if self.deploy_mods():
-            print(t("launch_game"))
-            self.after(500, lambda: os.startfile("steam://rungameid/1607250"))
+        from scripts.deploy_plan import ordered_mods, collect_sources, deploy_fingerprint, is_deployed
+        # Steam solo se lanza cuando el despliegue terminó (y no se canceló)
+        if not self.current_path or getattr(self, "_deploy_running", False):
+            self.deploy_mods(on_done=self._launch_game)
+            return
+        target = Path(self.current_path) / "~mods"
+        mods = ordered_mods(self.get(), self._load_order())
+        options = {k: list(v) for k, v in self.mod_options.items()}
+
+        def worker():
+            # Atajo: si ~mods ya es exactamente lo que se desplegaría, ni backup ni despliegue
+            try:
+                current = is_deployed(target, deploy_fingerprint(collect_sources(mods, options), options))
+            except Exception as e:
+                print(f"Error checking deploy state: {e}")
+                current = False
+            if current:
+                self.after(0, lambda: [print(t("deploy_up_to_date")), self._launch_game()])
+            else:
+                self.after(0, lambda: self.deploy_mods(on_done=self._launch_game))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _launch_game(self):
+        print(t("launch_game"))
+        self.after(500, lambda: os.startfile("steam://rungameid/1607250"))
 # endregion
 
     # region --- GameBanana Integration ---
@@ -3549,349 +3972,164 @@ class App(customtkinter.CTk, TkinterDnD.DnDWrapper):
         threading.Thread(target=self._download_and_install_multiple_thread, args=(meta, img_url, files), daemon=True).start()
 
     def _download_and_install_thread(self, meta, img_url, file_url):
-        try:
-            # 1. Download File
-            with tempfile.TemporaryDirectory() as tmpdir:
-                # Attempt to determine filename from URL or Headers to preserve extension
-                filename = "download.archive"
-                # Normalize file_url (strip and handle protocol-relative URLs)
-                try:
-                    file_url = file_url.strip()
-                except Exception:
-                    pass
-                if isinstance(file_url, str) and file_url.startswith('//'):
-                    file_url = 'https:' + file_url
-                if isinstance(file_url, str) and not file_url.startswith('http'):
-                    # best-effort: assume https when scheme missing
-                    file_url = 'https://' + file_url
-
-                with requests.get(file_url, stream=True) as r:
-                    r.raise_for_status()
-                    
-                    # Try Content-Disposition
-                    if "Content-Disposition" in r.headers:
-                        cd = r.headers["Content-Disposition"]
-                        fname_match = re.search(r'filename="?([^"]+)"?', cd)
-                        if fname_match:
-                            filename = fname_match.group(1)
-                    
-                    # Fallback to URL
-                    if filename == "download.archive":
-                        url_name = file_url.split("/")[-1].split("?")[0]
-                        if url_name and "." in url_name:
-                            filename = url_name
-
-                    # Sanitize
-                    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
-                    local_zip = Path(tmpdir) / filename
-
-                    total_len = int(r.headers.get('content-length', 0))
-                    dl_len = 0
-                    with open(local_zip, 'wb') as f:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                            dl_len += len(chunk)
-                            if total_len > 0:
-                                perc = dl_len / total_len
-                                self.after(0, lambda p=perc: self.dl_bar.set(p))
-                                self.after(0, lambda p=int(perc*100): self.dl_label.configure(text=t("url_dl_downloading", percent=p)))
-
-                # 2. Extract & Install Logic
-                # We use a custom extraction to enforce the metadata we fetched
-                extract_dir = Path(tmpdir) / "extracted"
-                extract_dir.mkdir()
-                
-                extracted = False
-                
-                # Try Zip (Python Native)
-                if zipfile.is_zipfile(local_zip):
-                    try:
-                        with zipfile.ZipFile(local_zip, 'r') as z: z.extractall(extract_dir)
-                        extracted = True
-                    except Exception:
-                        pass # Fallback to external
-
-                # Try External (7z/WinRAR) if native failed or it's not a zip
-                if not extracted:
-                     if self.extract_rar_external(local_zip, extract_dir):
-                         extracted = True
-                
-                if not extracted:
-                     raise Exception(f"Could not extract {filename}. Ensure 7-Zip or WinRAR is installed.")
-
-                # 3. Find PAKs
-                paks = list(extract_dir.rglob("*.pak"))
-                if not paks:
-                    raise Exception("No .pak files found in archive")
-
-                # 4. Create Mod Structure
-                mod_name = re.sub(r'[<>:"/\\|?*]', '', meta["name"]).strip() # Sanitize
-                dest_mod = Path("./mods") / mod_name
-                dest_assets = dest_mod / "assets"
-                dest_assets.mkdir(parents=True, exist_ok=True)
-
-                # Move PAKs
-                pak_list = []
-                for p in paks:
-                    shutil.move(str(p), str(dest_assets / p.name))
-                    pak_list.append({"name": p.stem, "file": p.name})
-
-                # Update Metadata for Multi-part
-                if len(pak_list) > 1:
-                    meta["has_options"] = True
-                    meta["options"] = pak_list
-                else:
-                    meta["has_options"] = False
-                    meta["options"] = []
-
-                # Download Image
-                # Download Image: prefer img_url; fallback to mod page main image
-                image_source = img_url
-                if not image_source:
-                    try:
-                        image_source = self._fetch_mod_page_image(meta.get('url'))
-                    except Exception:
-                        image_source = None
-
-                if image_source:
-                    try:
-                        img_data = requests.get(image_source, timeout=10).content
-                        with open(dest_mod / "preview.png", "wb") as f: f.write(img_data)
-                        meta["screenshot"] = "preview.png"
-                    except Exception:
-                        pass
-
-                # Save modinfo
-                # Record source URL used (append to source_urls and avoid overwriting mod page URL)
-                try:
-                    meta.setdefault("source_urls", [])
-                    meta["source_urls"].append(file_url)
-                    if not meta.get("url"):
-                        meta["url"] = getattr(self, '_last_gb_url', file_url)
-                except Exception:
-                    pass
+        self._download_and_install_multiple_thread(meta, img_url, [{"download_url": file_url}])
 
-                with open(dest_mod / "modinfo.json", "w", encoding="utf-8") as f:
-                    json.dump(meta, f, indent=4, ensure_ascii=False)
-
-            self.after(0, lambda: [self.dl_win.destroy(), self.refresh_logic(), tkinter.messagebox.showinfo("Success", t("url_dl_success", name=meta["name"]))])
+    def _download_and_install_multiple_thread(self, meta, img_url, files):
+        try:
+            urls = []
+            for idx, f in enumerate(files):
+                file_url = f.get("download_url") or f.get("_sDownloadUrl") or f.get("sDownloadUrl")
+                if not file_url:
+                    raise Exception(f"Missing download URL for file entry #{idx+1}")
+                urls.append(file_url)
+
+            def progress(perc):
+                self.after(0, lambda p=perc: self.dl_bar.set(p))
+                self.after(0, lambda p=int(perc*100): self.dl_label.configure(text=t("url_dl_downloading", percent=p)))
+
+            # Descarga, extracción y estructura del mod: scripts/installer.py (compartido con la CLI)
+            dest_mod = installer.download_and_install(meta, urls, MODS_DIR, img_url=img_url,
+                                                      page_url=getattr(self, '_last_gb_url', None), progress=progress)
+            self._intern_mods_async([dest_mod])
 
+            self.after(0, lambda: [self.dl_win.destroy(), self.refresh_logic(), tkinter.messagebox.showinfo("Success", t("url_dl_success", name=meta.get("name", "")))])
         except Exception as e:
             err_msg = str(e)
             self.after(0, lambda: [self.dl_win.destroy(), tkinter.messagebox.showerror(t("error"), t("url_dl_error", err=err_msg))])
 
-    def _download_and_install_multiple_thread(self, meta, img_url, files):
-        try:
-            with tempfile.TemporaryDirectory() as tmpdir:
-                extract_root = Path(tmpdir) / "combined_extracted"
-                extract_root.mkdir()
-
-                all_paks = []
-                source_urls = []
-
-                total_files = len(files)
-                for idx, f in enumerate(files):
-                    file_url = f.get("download_url") or f.get("_sDownloadUrl") or f.get("sDownloadUrl")
-                    if not file_url:
-                        raise Exception(f"Missing download URL for file entry #{idx+1}")
+    def _fetch_mod_page_image(self, page_url):
+        """Attempt to extract a main image URL from a mod page (see installer.fetch_page_image)."""
+        return installer.fetch_page_image(page_url)
+    # endregion
 
-                    # Normalize URL
-                    try:
-                        file_url = file_url.strip()
-                    except Exception:
-                        pass
-                    if file_url.startswith('//'):
-                        file_url = 'https:' + file_url
-                    if not file_url.startswith('http'):
-                        file_url = 'https://' + file_url
-
-                    source_urls.append(file_url)
-
-                    # Download this file into tmp
-                    local_path = Path(tmpdir) / f"file_{idx+1}"
-                    with requests.get(file_url, stream=True) as r:
-                        r.raise_for_status()
-                        # try to infer name
-                        fname = None
-                        if "Content-Disposition" in r.headers:
-                            m = re.search(r'filename="?([^\";]+)"?', r.headers["Content-Disposition"])
-                            if m: fname = m.group(1)
-                        if not fname:
-                            fname = file_url.split('/')[-1].split('?')[0] or f"file_{idx+1}"
-                        local_path = local_path.with_suffix(Path(fname).suffix)
-                        total_len = int(r.headers.get('content-length', 0))
-                        dl_len = 0
-                        with open(local_path, 'wb') as out_f:
-                            for chunk in r.iter_content(chunk_size=8192):
-                                out_f.write(chunk)
-                                dl_len += len(chunk)
-                                # update combined progress: per-file fraction
-                                try:
-                                    if total_len > 0:
-                                        frac = dl_len / total_len
-                                    else:
-                                        frac = 0
-                                    perc = (idx + frac) / total_files
-                                    if perc < 0: perc = 0
-                                    if perc > 1: perc = 1
-                                    self.after(0, lambda p=perc: self.dl_bar.set(p))
-                                    self.after(0, lambda p=int(perc*100): self.dl_label.configure(text=t("url_dl_downloading", percent=p)))
-                                except Exception:
-                                    pass
-                        # Ensure progress moves to next file boundary
-                            try:
-                                perc_done = (idx + 1) / total_files
-                                self.after(0, lambda p=perc_done: self.dl_bar.set(p))
-                                self.after(0, lambda p=int(perc_done*100): self.dl_label.configure(text=t("url_dl_downloading", percent=p)))
-                            except Exception:
-                                pass
-                    # Extract
-                    extracted = False
-                    if zipfile.is_zipfile(local_path):
-                        try:
-                            with zipfile.ZipFile(local_path, 'r') as z: z.extractall(extract_root)
-                            extracted = True
-                        except Exception:
-                            extracted = False
-
-                    if not extracted:
-                        if not self.extract_rar_external(local_path, extract_root):
-                            raise Exception(f"Could not extract file: {local_path.name}")
-
-                # After all files downloaded and extracted, find all paks
-                paks = list(extract_root.rglob("*.pak"))
-                if not paks:
-                    raise Exception("No .pak files found in combined download")
-
-                # Create mod folder and move paks
-                mod_name = re.sub(r'[<>:\\"/\\|?*]', '', meta.get("name", "Unnamed Mod")).strip()
-                dest_mod = Path("./mods") / mod_name
-                dest_assets = dest_mod / "assets"
-                dest_assets.mkdir(parents=True, exist_ok=True)
-
-                pak_list = []
-                for p in paks:
-                    dest = dest_assets / p.name
-                    shutil.move(str(p), str(dest))
-                    pak_list.append({"name": p.stem, "file": p.name})
-
-                # Update metadata
-                if len(pak_list) > 1:
-                    meta["has_options"] = True
-                    meta["options"] = pak_list
-                else:
-                    meta["has_options"] = False
-                    meta["options"] = []
+    # region --- Pak Store ---
+    def _intern_mods_async(self, mod_dirs):
+        """Move the paks of freshly installed mods into the pak store (if enabled), off the UI thread."""
+        if not self.app_settings.get("pak_store", False) or not mod_dirs:
+            return
+        threading.Thread(target=self._intern_mods, args=(mod_dirs,), daemon=True).start()
 
-                # Record source URLs and preserve mod page URL if present
-                try:
-                    meta.setdefault("source_urls", [])
-                    meta["source_urls"].extend(source_urls)
-                    if not meta.get("url") and source_urls:
-                        meta["url"] = getattr(self, '_last_gb_url', source_urls[0])
-                except Exception:
-                    pass
+    def _intern_mods(self, mod_dirs):
+        """Same as _intern_mods_async() but on the calling (worker) thread: the install queue hashes here."""
+        from scripts.deploy import format_size
+        from scripts.pak_store import intern_mods
+        if not self.app_settings.get("pak_store", False) or not mod_dirs:
+            return
+        mods_folder = Path("./mods").resolve()
+        dirs = [Path(d).resolve() for d in mod_dirs]
+        report = intern_mods(mods_folder, dirs)
+        for error in report["errors"]:
+            print(f"Pak store error: {error}")
+        if report["deduped"]:
+            print(t("pak_store_deduped", count=report["deduped"], size=format_size(report["bytes_saved"])))
+        # Swapping files for links touches assets/: not an external change
+        try:
+            self.after(0, lambda: self.mods_watcher is not None and self.mods_watcher.acknowledge([d.name for d in dirs]))
+        except Exception:
+            pass
 
-                # Download preview image once
-                # Download preview image: prefer img_url; fallback to mod page main image
-                image_source = img_url
-                if not image_source:
-                    try:
-                        image_source = self._fetch_mod_page_image(meta.get("url"))
-                    except Exception:
-                        image_source = None
+    def _enable_pak_store(self):
+        """Intern the whole library in the background and report the space reclaimed."""
+        from scripts.deploy import format_size
+        from scripts.pak_store import intern_library, store_report
+        mods_folder = Path("./mods").resolve()
+
+        def worker():
+            result = intern_library(mods_folder)
+            report = store_report(mods_folder)
+            for error in result["errors"]:
+                print(f"Pak store error: {error}")
+            msg = t("pak_store_report", blobs=report["blobs"], stored=format_size(report["stored_bytes"]),
+                    reclaimed=format_size(report["reclaimed_bytes"]))
+            print(msg)
+            try:
+                self.after(0, lambda: [self.mods_watcher is not None and self.mods_watcher.acknowledge(),
+                                       tkinter.messagebox.showinfo(t("pak_store_title"), msg)])
+            except Exception:
+                pass
 
-                if image_source:
-                    try:
-                        img_data = requests.get(image_source, timeout=10).content
-                        with open(dest_mod / "preview.png", "wb") as f: f.write(img_data)
-                        meta["screenshot"] = "preview.png"
-                    except Exception:
-                        pass
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _gc_pak_store(self):
+        """Delete blobs no mod references any more."""
+        from scripts.deploy import format_size
+        from scripts.pak_store import store_report, gc as gc_pak_store
+        mods_folder = Path("./mods").resolve()
+
+        def worker():
+            result = gc_pak_store(mods_folder)
+            report = store_report(mods_folder)
+            msg = t("pak_store_gc_done", removed=result["removed"], freed=format_size(result["bytes_freed"])) + "\n" + \
+                t("pak_store_report", blobs=report["blobs"], stored=format_size(report["stored_bytes"]),
+                  reclaimed=format_size(report["reclaimed_bytes"]))
+            print(msg)
+            try:
+                self.after(0, lambda: tkinter.messagebox.showinfo(t("pak_store_title"), msg))
+            except Exception:
+                pass
 
-                # Save modinfo
-                with open(dest_mod / "modinfo.json", "w", encoding="utf-8") as f:
-                    json.dump(meta, f, indent=4, ensure_ascii=False)
+        threading.Thread(target=worker, daemon=True).start()
+    # endregion
 
-            self.after(0, lambda: [self.dl_win.destroy(), self.refresh_logic(), tkinter.messagebox.showinfo("Success", t("url_dl_success", name=meta.get("name", "")))])
+    # region --- Auto Refresh ---
+    def _start_mods_watcher(self):
+        # Watcher runs on its own thread (inotify on Linux, polling elsewhere)
+        try:
+            Path("./mods").mkdir(exist_ok=True)
+            self.mods_watcher = create_watcher(Path("./mods"), lambda diff: self.after(0, lambda: self._on_mods_changed(diff)))
+            self.mods_watcher.start()
         except Exception as e:
-            err_msg = str(e)
-            self.after(0, lambda: [self.dl_win.destroy(), tkinter.messagebox.showerror(t("error"), t("url_dl_error", err=err_msg))])
+            self.mods_watcher = None
+            print(f"Error starting mods watcher: {e}")
 
-    def _fetch_mod_page_image(self, page_url):
-        """Attempt to extract a main image URL from a mod page: og:image, twitter:image, link rel=image_src, or first <img>."""
-        try:
-            if not page_url:
-                return None
-            resp = requests.get(page_url, timeout=8)
-            html = resp.text
-            # og:image
-            m = re.search(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']', html, re.I)
-            if not m:
-                m = re.search(r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\']([^"\']+)["\']', html, re.I)
-            if not m:
-                m = re.search(r'<link[^>]+rel=["\']image_src["\'][^>]+href=["\']([^"\']+)["\']', html, re.I)
-            if m:
-                url = m.group(1)
-                if url.startswith('//'):
-                    url = 'https:' + url
-                if url.startswith('/'):
-                    from urllib.parse import urljoin
-                    url = urljoin(page_url, url)
-                return url
-
-            # fallback: first <img>
-            m = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', html, re.I)
-            if m:
-                url = m.group(1)
-                if url.startswith('//'):
-                    url = 'https:' + url
-                if url.startswith('/'):
-                    from urllib.parse import urljoin
-                    url = urljoin(page_url, url)
-                return url
+    def _stop_mods_watcher(self):
+        try:
+            if self.mods_watcher is not None:
+                self.mods_watcher.stop()
         except Exception:
             pass
-        return None
-    # endregion
+        self.mods_watcher = None
 
-    # region --- Auto Refresh ---
-    def _get_mods_state(self):
-        """Returns a hashable representation of the mods folder state."""
-        state = set()
-        mods_path = Path("./mods")
-        if not mods_path.exists():
-            return state
-        try:
-            for item in mods_path.iterdir():
-                # Track name and mtime to detect additions/removals
-                try:
-                    state.add((item.name, int(item.stat().st_mtime)))
-                except Exception:
-                    pass
+    def _acknowledge_mod_change(self, mod):
+        # Our own writes to a mod folder shouldn't come back as an external change
+        try:
+            if self.mods_watcher is not None:
+                self.mods_watcher.acknowledge([Path(mod["folder_path"]).name])
         except Exception:
             pass
-        return state
 
-    def _poll_mods_changes(self):
+    def _on_mods_imported(self, folders, paks):
+        """Called on the Tk thread after the import queue wrapped a batch of loose paks."""
         try:
-            current_state = self._get_mods_state()
-            if current_state != self.last_mods_state:
-                # Change detected
+            # Our own moves shouldn't come back from the watcher as external changes
+            if self.mods_watcher is not None:
+                self.mods_watcher.acknowledge(list(folders) + list(paks))
+        except Exception:
+            pass
+        self._intern_mods_async([Path("./mods") / name for name in folders])
+        self.refresh_logic()
+
+    def _on_mods_changed(self, diff):
+        """Called on the Tk thread with the per-mod diff reported by the watcher."""
+        try:
+            names = diff["added"] + diff["removed"] + diff["changed"] + diff["loose_paks"]
+            if names:
+                print(f"Mods folder changed: {', '.join(names)}")
+            # Loose paks go to the import queue; it refreshes once they are in place
+            if diff["loose_paks"]:
+                self.mod_importer.enqueue(diff["loose_paks"])
+            # Durante una tanda de instalaciones la cola refresca una sola vez al terminar
+            if (diff["added"] or diff["removed"] or diff["changed"]) and not self.install_queue.busy():
                 self.refresh_logic()
-                # Update state after refresh (refresh might have moved files)
-                self.last_mods_state = self._get_mods_state()
         except Exception as e:
             print(f"Error in auto-refresh: {e}")
-        
-        # Schedule next check
-        self.after(2000, self._poll_mods_changes)
     # endregion
 
 # region Main loop
 if __name__ == "__main__":
     myappid = 'bacrian.pum.modmanager' 
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+    if sys.platform == "win32":
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
 
     app = App()
     app.mainloop()
@@ -0,0 +1,53 @@
+"""
+app_assets.py
+
+Placeholder images for the UI (default preview, logos, window icon).
+
+The check is a handful of stats; PIL is only imported when a file is actually
+missing and has to be drawn, which after the first run is never.
+"""
+
+from pathlib import Path
+
+ASSETS_DIR = Path("assets")
+
+# name -> RGBA fill of the generated placeholder
+_PLACEHOLDERS = {
+    "default_preview.png": ((320, 180), (40, 40, 40, 255)),
+    "icon_black.png": ((64, 64), (0, 0, 0, 255)),
+    "icon_white.png": ((64, 64), (255, 255, 255, 255)),
+    "icon.png": ((64, 64), (26, 159, 132, 255)),
+}
+
+
+def missing_assets(assets_dir=ASSETS_DIR):
+    """Names of the placeholder files (and icon.ico) that don't exist yet."""
+    assets_dir = Path(assets_dir)
+    names = list(_PLACEHOLDERS) + ["icon.ico"]
+    return [name for name in names if not (assets_dir / name).exists()]
+
+
+def ensure_assets_exist(assets_dir=ASSETS_DIR):
+    """Create any missing placeholder image. Returns the names created."""
+    assets_dir = Path(assets_dir)
+    missing = missing_assets(assets_dir)
+    if not missing:
+        return []
+    try:
+        from PIL import Image
+
+        assets_dir.mkdir(exist_ok=True)
+        for name in missing:
+            if name in _PLACEHOLDERS:
+                size, col = _PLACEHOLDERS[name]
+                Image.new("RGBA", size, col).save(assets_dir / name)
+
+        if "icon.ico" in missing:
+            ico = assets_dir / "icon.ico"
+            try:
+                Image.open(assets_dir / "icon.png").save(ico)
+            except Exception:
+                Image.new("RGBA", (64, 64), (0, 0, 0, 255)).save(ico)
+    except Exception:
+        pass
+    return missing
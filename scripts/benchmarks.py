@@ -0,0 +1,685 @@
+"""
+benchmarks.py
+
+Small, dependency-free benchmarks for PUM's non-UI code paths.
+
+Usage (from the repository root):
+    python -m scripts.benchmarks catalog [--mods 800] [--runs 5]
+    python -m scripts.benchmarks scan [--mods 800] [--latency 2] [--runs 3]
+    python -m scripts.benchmarks search [--mods 5000] [--runs 20]
+    python -m scripts.benchmarks backup [--paks 20] [--size-mb 16]
+    python -m scripts.benchmarks deploy [--mods 40] [--size-mb 16] [--mode copy|hardlink|reflink|auto]
+    python -m scripts.benchmarks pakinfo [--paks 20] [--size-mb 64] [--assets 400]
+    python -m scripts.benchmarks conflicts [--mods 300] [--assets 200]
+    python -m scripts.benchmarks plan [--mods 200] [--paks 3]
+    python -m scripts.benchmarks install [--paks 4] [--size-mb 64] [--junk-mb 128]
+    python -m scripts.benchmarks extractors [--files 4] [--size-mb 32] [--runs 3]
+    python -m scripts.benchmarks startup [--runs 5]
+
+Every benchmark builds its own synthetic data in a temporary folder, so it never
+touches the real ./mods library or the game folder. `startup` is the exception:
+it starts fresh interpreters in the repository root and builds main.App there
+(which reads config.json and ./mods like a normal launch).
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _make_fake_library(root: Path, count: int):
+    """Create `count` mod folders with a modinfo.json and a tiny pak each."""
+    root.mkdir(parents=True, exist_ok=True)
+    categories = ["Skin", "Voice", "UI", "Music", "Other"]
+    for i in range(count):
+        folder = root / f"Mod {i:05d}"
+        assets = folder / "assets"
+        assets.mkdir(parents=True, exist_ok=True)
+        info = {
+            "name": f"Mod {i:05d}",
+            "version": "1.0",
+            "author": f"Author {i % 37}",
+            "screenshot": "preview.png",
+            "description": f"Synthetic benchmark mod number {i}.",
+            "category": categories[i % len(categories)],
+            "url": "",
+            "has_options": False,
+            "options": [],
+        }
+        with open(folder / "modinfo.json", "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=4)
+        with open(assets / f"mod_{i:05d}_P.pak", "wb") as f:
+            f.write(b"\0" * 64)
+
+
+def _timed(fn, runs):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _report(label, seconds, extra=""):
+    print(f"  {label:<28} {seconds * 1000:9.2f} ms {extra}")
+
+
+def bench_catalog(args):
+    from scripts import mod_catalog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mods = Path(tmp) / "mods"
+        _make_fake_library(mods, args.mods)
+        print(f"Mod catalog scan ({args.mods} mods, best of {args.runs})")
+
+        def legacy():
+            # What mod_info() used to do: open and parse every modinfo.json
+            out = []
+            for folder in mods.iterdir():
+                info_path = folder / "modinfo.json"
+                if folder.is_dir() and info_path.exists():
+                    with open(info_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    data["folder_path"] = folder
+                    out.append(data)
+            return out
+
+        def cold():
+            mod_catalog.invalidate()
+            mod_catalog.scan_mods(mods, rebuild=True)
+
+        def warm_disk():
+            # New session: index file present, nothing in memory
+            mod_catalog.invalidate()
+            mod_catalog.scan_mods(mods)
+
+        def warm_memory():
+            mod_catalog.scan_mods(mods)
+
+        _report("legacy (parse everything)", _timed(legacy, args.runs))
+        _report("cold (full rebuild)", _timed(cold, args.runs))
+        _report("warm (index from disk)", _timed(warm_disk, args.runs))
+        _report("warm (in memory)", _timed(warm_memory, args.runs))
+
+        # Touch a handful of mods and check only those get parsed again
+        changed = list(mods.iterdir())[: max(1, args.mods // 100)]
+        for folder in changed:
+            info_path = folder / "modinfo.json"
+            data = json.loads(info_path.read_text(encoding="utf-8"))
+            data["description"] += " (edited)"
+            info_path.write_text(json.dumps(data, indent=4), encoding="utf-8")
+        stats = {}
+        start = time.perf_counter()
+        mod_catalog.scan_mods(mods, stats=stats)
+        _report("warm after edits", time.perf_counter() - start, f"(parsed {stats['parsed']}, cached {stats['cached']})")
+        mod_catalog.invalidate()
+
+
+def bench_scan(args):
+    from scripts import mod_catalog
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mods = Path(tmp) / "mods"
+        _make_fake_library(mods, args.mods)
+        print(f"Serial vs pooled scan ({args.mods} mods, {args.latency} ms simulated latency per mod, best of {args.runs})")
+
+        # Simulate a slow HDD / network share: every stat+parse waits like real I/O would
+        real_probe = mod_catalog._probe
+        if args.latency > 0:
+            def slow_probe(*a):
+                time.sleep(args.latency / 1000)
+                return real_probe(*a)
+            mod_catalog._probe = slow_probe
+        try:
+            for workers in (1, mod_catalog.DEFAULT_WORKERS):
+                first = []
+
+                def run():
+                    mod_catalog.invalidate()
+                    start = time.perf_counter()
+                    first.clear()
+                    mod_catalog.scan_mods(mods, rebuild=True, workers=workers,
+                                          on_batch=lambda b: first or first.append(time.perf_counter() - start))
+
+                best = _timed(run, args.runs)
+                _report(f"cold, {workers} worker(s)", best, f"(first batch after {first[0] * 1000:.1f} ms)")
+        finally:
+            mod_catalog._probe = real_probe
+            mod_catalog.invalidate()
+
+
+def bench_deploy(args):
+    from scripts import deploy as dp
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mods = Path(tmp) / "mods"
+        target = Path(tmp) / "game" / "~mods"
+        chunk = b"\x5a" * (1024 * 1024)
+        active = []
+        for i in range(args.mods):
+            assets = mods / f"Mod {i:05d}" / "assets"
+            assets.mkdir(parents=True)
+            with open(assets / f"mod_{i:05d}.pak", "wb") as f:
+                for _ in range(args.size_mb):
+                    f.write(chunk)
+            active.append({"name": f"Mod {i:05d}", "folder_path": assets.parent})
+        total = args.mods * args.size_mb
+        print(f"Deploy ({args.mods} paks x {args.size_mb} MB = {total} MB, mode {args.mode})")
+
+        def legacy():
+            # What deploy_mods() used to do: wipe ~mods and copy everything again
+            import shutil
+            target.mkdir(parents=True, exist_ok=True)
+            for old in target.glob("*.pak"):
+                old.unlink()
+            for name, source in dp.desired_files(active, {}).items():
+                shutil.copy(source, target / name)
+
+        def run(label, mods_now):
+            start = time.perf_counter()
+            report = dp.deploy(target, dp.desired_files(mods_now, {}), mode=args.mode, probe_dir=mods)
+            _report(label, time.perf_counter() - start,
+                    f"[{report['mode']}] (copied {report['copied']} / {dp.format_size(report['bytes_copied'])}, "
+                    f"skipped {report['skipped']} / {dp.format_size(report['bytes_skipped'])}, removed {report['removed']})"
+                    + (f" staging {report['staging_seconds'] * 1000:.1f} ms, swap {report['swap_seconds'] * 1000:.2f} ms"
+                       if report.get("staged") else ""))
+
+        start = time.perf_counter()
+        legacy()
+        _report("legacy full copy", time.perf_counter() - start)
+        for old in target.glob("*.pak"):
+            old.unlink()
+
+        run("first deploy", active)
+        run("nothing changed", active)
+        # Toggle one mod off and another one's pak gets rewritten
+        (Path(active[1]["folder_path"]) / "assets" / "mod_00001.pak").write_bytes(b"changed")
+        run("1 removed, 1 changed", active[:-1])
+        # Re-extracted with identical bytes: only mtime moves, hash says skip
+        src = Path(active[0]["folder_path"]) / "assets" / "mod_00000.pak"
+        src.write_bytes(src.read_bytes())
+        run("1 touched (same hash)", active[:-1])
+
+        # What Launch Game checks before deciding it can skip the deploy
+        from scripts import deploy_plan as pl
+        pl.save_fingerprint(target, pl.deploy_fingerprint(pl.collect_sources(active[:-1], {}), {}))
+        check = lambda: pl.is_deployed(target, pl.deploy_fingerprint(pl.collect_sources(active[:-1], {}), {}))
+        _report("launch fingerprint check", _timed(check, 5), f"(up to date: {check()})")
+
+
+def bench_backup(args):
+    import os
+    import zipfile
+    from scripts import snapshot_backup as sb
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "~mods"
+        backups = Path(tmp) / "backups"
+        target.mkdir()
+        for i in range(args.paks):
+            # Paks are already compressed: random bytes are the honest stand-in
+            (target / f"mod_{i:03d}_P.pak").write_bytes(os.urandom(args.size_mb * 1024 * 1024))
+        print(f"Backup ({args.paks} paks x {args.size_mb} MB)")
+
+        start = time.perf_counter()
+        zip_path = Path(tmp) / "legacy.zip"
+        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for f in target.glob("*.pak"):
+                zf.write(f, f.name)
+        _report("legacy zip (per backup)", time.perf_counter() - start, f"({zip_path.stat().st_size // (1024 * 1024)} MB each)")
+
+        def run(label):
+            start = time.perf_counter()
+            r = sb.create_snapshot(target, backups)
+            _report(label, time.perf_counter() - start,
+                    f"(new objects {r['new_objects']}, reused {r['reused']}, unchanged {r['unchanged']})")
+
+        run("snapshot, first")
+        run("snapshot, unchanged")
+        (target / "mod_000_P.pak").write_bytes(os.urandom(args.size_mb * 1024 * 1024))
+        run("snapshot, 1 pak changed")
+        stored = sum(f.stat().st_size for f in (backups / "objects").rglob("*") if f.is_file())
+        print(f"  objects on disk after 2 snapshots: {stored // (1024 * 1024)} MB")
+
+
+def _write_fake_pak(path: Path, assets: int, data_mb: int):
+    """Minimal v8 pak: `data_mb` MB of payload, a legacy index with `assets` entries, the footer."""
+    import struct
+
+    def fstring(text):
+        raw = text.encode() + b"\0"
+        return struct.pack("<i", len(raw)) + raw
+
+    block = b"\x5a" * (1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(data_mb):
+            f.write(block)
+        index = bytearray(fstring("../../../PHOENIX/") + struct.pack("<i", assets))
+        per = max(1, data_mb * 1024 * 1024 // max(assets, 1))
+        for i in range(assets):
+            index += fstring(f"Content/Characters/Ch{i % 40:03d}/Mesh/SK_Body_{i:05d}.uasset")
+            # offset, size, uncompressed, method, sha1, encrypted flag, block size
+            index += struct.pack("<qqqI", i * per, per, per, 0) + b"\0" * 20 + b"\0" + struct.pack("<I", 0)
+        offset = data_mb * 1024 * 1024
+        f.write(index)
+        footer = b"\0" * 16 + b"\0" + struct.pack("<Iiqq", 0x5A6F12E1, 8, offset, len(index)) + b"\0" * 20
+        footer += b"".join(name.ljust(32, b"\0") for name in (b"Zlib", b"Oodle", b"", b"", b""))
+        f.write(footer)
+
+
+def bench_pakinfo(args):
+    from scripts import pak_reader
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mods = Path(tmp) / "mods"
+        mods.mkdir()
+        paks = []
+        for i in range(args.paks):
+            path = mods / f"mod_{i:03d}_P.pak"
+            _write_fake_pak(path, args.assets, args.size_mb)
+            paks.append(path)
+        print(f"Pak index read ({args.paks} paks x {args.size_mb} MB, {args.assets} assets each, best of {args.runs})")
+
+        def full_read():
+            # Naive approach: pull the whole file into memory to look at its tail
+            for path in paks:
+                data = path.read_bytes()
+                pak_reader._parse_index(data, pak_reader._parse_footer(data))
+
+        def mmap_read():
+            for path in paks:
+                pak_reader.read_pak(path)
+
+        def cached():
+            for path in paks:
+                pak_reader.pak_info(path, mods, save=False)
+
+        _report("read whole file", _timed(full_read, args.runs))
+        _report("mmap footer + index", _timed(mmap_read, args.runs))
+        cached()
+        pak_reader.save_cache(mods)
+        _report("cached (memory)", _timed(cached, args.runs))
+        pak_reader._memory.clear()
+        _report("cached (.pum_pakinfo)", _timed(lambda: (pak_reader._memory.clear(), cached()), args.runs))
+
+
+def bench_conflicts(args):
+    from scripts.conflict_index import ConflictIndex
+
+    rnd = random.Random(7)
+    # A shared pool of character assets: popular ones get overridden by many mods
+    pool = [f"PHOENIX/Content/Characters/Ch{c:03d}/Mesh/SK_Part_{p:03d}.uasset"
+            for c in range(60) for p in range(50)]
+    mods = {}
+    for i in range(args.mods):
+        picks = rnd.sample(pool[:max(args.assets, len(pool) // 4)], min(args.assets, len(pool) // 4))
+        mods[f"Mod {i:05d}"] = {f"mod_{i:05d}_P.pak": picks}
+    active = {key for key in mods if rnd.random() < 0.5}
+    print(f"Conflict index ({args.mods} mods x {args.assets} assets, {len(active)} enabled)")
+
+    index = ConflictIndex()
+    start = time.perf_counter()
+    for key, assets in mods.items():
+        index.set_mod(key, assets)
+    _report("build", time.perf_counter() - start)
+
+    key = next(iter(mods))
+    start = time.perf_counter()
+    index.set_mod(key, mods[key])
+    _report("update one mod", time.perf_counter() - start)
+
+    rows = list(mods)[:30]
+    is_active = active.__contains__
+
+    def badges():
+        for row in rows:
+            index.conflict_count(row, is_active)
+
+    def naive():
+        # Recompute from scratch: intersect each row against every enabled mod
+        sets = {k: {p.lower() for paths in v.values() for p in paths} for k, v in mods.items()}
+        for row in rows:
+            sum(1 for other in active if other != row and sets[row] & sets[other])
+
+    _report("30 badges (index)", _timed(badges, args.runs))
+    _report("30 badges (recompute)", _timed(naive, max(1, args.runs // 10)))
+
+
+def bench_install(args):
+    import os
+    import shutil
+    import zipfile
+    from scripts import installer
+
+    mb = 1024 * 1024
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        archive = tmp / "Big Mod.zip"
+        # Paks are already compressed (stored); the junk is what mod authors ship alongside
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_STORED) as zf:
+            root = "Big Mod/"
+            zf.writestr(root + "modinfo.json", json.dumps({"name": "Big Mod", "version": "1.0"}))
+            zf.writestr(root + "preview.png", os.urandom(64 * 1024))
+            for i in range(args.paks):
+                zf.writestr(f"{root}assets/part{i}_P.pak", os.urandom(args.size_mb * mb))
+            zf.writestr(root + "source/textures.psd", os.urandom(args.junk_mb // 2 * mb))
+            zf.writestr("showcase.mp4", os.urandom(args.junk_mb // 2 * mb))
+            zf.writestr("README.txt", b"Thanks for downloading!\n")
+        with zipfile.ZipFile(archive) as zf:
+            everything = sum(zi.file_size for zi in zf.infolist())
+            files = installer.zip_files(zf)
+            mod_root = installer.find_zip_mod_root(files)
+            wanted = sum(files[n].file_size for n, _ in installer.mod_members(files, mod_root))
+            in_root = sum(zi.file_size for n, zi in files.items() if n.startswith(mod_root))
+        print(f"Install archive ({args.paks} paks x {args.size_mb} MB + {args.junk_mb} MB of extras, "
+              f"{everything // mb} MB archive)")
+
+        # What the confirmation dialog needs, before anything is written
+        _report("inspect (metadata only)", _timed(lambda: installer.inspect_archive(archive), 20))
+
+        mods = tmp / "mods"
+        mods.mkdir()
+        start = time.perf_counter()
+        with tempfile.TemporaryDirectory(dir=tmp) as extract:
+            with zipfile.ZipFile(archive) as zf:
+                zf.extractall(extract)
+            source = installer.find_mod_root(extract)
+            shutil.copytree(source, mods / "legacy")
+        _report("legacy extractall+copytree", time.perf_counter() - start,
+                f"(wrote {(everything + in_root) // mb} MB, temp {everything // mb} MB)")
+
+        start = time.perf_counter()
+        installer.install_archive(archive, mods)
+        _report("streamed members", time.perf_counter() - start, f"(wrote {wanted // mb} MB, temp 0 MB)")
+
+
+def bench_extractors(args):
+    import os
+    import shutil
+    import zipfile
+    from scripts import extractors
+
+    mb = 1024 * 1024
+    backends = extractors.available_backends()
+    print("Backends found: " + ", ".join(b.name for b in backends))
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        # Half random (like paks), half compressible (like json/txt/psd layers)
+        payload = {f"Mod/assets/part{i}_P.pak": os.urandom(args.size_mb * mb // 2) + bytes(args.size_mb * mb // 2)
+                   for i in range(args.files)}
+        payload["Mod/modinfo.json"] = json.dumps({"name": "Mod"}).encode()
+        archives = {"zip": tmp / "bench.zip"}
+        with zipfile.ZipFile(archives["zip"], "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for name, data in payload.items():
+                zf.writestr(name, data)
+        seven = next((b for b in backends if b.name == "7z"), None)
+        if seven is not None:
+            # Same content as a 7z, written by the 7z found on PATH
+            src = tmp / "src"
+            for name, data in payload.items():
+                (src / name).parent.mkdir(parents=True, exist_ok=True)
+                (src / name).write_bytes(data)
+            import subprocess
+            subprocess.run([seven.exe, "a", "-mx=1", str(tmp / "bench.7z"), "Mod"], cwd=src,
+                           **extractors._run_kwargs(stdout=subprocess.DEVNULL, check=True))
+            archives["7z"] = tmp / "bench.7z"
+        total = sum(len(d) for d in payload.values())
+        one = [next(iter(payload))]
+        print(f"{args.files} files x {args.size_mb} MB ({total // mb} MB unpacked)")
+
+        for fmt, archive in archives.items():
+            for backend in backends:
+                if fmt not in backend.formats:
+                    continue
+                out = tmp / "out"
+                for label, members in (("all", None), ("1 member", one)):
+                    ticks = []
+
+                    def run():
+                        shutil.rmtree(out, ignore_errors=True)
+                        out.mkdir()
+                        ok = backend.extract(archive, out, members=members, progress=ticks.append)
+                        if not ok:
+                            raise RuntimeError("failed")
+                    try:
+                        seconds = _timed(run, args.runs)
+                    except Exception as e:
+                        print(f"  {fmt:<4} {backend.name:<8} {label:<9} failed ({e})")
+                        continue
+                    _report(f"{fmt:<4} {backend.name:<8} {label:<9}", seconds,
+                            f"({len(ticks) // args.runs} progress updates)")
+                shutil.rmtree(out, ignore_errors=True)
+
+
+def bench_plan(args):
+    from scripts import deploy_plan as pl
+    from scripts.conflict_index import ConflictIndex
+
+    # Pure planning: synthetic sources, no files at all
+    rnd = random.Random(3)
+    sources = []
+    index = ConflictIndex()
+    pool = [f"PHOENIX/Content/Characters/Ch{c:03d}/SK_{p:03d}.uasset" for c in range(40) for p in range(25)]
+    for i in range(args.mods):
+        key = f"Mod {i:05d}"
+        paks = [(f"{'shared' if j == 0 else f'mod_{i:05d}_{j}'}_P.pak", f"/lib/{key}/assets/p{j}.pak", 64 * 1024 * 1024)
+                for j in range(args.paks)]
+        sources.append({"name": key, "key": key, "paks": paks})
+        index.set_mod(key, {"p.pak": rnd.sample(pool, 30)})
+    mods = [{"name": s["name"]} for s in sources]
+    order = [m["name"] for m in mods]
+    rnd.shuffle(order)
+    print(f"Deploy plan ({args.mods} mods x {args.paks} paks, best of {args.runs})")
+
+    _report("order mods", _timed(lambda: pl.ordered_mods(mods, order), args.runs))
+    _report("build plan", _timed(lambda: pl.build_plan(sources), args.runs))
+    _report("build plan + conflicts", _timed(lambda: pl.build_plan(sources, index), args.runs))
+    plan = pl.build_plan(sources, index)
+    _report("format plan", _timed(lambda: pl.format_plan(plan), args.runs),
+            f"({len(plan['files'])} files, {len(plan['conflicts'])} conflicting pairs)")
+
+
+_WORDS = ("deku", "bakugo", "todoroki", "uraraka", "all", "might", "mirio", "hawks", "dabi", "toga",
+          "shigaraki", "endeavor", "kirishima", "tsuyu", "momo", "ochaco", "costume", "skin", "voice",
+          "pack", "retexture", "classic", "winter", "summer", "school", "uniform", "hero", "villain",
+          "league", "alt", "recolor", "hd", "remaster", "lobby", "music", "theme", "announcer", "ui")
+
+
+def _fake_mods(count, seed=1):
+    rnd = random.Random(seed)
+    categories = ["Skin", "Voice", "UI", "Music", "Other"]
+    mods = []
+    for i in range(count):
+        name = " ".join(rnd.choice(_WORDS).title() for _ in range(rnd.randint(2, 4))) + f" {i}"
+        mods.append({
+            "name": name,
+            "author": f"{rnd.choice(_WORDS)}{rnd.randint(1, 300)}",
+            "category": rnd.choice(categories),
+            "description": " ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(8, 30))),
+        })
+    return mods
+
+
+def bench_search(args):
+    from scripts.search_index import SearchIndex
+
+    mods = _fake_mods(args.mods)
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.build((str(i), m) for i, m in enumerate(mods))
+    print(f"Search index ({args.mods} mods, best of {args.runs})")
+    _report("build", time.perf_counter() - start)
+
+    queries = ["deku", "tod", "bakgo", "todoroky winter", "mirio costume", "ura", "announcr", "skin pack hd", "zzzz"]
+    worst = 0.0
+    for q in queries:
+        best = _timed(lambda: index.search(q), args.runs)
+        worst = max(worst, best)
+        _report(f"query {q!r}", best, f"({len(index.search(q))} hits)")
+
+    # Legacy filter: substring match on the name only
+    best = _timed(lambda: [m for m in mods if "deku" in m["name"].lower()], args.runs)
+    _report("legacy name substring", best)
+    print(f"  slowest query: {worst * 1000:.2f} ms")
+
+
+# Modules the GUI needs but the core/CLI must not pay for at import time
+_HEAVY = ("customtkinter", "tkinter", "PIL", "requests", "logging", "concurrent.futures")
+_STARTUP_MODULES = ("scripts.config", "scripts.i18n", "scripts.mod_catalog", "scripts.deploy",
+                    "scripts.deploy_plan", "scripts.installer", "scripts.cli", "main")
+
+
+def _import_time(module, runs):
+    """Best cumulative import time of `module` in a fresh interpreter (seconds), or an error string."""
+    import subprocess
+
+    best = None
+    for _ in range(runs):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent)
+        if proc.returncode != 0:
+            lines = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+            return lines[-1] if lines else f"exit code {proc.returncode}"
+        for line in proc.stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                seconds = int(parts[1]) / 1e6
+                best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def _heavy_imports(module):
+    import subprocess
+
+    code = f"import sys, {module}; print(','.join(m for m in {_HEAVY!r} if m in sys.modules))"
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                          cwd=Path(__file__).resolve().parent.parent)
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+_FIRST_WINDOW = """
+import main
+app = main.App()
+app.after_idle(lambda: [app.update(), print("PUM_FIRST_WINDOW", flush=True), app.destroy()])
+app.mainloop()
+"""
+
+
+def bench_startup(args):
+    """Import time of the core modules and main.py, and time until the first window is drawn."""
+    import subprocess
+
+    root = Path(__file__).resolve().parent.parent
+    baseline = _timed(lambda: subprocess.run([sys.executable, "-c", "pass"]), args.runs)
+    print(f"Startup (fresh interpreter each run, best of {args.runs})")
+    _report("python -c pass", baseline)
+    for module in _STARTUP_MODULES:
+        result = _import_time(module, args.runs)
+        if isinstance(result, str) or result is None:
+            print(f"  import {module:<21} not importable here: {result}")
+            continue
+        heavy = _heavy_imports(module)
+        _report(f"import {module}", result, f"(pulls in: {heavy})" if heavy else "")
+
+    cli = _timed(lambda: subprocess.run([sys.executable, "-m", "scripts.cli", "--help"], cwd=root,
+                                        capture_output=True), args.runs)
+    _report("cli --help (wall)", cli)
+
+    # Build the App like main.py does and print a marker once its first window is drawn, then exit
+    best = None
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run([sys.executable, "-c", _FIRST_WINDOW], cwd=root, capture_output=True,
+                                  text=True, timeout=60)
+        except subprocess.TimeoutExpired:
+            print("  time to first window        timed out")
+            return
+        if "PUM_FIRST_WINDOW" not in proc.stdout:
+            lines = proc.stderr.strip().splitlines()
+            print(f"  time to first window        not available here: {lines[-1] if lines else proc.returncode}")
+            return
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    _report("time to first window", best, "(includes interpreter start and window teardown)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scripts.benchmarks", description="PUM micro benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("catalog", help="cold vs warm mod catalog scans")
+    p.add_argument("--mods", type=int, default=800)
+    p.add_argument("--runs", type=int, default=5)
+    p.set_defaults(func=bench_catalog)
+
+    p = sub.add_parser("scan", help="serial vs thread-pool scans on simulated slow storage")
+    p.add_argument("--mods", type=int, default=800)
+    p.add_argument("--latency", type=float, default=2.0, help="simulated I/O latency per mod, in ms")
+    p.add_argument("--runs", type=int, default=3)
+    p.set_defaults(func=bench_scan)
+
+    p = sub.add_parser("deploy", help="full copy vs manifest-driven incremental deploy")
+    p.add_argument("--mods", type=int, default=40)
+    p.add_argument("--size-mb", type=int, default=16)
+    p.add_argument("--mode", choices=("auto", "copy", "hardlink", "reflink"), default="copy")
+    p.set_defaults(func=bench_deploy)
+
+    p = sub.add_parser("backup", help="zip-per-deploy vs deduplicated snapshots")
+    p.add_argument("--paks", type=int, default=20)
+    p.add_argument("--size-mb", type=int, default=16)
+    p.set_defaults(func=bench_backup)
+
+    p = sub.add_parser("pakinfo", help="mmap pak footer/index reader vs reading whole files")
+    p.add_argument("--paks", type=int, default=20)
+    p.add_argument("--size-mb", type=int, default=64)
+    p.add_argument("--assets", type=int, default=400)
+    p.add_argument("--runs", type=int, default=3)
+    p.set_defaults(func=bench_pakinfo)
+
+    p = sub.add_parser("conflicts", help="conflict index build, update and badge lookups")
+    p.add_argument("--mods", type=int, default=300)
+    p.add_argument("--assets", type=int, default=200)
+    p.add_argument("--runs", type=int, default=50)
+    p.set_defaults(func=bench_conflicts)
+
+    p = sub.add_parser("install", help="zip install: extract+copy vs streaming only the needed members")
+    p.add_argument("--paks", type=int, default=4)
+    p.add_argument("--size-mb", type=int, default=64)
+    p.add_argument("--junk-mb", type=int, default=128)
+    p.set_defaults(func=bench_install)
+
+    p = sub.add_parser("extractors", help="time every archive backend found on this machine")
+    p.add_argument("--files", type=int, default=4)
+    p.add_argument("--size-mb", type=int, default=32)
+    p.add_argument("--runs", type=int, default=3)
+    p.set_defaults(func=bench_extractors)
+
+    p = sub.add_parser("plan", help="pure deploy planning (load order, prefixes, conflicts)")
+    p.add_argument("--mods", type=int, default=200)
+    p.add_argument("--paks", type=int, default=3)
+    p.add_argument("--runs", type=int, default=20)
+    p.set_defaults(func=bench_plan)
+
+    p = sub.add_parser("startup", help="import times and time to first window")
+    p.add_argument("--runs", type=int, default=5)
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("search", help="search index build and query latency")
+    p.add_argument("--mods", type=int, default=5000)
+    p.add_argument("--runs", type=int, default=20)
+    p.set_defaults(func=bench_search)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+cli.py
+
+Headless front end: `python -m scripts.cli <command>`.
+
+Uses the same config.json, profiles, catalog, deploy plan, installer and
+snapshot backups as the GUI, but never imports customtkinter, PIL or
+tkinter, so it starts in a few tens of milliseconds and runs on machines
+without a display (scripts, CI, a Linux box sharing the game folder).
+
+Commands:
+
+    list      [--active] [--json]
+    deploy    [--profile NAME] [--mode auto|copy|hardlink|reflink] [--dry-run] [--no-backup]
+    install   PATH... [--on-collision copy|overwrite|skip]
+    inspect   ARCHIVE [--json]
+    download  URL [--file N]
+    backup    [--list | --restore ID [--dry-run]]
+    verify    [--profile NAME] [--hash]
+
+Every module beyond argparse/json/sys/pathlib is imported inside the command
+that needs it, so `list` doesn't pay for the deploy code and nothing pays for
+`requests` unless it downloads.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+MODS_DIR = Path("./mods")
+
+
+def _fail(msg, code=1):
+    print(f"Error: {msg}", file=sys.stderr)
+    return code
+
+
+def _target():
+    """~mods of the configured game folder, or None."""
+    from scripts.config import load_config
+
+    game_path = load_config()[0]
+    return Path(game_path) / "~mods" if game_path else None
+
+
+def _selection(profile=None):
+    """(active mods, load order, mod options) for `profile` (default: the saved selection)."""
+    from scripts.config import DEFAULT_PROFILE, load_app_settings, load_config, load_profile
+    from scripts.mod_catalog import scan_mods
+
+    _, selected, options = load_config()
+    if profile is not None:
+        selected = load_profile(profile)
+        if selected is None:
+            raise ValueError(f"profile not found: {profile}")
+    orders = load_app_settings().get("load_order", {}) or {}
+    order = orders.get(profile or DEFAULT_PROFILE, [])
+    wanted = set(selected)
+    mods = [m for m in scan_mods(MODS_DIR) if m.get("name") in wanted]
+    return mods, order, {k: list(v) for k, v in options.items()}
+
+
+def cmd_list(args):
+    from scripts.config import load_config
+    from scripts.mod_catalog import scan_mods
+
+    selected = set(load_config()[1])
+    mods = sorted(scan_mods(MODS_DIR), key=lambda m: m.get("name", "").lower())
+    if args.active:
+        mods = [m for m in mods if m.get("name") in selected]
+    if args.json:
+        rows = [{"name": m.get("name"), "version": m.get("version"), "author": m.get("author"),
+                 "category": m.get("category"), "folder": Path(m["folder_path"]).name,
+                 "active": m.get("name") in selected} for m in mods]
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+    for m in mods:
+        mark = "*" if m.get("name") in selected else " "
+        print(f"{mark} {m.get('name', '')}  {m.get('version', '')}  ({m.get('author', 'Unknown')})")
+    print(f"{len(mods)} mods, {sum(1 for m in mods if m.get('name') in selected)} active")
+    return 0
+
+
+def cmd_deploy(args):
+    from scripts.config import load_app_settings
+    from scripts.deploy import deploy, format_size, load_manifest, plan_deploy
+    from scripts.deploy_plan import build_plan, collect_sources, deploy_fingerprint, format_plan, \
+        ordered_mods, plan_wanted, save_fingerprint
+
+    target = _target()
+    if target is None:
+        return _fail("no game path set in config.json")
+    try:
+        mods, order, options = _selection(args.profile)
+    except ValueError as e:
+        return _fail(e)
+    settings = load_app_settings()
+
+    sources = collect_sources(ordered_mods(mods, order), options)
+    plan = build_plan(sources)
+    wanted = plan_wanted(plan)
+    if args.dry_run:
+        print(format_plan(plan, plan_deploy(target, wanted, load_manifest(target))))
+        return 0
+
+    if settings.get("backup_mods", False) and not args.no_backup and target.exists():
+        from scripts.snapshot_backup import BACKUP_DIR, create_snapshot
+        snap = create_snapshot(target, BACKUP_DIR, keep=10)
+        if snap["files"]:
+            print(f"Backup {snap['id']}: {snap['files']} paks, {format_size(snap['bytes_new'])} new")
+
+    mode = args.mode or settings.get("deploy_mode", "auto")
+    report = deploy(target, wanted, mode=mode, probe_dir=MODS_DIR.resolve())
+    for error in report["errors"]:
+        print(f"Error deploying {error}", file=sys.stderr)
+    print(f"Deployed ({report['mode']}): {report['copied']} copied ({format_size(report['bytes_copied'])}), "
+          f"{report['renamed']} renamed, {report['skipped']} unchanged, {report['removed']} removed")
+    if report.get("rolled_back"):
+        reason = report["errors"][0] if report["errors"] else "unknown error"
+        print(f"Deploy failed ({reason}); the previous ~mods was restored", file=sys.stderr)
+    if report["errors"]:
+        return 1
+    save_fingerprint(target, deploy_fingerprint(sources, options))
+    return 0
+
+
+def _collision_answer(choice):
+    action = {"copy": "copy", "overwrite": "overwrite", "skip": "cancel"}[choice]
+    return lambda name: action
+
+
+def _intern(mod_dirs):
+    """Move new paks into the pak store if the user enabled it in the GUI."""
+    from scripts.config import load_app_settings
+
+    if not mod_dirs or not load_app_settings().get("pak_store", False):
+        return
+    from scripts.pak_store import intern_mods
+    report = intern_mods(MODS_DIR, mod_dirs)
+    for error in report["errors"]:
+        print(f"Error interning {error}", file=sys.stderr)
+
+
+def cmd_install(args):
+    from scripts import installer
+
+    on_collision = _collision_answer(args.on_collision)
+    installer.clean_staging(MODS_DIR)
+    failed = 0
+    for raw in args.paths:
+        path = Path(raw)
+        try:
+            installed = installer.install_path(path, MODS_DIR, on_collision=on_collision)
+        except Exception as e:
+            print(f"Error installing {path.name}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        if not installed:
+            print(f"Nothing installed from {path.name}")
+            continue
+        _intern(installed)
+        for dest in installed:
+            print(f"Installed {dest.name}")
+    return 1 if failed else 0
+
+
+def cmd_inspect(args):
+    """What install would take from an archive, from its metadata only."""
+    from scripts import installer
+    from scripts.deploy import format_size
+
+    info = installer.inspect_archive(args.archive)
+    if info is None:
+        return _fail(f"can't read {args.archive} (not a zip, and no 7-Zip/UnRAR to list it)")
+    if args.json:
+        print(json.dumps(info, indent=2, ensure_ascii=False))
+        return 0
+    print(f"{info['files']} files, {format_size(info['size'])}")
+    if info["root"] is not None:
+        modinfo = info["modinfo"] or {}
+        print(f"Mod: {modinfo.get('name', '?')} {modinfo.get('version', '')} by {modinfo.get('author', 'Unknown')}"
+              f" (at '{info['root'] or '/'}')")
+        paks = info["paks"]
+    else:
+        print("No modinfo.json: every pak becomes its own mod")
+        paks = info["loose_paks"]
+    for name, size in paks:
+        print(f"  {name}  {format_size(size)}")
+    print(f"Not installed: {format_size(info['other_size'])}")
+    return 0
+
+
+def cmd_download(args):
+    from scripts import installer
+    try:
+        from gamebanana import fetch_mod_from_url
+    except ImportError as e:
+        return _fail(f"download needs the 'requests' package ({e})")
+
+    try:
+        meta, img_url, files = fetch_mod_from_url(args.url)
+    except Exception as e:
+        return _fail(e)
+    meta = meta or {}
+    meta["url"] = args.url
+    if args.file is not None:
+        if not 1 <= args.file <= len(files):
+            return _fail(f"--file must be between 1 and {len(files)}")
+        files = [files[args.file - 1]]
+    urls = [f.get("download_url") or f.get("_sDownloadUrl") for f in files]
+    urls = [u for u in urls if u]
+    if not urls:
+        return _fail("no downloadable files found")
+    installer.clean_staging(MODS_DIR)
+
+    def progress(frac):
+        if sys.stderr.isatty():
+            print(f"\rDownloading... {int(frac * 100)}%", end="", file=sys.stderr, flush=True)
+
+    try:
+        dest = installer.download_and_install(meta, urls, MODS_DIR, img_url=img_url, page_url=args.url, progress=progress)
+    except Exception as e:
+        if sys.stderr.isatty():
+            print(file=sys.stderr)
+        return _fail(e)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    _intern([dest])
+    print(f"Installed {dest.name}")
+    return 0
+
+
+def cmd_backup(args):
+    from scripts.deploy import format_size
+    from scripts.snapshot_backup import BACKUP_DIR, create_snapshot, list_snapshots, migrate_legacy, restore
+
+    # Zip backups from older versions are listed and restored as snapshots
+    migrate_legacy(BACKUP_DIR)
+    if args.list:
+        for snap in list_snapshots(BACKUP_DIR):
+            print(f"{snap['id']}  {snap['created']}  {snap['files']} paks  {format_size(snap['size'])}")
+        return 0
+
+    target = _target()
+    if target is None:
+        return _fail("no game path set in config.json")
+    if args.restore:
+        try:
+            report = restore(BACKUP_DIR, args.restore, target, dry_run=args.dry_run)
+        except (FileNotFoundError, ValueError, KeyError):
+            return _fail(f"no backup {args.restore}")
+        verb = "Would write" if args.dry_run else "Wrote"
+        print(f"{verb} {len(report['write'])} paks ({format_size(report['bytes_written'])}), "
+              f"kept {len(report['keep'])}, deleted {len(report['delete'])}")
+        for error in report["errors"]:
+            print(f"Error restoring {error}", file=sys.stderr)
+        return 1 if report["errors"] else 0
+
+    if not target.exists():
+        return _fail(f"{target} does not exist")
+    report = create_snapshot(target, BACKUP_DIR, keep=10)
+    if report["unchanged"]:
+        print(f"~mods unchanged since backup {report['id']}")
+    else:
+        print(f"Backup {report['id']}: {report['files']} paks, {report['new_objects']} new "
+              f"({format_size(report['bytes_new'])}), {format_size(report['bytes_total'])} total")
+    return 0
+
+
+def cmd_verify(args):
+    """Check that ~mods matches what `deploy` would produce. Exit code 1 on drift."""
+    from scripts.deploy import hash_file, load_manifest, plan_deploy
+    from scripts.deploy_plan import build_plan, collect_sources, deploy_fingerprint, is_deployed, \
+        ordered_mods, plan_wanted
+
+    target = _target()
+    if target is None:
+        return _fail("no game path set in config.json")
+    try:
+        mods, order, options = _selection(args.profile)
+    except ValueError as e:
+        return _fail(e)
+    sources = collect_sources(ordered_mods(mods, order), options)
+    if not args.hash and is_deployed(target, deploy_fingerprint(sources, options)):
+        print("~mods is up to date")
+        return 0
+
+    manifest = load_manifest(target)
+    diff = plan_deploy(target, plan_wanted(build_plan(sources)), manifest)
+    issues = [f"missing or outdated: {name}" for name, _, _ in diff["copy"]]
+    issues += [f"misnamed: {old} (should be {new})" for old, new, _, _ in diff["rename"]]
+    issues += [f"not part of the selection: {name}" for name in diff["remove"]]
+    if args.hash:
+        for name, _, _ in diff["skip"]:
+            expected = manifest.get(name, {}).get("hash")
+            try:
+                if expected and hash_file(target / name) != expected:
+                    issues.append(f"content differs: {name}")
+            except OSError as e:
+                issues.append(f"unreadable: {name} ({e})")
+    for issue in issues:
+        print(issue)
+    print("~mods is up to date" if not issues else f"{len(issues)} issues")
+    return 1 if issues else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m scripts.cli", description="Manage mods without the GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="list installed mods (* = active)")
+    p.add_argument("--active", action="store_true", help="only active mods")
+    p.add_argument("--json", action="store_true", help="print JSON")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("deploy", help="deploy the active mods to ~mods")
+    p.add_argument("--profile", help="deploy this profile instead of the saved selection")
+    p.add_argument("--mode", choices=("auto", "copy", "hardlink", "reflink"), help="override the deploy mode setting")
+    p.add_argument("--dry-run", action="store_true", help="print the plan without touching ~mods")
+    p.add_argument("--no-backup", action="store_true", help="skip the backup even if enabled in settings")
+    p.set_defaults(func=cmd_deploy)
+
+    p = sub.add_parser("install", help="install .pak files, archives or mod folders")
+    p.add_argument("paths", nargs="+")
+    p.add_argument("--on-collision", choices=("copy", "overwrite", "skip"), default="skip",
+                   help="what to do when the mod already exists (default: skip)")
+    p.set_defaults(func=cmd_install)
+
+    p = sub.add_parser("inspect", help="show what an archive would install, without extracting it")
+    p.add_argument("archive")
+    p.add_argument("--json", action="store_true", help="print JSON")
+    p.set_defaults(func=cmd_inspect)
+
+    p = sub.add_parser("download", help="download and install a GameBanana mod")
+    p.add_argument("url")
+    p.add_argument("--file", type=int, help="only the N-th file of the mod (1-based); default: all")
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("backup", help="back up ~mods, list or restore backups")
+    p.add_argument("--list", action="store_true", help="list backups")
+    p.add_argument("--restore", metavar="ID", help="restore backup ID")
+    p.add_argument("--dry-run", action="store_true", help="with --restore: only show what would change")
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("verify", help="check that ~mods matches the active mods")
+    p.add_argument("--profile", help="check against this profile instead of the saved selection")
+    p.add_argument("--hash", action="store_true", help="also hash every deployed pak")
+    p.set_defaults(func=cmd_verify)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
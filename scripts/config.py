@@ -0,0 +1,92 @@
+"""
+config.py
+
+config.json and profile files, without any UI dependency (shared by main.py
+and the command-line interface in scripts/cli.py).
+
+config.json holds the game path, the selected mods, per-mod options and the
+app settings; each profile is `profiles/<name>.json`, a list of mod names.
+"""
+
+import json
+import os
+
+CONFIG_FILE = "config.json"
+PROFILES_DIR = "profiles"
+DEFAULT_PROFILE = "Default Profile"
+
+
+def read_config_data():
+    """The whole config.json as a dict ({} if missing or unreadable)."""
+    try:
+        if os.path.exists(CONFIG_FILE):
+            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+    except Exception:
+        pass
+    return {}
+
+
+def save_config(path, selected_mods, mod_options=None, app_settings=None):
+    # Ensure defaults
+    if mod_options is None:
+        mod_options = {}
+
+    # Try to preserve any existing keys in config.json
+    data = read_config_data()
+
+    data.update({
+        "game_path": path,
+        "selected_mods": selected_mods,
+        "mod_options": mod_options
+    })
+
+    # If caller provided app_settings, set them; otherwise keep existing if present
+    if app_settings is not None:
+        data["app_settings"] = app_settings
+
+    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+
+
+def load_config():
+    data = read_config_data()
+    return (data.get("game_path", ""),
+            data.get("selected_mods", []),
+            data.get("mod_options", {}))
+
+
+def load_app_settings():
+    return read_config_data().get("app_settings", {}) or {}
+
+
+def load_all():
+    """(game_path, selected_mods, mod_options, app_settings) from a single read of config.json."""
+    data = read_config_data()
+    return (data.get("game_path", ""),
+            data.get("selected_mods", []),
+            data.get("mod_options", {}),
+            data.get("app_settings", {}) or {})
+
+
+def list_profiles():
+    """Profile names, Default Profile first."""
+    try:
+        names = sorted(f[:-5] for f in os.listdir(PROFILES_DIR) if f.endswith(".json"))
+    except OSError:
+        names = []
+    if DEFAULT_PROFILE in names:
+        names.remove(DEFAULT_PROFILE)
+    return [DEFAULT_PROFILE] + names
+
+
+def load_profile(name):
+    """Mod names enabled in profile `name`, or None if it doesn't exist."""
+    try:
+        with open(os.path.join(PROFILES_DIR, f"{name}.json"), "r") as f:
+            data = json.load(f)
+        return list(data) if isinstance(data, list) else None
+    except Exception:
+        return None
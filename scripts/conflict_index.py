@@ -0,0 +1,147 @@
+"""
+conflict_index.py
+
+Asset-level conflict map across installed mods.
+
+Each pak's own file index (see pak_reader) says which Unreal asset paths it
+overrides. The index maps every asset path to the mods providing it and keeps,
+per mod, how many assets it shares with every other mod. It is updated one mod
+at a time (`set_mod`/`remove`) when mods are installed, changed or deleted, so
+the mod list can ask "how many enabled mods does this one clash with?" for
+each visible row while checkboxes are toggled, without touching any pak.
+
+Asset paths are compared case-insensitively, as the engine does.
+"""
+
+import os
+from pathlib import Path
+
+
+def mod_signature(mod_folder, mods_folder=None):
+    """Cheap signature of a mod's paks: sorted (name, size, mtime_ns). Stats only."""
+    from scripts.pak_store import list_paks
+
+    sig = []
+    for name, real in list_paks(Path(mod_folder) / "assets", mods_folder):
+        try:
+            st = os.stat(real)
+        except OSError:
+            continue
+        sig.append((name, st.st_size, st.st_mtime_ns))
+    return tuple(sig)
+
+
+def read_mod_assets(mod_folder, mods_folder=None):
+    """{pak name: [asset paths]} for one mod, read from the pak indexes.
+
+    Paks that can't be read or whose index is encrypted contribute no assets.
+    """
+    from scripts.pak_reader import asset_paths, pak_info
+    from scripts.pak_store import list_paks
+
+    result = {}
+    for name, real in list_paks(Path(mod_folder) / "assets", mods_folder):
+        info = pak_info(real, mods_folder, save=False)
+        if not info or "error" in info or info.get("encrypted_index"):
+            continue
+        result[name] = asset_paths(info)
+    return result
+
+
+class ConflictIndex:
+    """asset path -> providing mods, plus per-mod overlap counts.
+
+    Not thread-safe: the UI reads and updates it from the Tk thread and does
+    the pak reading (read_mod_assets) in a worker.
+    """
+
+    def __init__(self):
+        self._mods = {}       # key -> {"sig": ..., "assets": {folded path: (path, [paks])}}
+        self._providers = {}  # folded path -> set of keys
+        self._overlap = {}    # key -> {other key: number of shared assets}
+
+    def __len__(self):
+        return len(self._mods)
+
+    def __contains__(self, key):
+        return key in self._mods
+
+    def signature(self, key):
+        entry = self._mods.get(key)
+        return entry["sig"] if entry else None
+
+    def keys(self):
+        return list(self._mods)
+
+    def set_mod(self, key, assets_by_pak, sig=None):
+        """Replace everything known about `key` with `assets_by_pak` ({pak: [paths]})."""
+        self.remove(key)
+        assets = {}
+        for pak, paths in assets_by_pak.items():
+            for path in paths:
+                folded = path.lower()
+                if folded in assets:
+                    assets[folded][1].append(pak)
+                else:
+                    assets[folded] = (path, [pak])
+        self._mods[key] = {"sig": sig, "assets": assets}
+
+        mine = self._overlap.setdefault(key, {})
+        for folded in assets:
+            providers = self._providers.setdefault(folded, set())
+            for other in providers:
+                mine[other] = mine.get(other, 0) + 1
+                theirs = self._overlap.setdefault(other, {})
+                theirs[key] = theirs.get(key, 0) + 1
+            providers.add(key)
+
+    def remove(self, key):
+        entry = self._mods.pop(key, None)
+        if entry is None:
+            return
+        for folded in entry["assets"]:
+            providers = self._providers.get(folded)
+            if providers is None:
+                continue
+            providers.discard(key)
+            if not providers:
+                del self._providers[folded]
+        for other in self._overlap.pop(key, {}):
+            theirs = self._overlap.get(other)
+            if theirs is not None:
+                theirs.pop(key, None)
+
+    def providers(self, asset):
+        """Keys of the mods that ship `asset`."""
+        return set(self._providers.get(asset.lower(), ()))
+
+    def conflicting_mods(self, key, is_active=None):
+        """{other key: shared asset count}, optionally only for mods where is_active(key) is true."""
+        overlap = self._overlap.get(key, {})
+        if is_active is None:
+            return dict(overlap)
+        return {other: n for other, n in overlap.items() if is_active(other)}
+
+    def conflict_count(self, key, is_active=None):
+        """Number of (active) mods sharing at least one asset with `key`. O(mods it overlaps)."""
+        overlap = self._overlap.get(key)
+        if not overlap:
+            return 0
+        if is_active is None:
+            return len(overlap)
+        return sum(1 for other in overlap if is_active(other))
+
+    def shared_assets(self, key, other):
+        """[(asset path, paks of key, paks of other)] both mods provide, sorted by path."""
+        a = self._mods.get(key)
+        b = self._mods.get(other)
+        if a is None or b is None:
+            return []
+        small, large = (a, b) if len(a["assets"]) <= len(b["assets"]) else (b, a)
+        result = []
+        for folded in small["assets"]:
+            if folded in large["assets"]:
+                path, paks = a["assets"][folded]
+                result.append((path, paks, b["assets"][folded][1]))
+        result.sort(key=lambda r: r[0].lower())
+        return result
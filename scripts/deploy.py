@@ -0,0 +1,724 @@
+"""
+deploy.py
+
+Incremental deployment of the active mods into the game's ~mods folder.
+
+A manifest (`~mods/.pum_manifest.json`) records what PUM put there: for each
+deployed file its source, size/mtime of the source, a content hash and the
+size/mtime of the deployed copy. Each deploy builds a plan against it:
+
+- files whose source and deployed copy are unchanged are skipped,
+- sources that were only touched (same hash) are skipped as well,
+- new or changed files are copied,
+- a deployed file whose source is unchanged but whose name changed (its mod
+  moved in the load order) is renamed instead of copied again,
+- .pak files that are no longer wanted are removed.
+
+The game only loads *.pak, so the manifest next to them is harmless.
+
+Files can be placed in ~mods in one of four ways (the "deploy_mode" setting):
+
+- copy:     a plain byte copy, works everywhere.
+- reflink:  a copy-on-write clone (btrfs/XFS via FICLONE, APFS via clonefile);
+            instant and fully independent of the source once written to.
+- hardlink: a second name for the same file; instant, but only on the same
+            volume and the game sees the library file itself. Only used when
+            chosen explicitly; the linked file is made read-only, so a tool
+            that rewrites ~mods in place fails instead of changing the library.
+            Being the same file, the library's own pak becomes read-only too
+            (PUM deletes and replaces such files without needing write access).
+- auto:     reflink where the volume supports it, otherwise copy (NTFS has no
+            reflink, so that is a copy on most installs).
+
+Whatever the mode, an existing file in ~mods is always unlinked before the new
+one is put in place, so PUM never writes through a link into the library.
+
+Copies run on a small worker pool sized for the target disk (one worker on a
+spinning disk, where parallel writes only add seeks), report progress through a
+callback and can be cancelled between chunks.
+
+Deploys are staged: the complete new ~mods is built next to it in
+`~mods.pum_staging` (unchanged files are hardlinked from the current ~mods, so
+this costs only the new/changed files), then swapped in with two directory
+renames. The game folder is only inconsistent for those renames; a failed or
+cancelled deploy just drops the staging folder and leaves ~mods as it was.
+Volumes without hardlinks fall back to updating ~mods in place.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from pathlib import Path
+
+from scripts.pak_store import list_paks, resolve_pak
+
+MANIFEST_NAME = ".pum_manifest.json"
+MANIFEST_VERSION = 1
+
+# Siblings of ~mods used while swapping (same volume, so renames are atomic)
+STAGING_SUFFIX = ".pum_staging"
+OLD_SUFFIX = ".pum_old"
+
+COPY_CHUNK = 1024 * 1024
+
+DEPLOY_MODES = ("auto", "copy", "hardlink", "reflink")
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+# {(probe dir, target): resolved mode} so auto only probes once per folder pair
+_probe_cache = {}
+
+
+class DeployCancelled(Exception):
+    """Raised inside a copy when the deploy was cancelled."""
+
+
+def deploy_name(file_path) -> str:
+    """Name a pak gets inside ~mods (Unreal Engine mods need the _P suffix)."""
+    p = Path(file_path)
+    if p.stem.endswith("_P"):
+        return p.name
+    return f"{p.stem}_P{p.suffix}"
+
+
+def desired_files(mods, mod_options):
+    """{deployed name: source path} for the active `mods`.
+
+    Mods with options only contribute the files selected in `mod_options`,
+    the rest contribute every .pak in their assets folder. If two mods ship the
+    same name, the later one wins (same as copying them in order).
+    Paks kept in the pak store as pointers resolve to their blob.
+    """
+    wanted = {}
+    for mod in mods:
+        mods_folder = Path(mod["folder_path"]).parent
+        source = Path(mod["folder_path"]) / "assets"
+        if mod.get("has_options"):
+            # SOLO copiamos los archivos seleccionados en la configuración
+            for file_name in mod_options.get(mod["name"], []):
+                real = resolve_pak(mods_folder, source / file_name)
+                if real is not None:
+                    wanted[deploy_name(file_name)] = real
+        elif source.exists():
+            for name, real in list_paks(source, mods_folder):
+                wanted[deploy_name(name)] = real
+    return wanted
+
+
+def _key(name):
+    # Windows: Foo_P.pak and foo_p.pak are the same file
+    return os.path.normcase(name)
+
+
+def _stat_sig(path):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+def hash_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(target) -> dict:
+    try:
+        with open(Path(target) / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if isinstance(raw, dict) and raw.get("version") == MANIFEST_VERSION:
+            return raw.get("files", {}) or {}
+    except Exception:
+        pass
+    return {}
+
+
+def save_manifest(target, files):
+    path = Path(target) / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"Error saving deploy manifest: {e}")
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+
+
+def plan_deploy(target, wanted, manifest):
+    """Compare `wanted` ({name: source}) with ~mods and the manifest. No side effects.
+
+    Returns {"copy": [(name, source, size)], "skip": [(name, source, size)],
+    "rename": [(old name, new name, source, size)], "remove": [name],
+    "touched": {name: updated manifest record}}.
+    `touched` holds records whose source mtime moved but whose hash did not.
+    """
+    target = Path(target)
+    plan = {"copy": [], "skip": [], "rename": [], "remove": [], "touched": {}}
+    wanted_keys = {_key(name) for name in wanted}
+
+    # Lo que sobra en ~mods se borra (igual que antes, solo *.pak)
+    try:
+        for existing in target.glob("*.pak"):
+            if _key(existing.name) not in wanted_keys:
+                plan["remove"].append(existing.name)
+    except OSError:
+        pass
+
+    for name, source in wanted.items():
+        src_sig = _stat_sig(source)
+        if src_sig is None:
+            continue
+        record = manifest.get(name)
+        dest_sig = _stat_sig(target / name)
+        up_to_date = (
+            record is not None
+            and dest_sig is not None
+            and record.get("source") == str(source)
+            and [record.get("dest_size"), record.get("dest_mtime_ns")] == list(dest_sig)
+        )
+        if up_to_date and [record.get("size"), record.get("mtime_ns")] != list(src_sig):
+            # Source touched (re-extracted, copied over...): only the hash can tell
+            up_to_date = False
+            if record.get("size") == src_sig[0] and record.get("hash"):
+                try:
+                    if hash_file(source) == record["hash"]:
+                        up_to_date = True
+                        plan["touched"][name] = dict(record, size=src_sig[0], mtime_ns=src_sig[1])
+                except OSError:
+                    pass
+        if up_to_date:
+            plan["skip"].append((name, source, src_sig[0]))
+        else:
+            plan["copy"].append((name, source, src_sig[0]))
+
+    # A file about to be removed or overwritten may be exactly what a copy
+    # needs under another name (its mod moved in the load order)
+    if plan["copy"]:
+        spare = {}
+        for old in plan["remove"] + [name for name, _, _ in plan["copy"]]:
+            record = manifest.get(old)
+            if record is not None and [record.get("dest_size"), record.get("dest_mtime_ns")] == list(_stat_sig(target / old) or ()):
+                spare.setdefault((record.get("source"), record.get("size"), record.get("mtime_ns")), old)
+        copies = []
+        for name, source, size in plan["copy"]:
+            src_sig = _stat_sig(source)
+            old = spare.pop((str(source), *src_sig), None) if src_sig else None
+            if old is not None and old != name:
+                plan["rename"].append((old, name, source, size))
+                if old in plan["remove"]:
+                    plan["remove"].remove(old)
+            else:
+                copies.append((name, source, size))
+        plan["copy"] = copies
+    return plan
+
+
+def _remove(path):
+    if os.path.lexists(path):
+        try:
+            os.remove(path)
+        except PermissionError:
+            # Read-only (Windows): clearing the flag is only done when needed, since
+            # for a hardlink it also makes the library/store copy writable
+            os.chmod(path, 0o666)
+            os.remove(path)
+
+
+def copy_with_hash(source, dest, on_bytes=None, cancelled=None) -> str:
+    """Copy `source` to `dest` and return the content hash computed on the way.
+
+    `on_bytes(n)` is called after each chunk; if `cancelled()` turns true the
+    partial copy is removed and DeployCancelled is raised.
+    """
+    h = hashlib.sha256()
+    # Unlink first: the old copy may be read-only or hardlinked elsewhere
+    _remove(dest)
+    try:
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            for chunk in iter(lambda: src.read(COPY_CHUNK), b""):
+                if cancelled is not None and cancelled():
+                    raise DeployCancelled()
+                h.update(chunk)
+                dst.write(chunk)
+                if on_bytes is not None:
+                    on_bytes(len(chunk))
+    except DeployCancelled:
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        raise
+    return h.hexdigest()
+
+
+def _reflink(source, dest):
+    """Copy-on-write clone of `source` at `dest`; raises OSError if unsupported."""
+    if sys.platform == "darwin":
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(source), os.fsencode(dest), 0) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        return
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("reflink is not supported on this platform")
+    with open(source, "rb") as src, open(dest, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.remove(dest)
+            raise
+
+
+def place_file(source, dest, mode, on_bytes=None, cancelled=None):
+    """Put `source` at `dest` using `mode`; returns the content hash for copies, else None.
+
+    The destination is always unlinked first, so replacing a deployed file never
+    writes through a hardlink (or a reflink) into the library copy.
+    """
+    if mode == "copy":
+        return copy_with_hash(source, dest, on_bytes, cancelled)
+    _remove(dest)
+    if mode == "hardlink":
+        os.link(source, dest)
+        # Shared with the library copy: writes through ~mods must not reach it.
+        # Same inode, so the library pak is read-only from now on as well.
+        os.chmod(dest, stat.S_IREAD)
+    elif mode == "reflink":
+        _reflink(source, dest)
+    else:
+        raise ValueError(f"Unknown deploy mode: {mode}")
+    if on_bytes is not None:
+        on_bytes(os.path.getsize(dest))
+    return None
+
+
+def probe_mode(probe_dir, target, wanted_mode="auto"):
+    """Resolve `wanted_mode` to a mode that actually works from `probe_dir` to `target`.
+
+    A tiny dot-file is created in `probe_dir` (ignored by the catalog and the
+    watcher) and cloned/linked into `target`. Unsupported modes fall back to
+    copy. "auto" only tries reflink: hardlinks share the file with the library,
+    so they are opt-in. Results are cached per folder pair.
+    """
+    if wanted_mode == "copy":
+        return "copy"
+    candidates = [wanted_mode] if wanted_mode in ("reflink", "hardlink") else ["reflink"]
+    key = (str(Path(probe_dir).resolve()), str(Path(target).resolve()), tuple(candidates))
+    if key in _probe_cache:
+        return _probe_cache[key]
+
+    resolved = "copy"
+    src = Path(probe_dir) / f".pum_probe_{os.getpid()}"
+    dst = Path(target) / f".pum_probe_{os.getpid()}"
+    try:
+        Path(target).mkdir(parents=True, exist_ok=True)
+        src.write_bytes(b"pum")
+        for mode in candidates:
+            try:
+                place_file(src, dst, mode)
+                if dst.read_bytes() == b"pum":
+                    resolved = mode
+                    break
+            except (OSError, ValueError):
+                continue
+            finally:
+                try:
+                    _remove(dst)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    finally:
+        try:
+            _remove(src)
+        except OSError:
+            pass
+    _probe_cache[key] = resolved
+    return resolved
+
+
+def _win_seek_penalty(path):
+    """IncursSeekPenalty of the volume holding `path` (Windows), None if unknown."""
+    import ctypes
+    from ctypes import wintypes
+
+    drive = os.path.splitdrive(os.path.abspath(path))[0]
+    if not drive or drive.startswith("\\\\"):
+        return None  # UNC / network share
+
+    class STORAGE_PROPERTY_QUERY(ctypes.Structure):
+        _fields_ = [("PropertyId", ctypes.c_int), ("QueryType", ctypes.c_int),
+                    ("AdditionalParameters", ctypes.c_ubyte * 1)]
+
+    class DEVICE_SEEK_PENALTY_DESCRIPTOR(ctypes.Structure):
+        _fields_ = [("Version", wintypes.DWORD), ("Size", wintypes.DWORD),
+                    ("IncursSeekPenalty", ctypes.c_ubyte)]
+
+    kernel32 = ctypes.windll.kernel32
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    # No access rights needed for a property query; share read/write, OPEN_EXISTING
+    handle = kernel32.CreateFileW(f"\\\\.\\{drive}", 0, 3, None, 3, 0, None)
+    if not handle or handle == wintypes.HANDLE(-1).value:
+        return None
+    try:
+        query = STORAGE_PROPERTY_QUERY(7, 0)  # StorageDeviceSeekPenaltyProperty, PropertyStandardQuery
+        out = DEVICE_SEEK_PENALTY_DESCRIPTOR()
+        returned = wintypes.DWORD()
+        ok = kernel32.DeviceIoControl(wintypes.HANDLE(handle), 0x2D1400,  # IOCTL_STORAGE_QUERY_PROPERTY
+                                      ctypes.byref(query), ctypes.sizeof(query),
+                                      ctypes.byref(out), ctypes.sizeof(out),
+                                      ctypes.byref(returned), None)
+        return bool(out.IncursSeekPenalty) if ok else None
+    finally:
+        kernel32.CloseHandle(wintypes.HANDLE(handle))
+
+
+def is_rotational(path):
+    """True for a spinning disk, False for SSD/NVMe, None if it can't be told."""
+    try:
+        if sys.platform == "win32":
+            return _win_seek_penalty(path)
+        if sys.platform.startswith("linux"):
+            st = os.stat(path)
+            dev = os.path.realpath(f"/sys/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}")
+            # Partitions have no queue/ of their own; the parent disk does
+            for folder in (dev, os.path.dirname(dev)):
+                flag = os.path.join(folder, "queue", "rotational")
+                if os.path.exists(flag):
+                    with open(flag) as f:
+                        return f.read().strip() == "1"
+    except Exception:
+        pass
+    return None
+
+
+def default_workers(target, mode="copy"):
+    """Copy workers for `target`: 1 on an HDD, 4 on an SSD, 2 when unknown (e.g. network)."""
+    if mode != "copy":
+        return 8  # links/clones are metadata only
+    rotational = is_rotational(target)
+    if rotational:
+        return 1
+    return 4 if rotational is False else 2
+
+
+def apply_plan(target, plan, manifest, mode="copy", workers=1, progress=None, cancelled=None):
+    """Execute `plan` in `target` and return the report (see deploy()).
+
+    `progress(files_done, files_total, bytes_done, bytes_total)` is called from
+    the worker threads as data is written; `cancelled()` is polled between
+    chunks and files.
+    """
+    target = Path(target)
+    report = {"copied": 0, "skipped": len(plan["skip"]), "renamed": 0, "removed": 0,
+              "bytes_copied": 0, "bytes_skipped": sum(size for _, _, size in plan["skip"]),
+              "errors": [], "cancelled": False}
+    files = {name: rec for name, rec in manifest.items()}
+    renamed = set()
+
+    # Renames go through temporary names so two mods can swap places
+    moving = []
+    for i, (old, new, _source, size) in enumerate(plan.get("rename", [])):
+        tmp = f".pum_mv_{i}.tmp"
+        record = files.pop(old, None)
+        try:
+            os.replace(target / old, target / tmp)
+            moving.append((tmp, new, size, record))
+        except Exception as e:
+            report["errors"].append(f"{old} -> {new}: {e}")
+    for tmp, new, size, record in moving:
+        try:
+            _remove(target / new)
+            os.replace(target / tmp, target / new)
+            files[new] = record
+            renamed.add(_key(new))
+            report["renamed"] += 1
+            report["skipped"] += 1
+            report["bytes_skipped"] += size
+        except Exception as e:
+            report["errors"].append(f"{new}: {e}")
+            files.pop(new, None)
+
+    for name in plan["remove"]:
+        try:
+            _remove(target / name)
+            report["removed"] += 1
+        except Exception as e:
+            report["errors"].append(f"{name}: {e}")
+        files.pop(name, None)
+
+    files.update(plan["touched"])
+
+    files_total = len(plan["copy"])
+    bytes_total = sum(size for _, _, size in plan["copy"])
+    state = {"files": 0, "bytes": 0}
+    lock = threading.Lock()
+
+    def on_bytes(n):
+        with lock:
+            state["bytes"] += n
+            if progress is not None:
+                progress(state["files"], files_total, state["bytes"], bytes_total)
+
+    def is_cancelled():
+        return cancelled is not None and cancelled()
+
+    def deploy_one(name, source):
+        if is_cancelled():
+            raise DeployCancelled()
+        dest = target / name
+        src_sig = _stat_sig(source)
+        if src_sig is None:
+            raise OSError(f"source missing: {source}")
+        try:
+            digest = place_file(source, dest, mode, on_bytes, cancelled)
+            used = mode
+        except OSError as e:
+            if mode == "copy":
+                raise
+            # Clean fallback: this file can't be linked/cloned (other volume, FAT...)
+            print(f"{mode} failed for {name} ({e}), copying instead")
+            digest = copy_with_hash(source, dest, on_bytes, cancelled)
+            used = "copy"
+        dest_sig = _stat_sig(dest)
+        with lock:
+            state["files"] += 1
+            if progress is not None:
+                progress(state["files"], files_total, state["bytes"], bytes_total)
+        # Linked/cloned files are not read, so they carry no hash
+        return {"source": str(source), "size": src_sig[0], "mtime_ns": src_sig[1], "hash": digest,
+                "dest_size": dest_sig[0], "dest_mtime_ns": dest_sig[1], "mode": used}
+
+    def collect(name, size, run):
+        try:
+            files[name] = run()
+            report["copied"] += 1
+            report["bytes_copied"] += size
+        except DeployCancelled:
+            report["cancelled"] = True
+            # Untouched files keep their old record; a half-written one was removed
+            if not (target / name).exists():
+                files.pop(name, None)
+        except Exception as e:
+            report["errors"].append(f"{name}: {e}")
+            files.pop(name, None)
+
+    if workers <= 1 or files_total <= 1:
+        for name, source, size in plan["copy"]:
+            collect(name, size, lambda: deploy_one(name, source))
+    else:
+        # Imported here: concurrent.futures pulls in logging, which the CLI's cold start notices
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pum-deploy") as pool:
+            futures = {pool.submit(deploy_one, name, source): (name, size) for name, source, size in plan["copy"]}
+            for fut in as_completed(futures):
+                name, size = futures[fut]
+                collect(name, size, fut.result)
+
+    # Only keep records of files that are actually deployed now
+    keep = {_key(n) for n, _, _ in plan["skip"]} | {_key(n) for n, _, _ in plan["copy"]} | renamed
+    files = {n: rec for n, rec in files.items() if _key(n) in keep}
+    save_manifest(target, files)
+    return report
+
+
+def _rmtree(path):
+    def on_error(func, p, _exc):
+        # Read-only files (Windows) can't be unlinked until they are writable
+        try:
+            os.chmod(p, 0o777)
+            func(p)
+        except OSError:
+            pass
+    if os.path.isdir(path):
+        shutil.rmtree(path, onerror=on_error)
+
+
+def recover_interrupted(target):
+    """Clean up after a deploy that died mid-way. Call before touching `target`.
+
+    If the process stopped between the two swap renames, ~mods is missing and
+    the previous set sits in `~mods.pum_old`: that is put back. Leftover
+    staging/old folders are removed (the game would mount paks in them too).
+    """
+    target = Path(target)
+    staging = target.with_name(target.name + STAGING_SUFFIX)
+    old = target.with_name(target.name + OLD_SUFFIX)
+    if old.is_dir() and not target.exists():
+        print(f"Restoring {target.name} from an interrupted deploy")
+        os.replace(old, target)
+    _rmtree(staging)
+    _rmtree(old)
+
+
+def _can_link(src_dir, dest_dir):
+    probe = Path(src_dir) / f".pum_linkprobe_{os.getpid()}"
+    dest = Path(dest_dir) / probe.name
+    try:
+        probe.write_bytes(b"pum")
+        os.link(probe, dest)
+        return True
+    except OSError:
+        return False
+    finally:
+        for p in (dest, probe):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
+
+
+def _link_or_copy(src, dest):
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def _carry_extras(target, staging, managed):
+    """Bring everything in ~mods that PUM doesn't manage (other files, subfolders) into staging."""
+    with os.scandir(target) as it:
+        entries = list(it)
+    for e in entries:
+        if e.name == MANIFEST_NAME or _key(e.name) in managed:
+            continue
+        if e.name.lower().endswith(".pak") and not e.is_dir():
+            continue  # Paks PUM no longer wants: left out on purpose
+        dest = Path(staging) / e.name
+        if e.is_dir(follow_symlinks=False):
+            shutil.copytree(e.path, dest, copy_function=_link_or_copy, symlinks=True)
+        else:
+            _link_or_copy(e.path, dest)
+
+
+def swap_in(target, staging):
+    """Replace `target` with `staging` by renames; puts `target` back if the second rename fails."""
+    target = Path(target)
+    old = target.with_name(target.name + OLD_SUFFIX)
+    had_target = target.exists()
+    if had_target:
+        os.replace(target, old)
+    try:
+        os.replace(staging, target)
+    except OSError:
+        if had_target:
+            os.replace(old, target)
+        raise
+    if had_target:
+        _rmtree(old)
+
+
+def apply_plan_staged(target, plan, manifest, mode="copy", workers=1, progress=None, cancelled=None):
+    """Like apply_plan(), but builds the new ~mods in a staging folder and swaps it in.
+
+    Adds "staging_seconds", "swap_seconds" and "rolled_back" to the report.
+    Any error or a cancel discards the staging folder; ~mods is not touched.
+    """
+    target = Path(target)
+    staging = target.with_name(target.name + STAGING_SUFFIX)
+    start = time.perf_counter()
+    recover_interrupted(target)
+    staging.mkdir(parents=True)
+
+    errors = []
+    carried = dict(manifest)
+    skip = list(plan["skip"])
+    try:
+        # Unchanged files: a second name in staging, no data is copied
+        for name, _source, _size in plan["skip"]:
+            os.link(target / name, staging / name)
+        # Pop every old record first: with swapped mods one's new name is another's old one
+        moved = [(new, carried.pop(old, None)) for old, new, _, _ in plan.get("rename", [])]
+        for old, new, source, size in plan.get("rename", []):
+            os.link(target / old, staging / new)
+            skip.append((new, source, size))
+        carried.update({new: rec for new, rec in moved if rec is not None})
+        managed = {_key(n) for n, _, _ in skip} | {_key(n) for n, _, _ in plan["copy"]}
+        if target.exists():
+            _carry_extras(target, staging, managed)
+    except Exception as e:
+        errors.append(f"staging: {e}")
+
+    if not errors:
+        staged_plan = {"copy": plan["copy"], "skip": skip, "rename": [], "remove": [], "touched": plan["touched"]}
+        report = apply_plan(staging, staged_plan, carried, mode=mode, workers=workers, progress=progress, cancelled=cancelled)
+        report["renamed"] = len(plan.get("rename", []))
+        report["removed"] = len(plan["remove"])
+    else:
+        report = {"copied": 0, "skipped": 0, "renamed": 0, "removed": 0, "bytes_copied": 0, "bytes_skipped": 0,
+                  "errors": errors, "cancelled": False}
+    report["staging_seconds"] = time.perf_counter() - start
+    report["swap_seconds"] = 0.0
+    report["rolled_back"] = False
+
+    if report["errors"] or report["cancelled"]:
+        _rmtree(staging)
+        report["rolled_back"] = True
+        return report
+
+    start = time.perf_counter()
+    try:
+        swap_in(target, staging)
+    except OSError as e:
+        # The game (or another program) is holding ~mods open
+        report["errors"].append(f"swap: {e}")
+        _rmtree(staging)
+        report["rolled_back"] = True
+    report["swap_seconds"] = time.perf_counter() - start
+    return report
+
+
+def deploy(target, wanted, mode="copy", probe_dir=None, workers=None, progress=None, cancelled=None, staged=True):
+    """Bring `target` (~mods) in line with `wanted` ({name: source}).
+
+    `mode` is one of DEPLOY_MODES; anything but "copy" is probed first using
+    `probe_dir` (a folder on the library's volume, e.g. ./mods). `workers`
+    defaults to default_workers(); see apply_plan() for `progress`/`cancelled`.
+    Returns {"copied", "skipped", "renamed", "removed", "bytes_copied", "bytes_skipped",
+    "errors", "cancelled", "mode", "staged"}; staged deploys also report
+    "staging_seconds", "swap_seconds" and "rolled_back" (see apply_plan_staged()).
+    """
+    target = Path(target)
+    recover_interrupted(target)
+    target.mkdir(parents=True, exist_ok=True)
+    if mode not in DEPLOY_MODES:
+        mode = "copy"
+    if mode != "copy":
+        mode = probe_mode(probe_dir, target, mode) if probe_dir is not None else "copy"
+    if workers is None:
+        workers = default_workers(target, mode)
+    manifest = load_manifest(target)
+    plan = plan_deploy(target, wanted, manifest)
+    # Nothing to copy, rename or remove: no need to stage anything
+    changes = plan["copy"] or plan["rename"] or plan["remove"]
+    staged = bool(staged and changes and _can_link(target, target.parent))
+    run = apply_plan_staged if staged else apply_plan
+    report = run(target, plan, manifest, mode=mode, workers=workers, progress=progress, cancelled=cancelled)
+    report["mode"] = mode
+    report["staged"] = staged
+    return report
+
+
+def format_size(num) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if num < 1024 or unit == "GB":
+            return f"{num:.0f} {unit}" if unit == "B" else f"{num:.1f} {unit}"
+        num /= 1024
@@ -0,0 +1,231 @@
+"""
+deploy_plan.py
+
+Works out what a deploy will do before any file is touched.
+
+Unreal mounts the paks in ~mods by name, and when two paks override the same
+asset the one whose name sorts later wins (the reason mods get "zzz_" names).
+So every deployed pak is prefixed with the priority of its mod in the load
+order: `001_<pak>_P.pak` for the first mod, `002_...` for the next, and so on.
+That fixes which mod wins a conflict and also keeps two mods that both ship
+`foo_P.pak` from overwriting each other in ~mods.
+
+The load order is a list of mod names (per profile); active mods missing from
+it follow in the order their paks used to win before the prefixes existed
+(by deployed pak name, so an author's "zzz_" still puts the mod last), then
+by mod name. Upgrading therefore doesn't change who wins a conflict, and the
+result never depends on scan order.
+
+`collect_sources()` is the only part that reads the disk (pak lists and sizes).
+`build_plan()` is pure, so it can be benchmarked and checked without a game
+folder; `plan_wanted()` turns a plan into the {name: source} that
+deploy.deploy() takes.
+
+`deploy_fingerprint()` condenses the same inputs (selection, order, options,
+size/mtime of every source pak) into one hash. It is saved in ~mods after a
+successful deploy together with a stat of the deployed paks, so Launch can
+tell with a handful of stats that ~mods is already what it would deploy.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from scripts.deploy import deploy_name, format_size
+from scripts.pak_store import POINTER_SUFFIX, list_paks, resolve_pak
+
+PLAN_VERSION = 1
+FINGERPRINT_NAME = ".pum_fingerprint.json"
+
+
+def _legacy_key(mod):
+    """Where `mod` landed when ~mods held bare pak names: its last deployed pak name."""
+    names = []
+    try:
+        with os.scandir(Path(mod["folder_path"]) / "assets") as it:
+            for e in it:
+                name = e.name
+                if name.lower().endswith(POINTER_SUFFIX):
+                    name = name[:-len(POINTER_SUFFIX)]
+                if name.lower().endswith(".pak"):
+                    # deploy_name() checks for a case-sensitive _P: lowercase only to compare
+                    names.append(deploy_name(name).lower())
+    except (OSError, KeyError, TypeError):
+        pass
+    return max(names, default="")
+
+
+def ordered_mods(mods, load_order=None):
+    """`mods` sorted by `load_order` (mod names); unlisted mods go last, in the
+    order their pak names gave them before priority prefixes (see _legacy_key)."""
+    rank = {name: i for i, name in enumerate(load_order or [])}
+    listed = sorted((m for m in mods if m["name"] in rank), key=lambda m: rank[m["name"]])
+    rest = sorted((m for m in mods if m["name"] not in rank),
+                  key=lambda m: (_legacy_key(m), m["name"].lower(), m["name"]))
+    return listed + rest
+
+
+def collect_sources(mods, mod_options):
+    """Read what each mod would deploy: [{"name", "key", "paks": [(pak, path, size)], "mtimes"}].
+
+    Mods with options only contribute the files selected in `mod_options`.
+    Keeps the order of `mods`; store pointers resolve to their blob.
+    `mtimes` holds the mtime_ns of each entry of `paks` (for the fingerprint).
+    """
+    sources = []
+    for mod in mods:
+        folder = Path(mod["folder_path"])
+        assets = folder / "assets"
+        mods_folder = folder.parent
+        if mod.get("has_options"):
+            found = []
+            for file_name in mod_options.get(mod["name"], []):
+                real = resolve_pak(mods_folder, assets / file_name)
+                if real is not None:
+                    found.append((file_name, real))
+        else:
+            found = list_paks(assets, mods_folder)
+        paks, mtimes = [], []
+        for name, real in found:
+            try:
+                st = os.stat(real)
+            except OSError:
+                continue
+            paks.append((name, str(real), st.st_size))
+            mtimes.append(st.st_mtime_ns)
+        sources.append({"name": mod["name"], "key": folder.name, "paks": paks, "mtimes": mtimes})
+    return sources
+
+
+def deploy_fingerprint(sources, mod_options):
+    """Hash of everything a deploy of `sources` depends on. Pure."""
+    h = hashlib.sha256(f"pum-deploy-{PLAN_VERSION}".encode())
+    for mod in sources:
+        record = [mod["name"], sorted(mod_options.get(mod["name"], [])),
+                  [list(pak) + [mtime] for pak, mtime in zip(mod["paks"], mod.get("mtimes", []))]]
+        h.update(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def target_state(target):
+    """Cheap signature of the paks currently in ~mods (names, sizes, mtimes)."""
+    entries = []
+    try:
+        with os.scandir(target) as it:
+            for e in it:
+                if e.name.lower().endswith(".pak"):
+                    try:
+                        st = e.stat()
+                    except OSError:
+                        continue
+                    entries.append((e.name, st.st_size, st.st_mtime_ns))
+    except OSError:
+        return None
+    entries.sort()
+    return hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()
+
+
+def save_fingerprint(target, fingerprint):
+    """Remember that ~mods now matches `fingerprint` (call after a clean deploy)."""
+    try:
+        with open(Path(target) / FINGERPRINT_NAME, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint, "target": target_state(target)}, f)
+    except Exception as e:
+        print(f"Error saving deploy fingerprint: {e}")
+
+
+def is_deployed(target, fingerprint):
+    """True if the last clean deploy had `fingerprint` and ~mods hasn't changed since."""
+    try:
+        with open(Path(target) / FINGERPRINT_NAME, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except Exception:
+        return False
+    if saved.get("fingerprint") != fingerprint:
+        return False
+    state = target_state(target)
+    return state is not None and saved.get("target") == state
+
+
+def build_plan(sources, conflicts=None):
+    """Turn ordered `sources` (see collect_sources) into a deploy plan. Pure.
+
+    `conflicts` is an optional conflict_index.ConflictIndex; with it the plan
+    lists, for every pair of active mods overriding the same assets, which one
+    wins. Returns {"files": [{"mod", "key", "pak", "source", "dest",
+    "priority", "size"}], "collisions": [{"dest", "kept", "dropped"}],
+    "conflicts": [{"winner", "loser", "assets"}], "total_size"}.
+    """
+    width = max(3, len(str(len(sources))))
+    plan = {"version": PLAN_VERSION, "files": [], "collisions": [], "conflicts": [], "total_size": 0}
+    by_dest = {}
+    for priority, mod in enumerate(sources, start=1):
+        prefix = f"{priority:0{width}d}_"
+        for pak, source, size in mod["paks"]:
+            dest = prefix + deploy_name(pak)
+            entry = {"mod": mod["name"], "key": mod["key"], "pak": pak, "source": source,
+                     "dest": dest, "priority": priority, "size": size}
+            folded = os.path.normcase(dest)
+            previous = by_dest.get(folded)
+            if previous is not None:
+                # Same mod ships foo.pak and foo_P.pak: the later file wins, as a copy would
+                plan["collisions"].append({"dest": dest, "kept": pak, "dropped": previous["pak"]})
+                plan["files"].remove(previous)
+            by_dest[folded] = entry
+            plan["files"].append(entry)
+
+    plan["total_size"] = sum(f["size"] for f in plan["files"])
+
+    if conflicts is not None:
+        rank = {mod["key"]: (i, mod["name"]) for i, mod in enumerate(sources)}
+        for key, (i, name) in rank.items():
+            for other, count in conflicts.conflicting_mods(key).items():
+                # Each pair once, from the side of the mod that loses it
+                if other not in rank or rank[other][0] <= i:
+                    continue
+                plan["conflicts"].append({"winner": rank[other][1], "loser": name, "assets": count})
+        plan["conflicts"].sort(key=lambda c: (-c["assets"], c["winner"].lower(), c["loser"].lower()))
+    return plan
+
+
+def plan_wanted(plan):
+    """{deployed name: source path} for deploy.deploy()."""
+    return {f["dest"]: Path(f["source"]) for f in plan["files"]}
+
+
+def format_plan(plan, diff=None):
+    """Human-readable plan (one line per file). `diff` is deploy.plan_deploy()'s result."""
+    status = {}
+    if diff is not None:
+        status.update({name: "=" for name, _, _ in diff["skip"]})
+        status.update({name: "+" for name, _, _ in diff["copy"]})
+        status.update({new: ">" for _, new, _, _ in diff.get("rename", [])})
+    lines = [f"{len(plan['files'])} paks, {format_size(plan['total_size'])}"]
+    for f in plan["files"]:
+        mark = status.get(f["dest"], " ")
+        lines.append(f"{mark} {f['dest']:<48} {format_size(f['size']):>9}  {f['mod']}")
+    if diff is not None:
+        lines += [f"- {name}" for name in diff["remove"]]
+    for c in plan["collisions"]:
+        lines.append(f"! {c['dest']}: {c['kept']} replaces {c['dropped']}")
+    for c in plan["conflicts"]:
+        lines.append(f"! {c['winner']} overrides {c['loser']} ({c['assets']} assets)")
+    return "\n".join(lines)
+
+
+def export_plan(plan, path, diff=None):
+    """Write the plan to `path`: JSON for *.json, the format_plan() text otherwise."""
+    path = Path(path)
+    with open(path, "w", encoding="utf-8") as f:
+        if path.suffix.lower() == ".json":
+            data = dict(plan)
+            if diff is not None:
+                data["changes"] = {"copy": [n for n, _, _ in diff["copy"]],
+                                   "skip": [n for n, _, _ in diff["skip"]],
+                                   "rename": [[old, new] for old, new, _, _ in diff.get("rename", [])],
+                                   "remove": list(diff["remove"])}
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        else:
+            f.write(format_plan(plan, diff) + "\n")
@@ -0,0 +1,626 @@
+"""
+extractors.py
+
+Archive extraction backends, picked by what each one can open.
+
+- "zipfile": Python's own, zips only.
+- "7z": 7-Zip (7z/7zz/7za/7zr on PATH, or the usual Program Files install).
+  Runs with -mmt (multithreaded decoding) and reports progress from -bsp1.
+- "unrar": UnRAR (on PATH or next to WinRAR.exe).
+- "unar": The Unarchiver (unar/lsar) on PATH.
+- "bsdtar": libarchive's bsdtar (on Windows 10+, tar.exe is bsdtar).
+- "py7zr" / "rarfile": optional Python packages, used when installed.
+- "winrar": WinRAR.exe, extraction only, as a last resort on Windows.
+
+Tools are looked up once on first use, never at import time, and optional
+packages are only imported when a backend actually runs. Every backend
+extracts to a folder, optionally only some members, and calls
+`progress(fraction)` while it works; the ones that can also list an
+archive (names and sizes) and print one member serve installer.inspect_archive().
+
+    extract(archive, out_dir, members=None, progress=None, cancelled=None)
+    list_archive(archive) / read_member(archive, member)
+"""
+
+import os
+import re
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+# Common paths for 7-Zip and WinRAR when they are not on PATH (Windows installers don't add them)
+SEVEN_ZIP_PATHS = [r"C:\Program Files\7-Zip\7z.exe", r"C:\Program Files (x86)\7-Zip\7z.exe"]
+WINRAR_PATHS = [r"C:\Program Files\WinRAR\WinRAR.exe", r"C:\Program Files (x86)\WinRAR\WinRAR.exe"]
+
+_MAGIC = (
+    (b"PK\x03\x04", "zip"), (b"PK\x05\x06", "zip"), (b"PK\x07\x08", "zip"),
+    (b"Rar!\x1a\x07", "rar"),
+    (b"7z\xbc\xaf\x27\x1c", "7z"),
+)
+
+
+class Cancelled(Exception):
+    """extract() stopped because `cancelled()` returned True."""
+
+
+def archive_format(path):
+    """"zip", "rar", "7z" from the file's magic bytes (extension as a fallback), or None."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8)
+        for magic, fmt in _MAGIC:
+            if head.startswith(magic):
+                return fmt
+    except OSError:
+        pass
+    ext = Path(path).suffix.lower().lstrip(".")
+    return ext if ext in ("zip", "rar", "7z") else None
+
+
+def _which(*names, extra=()):
+    for name in names:
+        found = shutil.which(name)
+        if found:
+            return found
+    return next((p for p in extra if os.path.exists(p)), None)
+
+
+def _run_kwargs(**kwargs):
+    """subprocess keyword arguments for the archive tools."""
+    import subprocess
+
+    kwargs.setdefault("stdin", subprocess.DEVNULL)  # encrypted archives fail instead of prompting
+    if sys.platform == "win32":
+        # No console window flashing up
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        kwargs["startupinfo"] = startupinfo
+    return kwargs
+
+
+def _capture(cmd, timeout=60):
+    """stdout of `cmd` as bytes, or None if it failed."""
+    import subprocess
+
+    try:
+        out = subprocess.run(cmd, **_run_kwargs(capture_output=True, timeout=timeout))
+    except Exception:
+        return None
+    return out.stdout if out.returncode == 0 else None
+
+
+_PERCENT = re.compile(rb"(\d{1,3})%")
+
+
+def _run_with_progress(cmd, progress=None, cancelled=None, count_lines=None):
+    """Run an extraction tool, feeding `progress` from its output. Returns True on success.
+
+    Tools that print percentages (7z -bsp1, unrar) are parsed for "NN%";
+    with `count_lines` (expected number of files) each output line counts
+    as one extracted file instead.
+    """
+    import subprocess
+
+    proc = subprocess.Popen(cmd, **_run_kwargs(stdout=subprocess.PIPE, stderr=subprocess.STDOUT))
+    stop = threading.Event()
+
+    def watch():
+        # Poll `cancelled` even while the tool prints nothing
+        while not stop.wait(0.2):
+            if cancelled is not None and cancelled():
+                proc.kill()
+                return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    lines = 0
+    try:
+        buf = b""
+        while True:
+            chunk = proc.stdout.read1(4096) if hasattr(proc.stdout, "read1") else proc.stdout.read(4096)
+            if not chunk:
+                break
+            if progress is None:
+                continue
+            if count_lines:
+                lines += chunk.count(b"\n")
+                progress(min(1.0, lines / count_lines))
+                continue
+            # Progress lines are redrawn with \r or backspaces: only the tail matters
+            buf = (buf + chunk)[-256:]
+            found = _PERCENT.findall(buf)
+            if found:
+                progress(min(100, int(found[-1])) / 100)
+        proc.wait()
+    finally:
+        stop.set()
+        watcher.join()
+    if cancelled is not None and cancelled():
+        raise Cancelled()
+    return proc.returncode == 0
+
+
+def _listfile(members, directory):
+    """Write `members` one per line for the tools' @listfile syntax. Returns its path."""
+    path = Path(directory) / ".pum_members.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(members) + "\n")
+    return path
+
+
+# Windows caps a command line at 32767 characters; stay well below it
+_MAX_COMMAND_LINE = 24000
+
+
+def _fits_command_line(members):
+    return sum(len(m) + 3 for m in members) < _MAX_COMMAND_LINE
+
+
+def _parse_listing(text, name_key, size_key, is_dir):
+    """{path: size} from a "Key = value"/"Key: value" technical listing (7z -slt, unrar lt)."""
+    files = {}
+    block = {}
+
+    def flush():
+        name = block.get(name_key)
+        if name and not is_dir(block):
+            try:
+                files[name.replace("\\", "/")] = int(block.get(size_key) or 0)
+            except ValueError:
+                files[name.replace("\\", "/")] = 0
+        block.clear()
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            flush()
+            continue
+        for sep in (" = ", ": "):
+            if sep in line:
+                key, value = line.split(sep, 1)
+                if key == name_key and key in block:
+                    flush()
+                block[key] = value
+                break
+    flush()
+    return files
+
+
+class Backend:
+    """One way of opening archives. Subclasses fill in what they support."""
+
+    name = ""
+    formats = ()
+
+    def available(self):
+        return False
+
+    def list(self, archive):
+        """{member path: size}, or None if this backend can't list."""
+        return None
+
+    def read(self, archive, member):
+        """Bytes of one member, or None."""
+        return None
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        """Extract everything (or only `members`) into `out_dir`. Returns True on success."""
+        raise NotImplementedError
+
+
+class ZipfileBackend(Backend):
+    name = "zipfile"
+    formats = ("zip",)
+
+    def available(self):
+        return True
+
+    def list(self, archive):
+        import zipfile
+
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                return {zi.filename: zi.file_size for zi in zf.infolist() if not zi.is_dir()}
+        except (zipfile.BadZipFile, OSError):
+            return None
+
+    def read(self, archive, member):
+        import zipfile
+
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                return zf.read(member)
+        except (zipfile.BadZipFile, OSError, KeyError, RuntimeError, NotImplementedError):
+            return None
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        import zipfile
+
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                infos = [zi for zi in zf.infolist() if members is None or zi.filename in members]
+                total = sum(zi.file_size for zi in infos) or 1
+                done = 0
+                for zi in infos:
+                    if cancelled is not None and cancelled():
+                        raise Cancelled()
+                    zf.extract(zi, out_dir)
+                    done += zi.file_size
+                    if progress is not None:
+                        progress(done / total)
+            return True
+        except Cancelled:
+            raise
+        except Exception:
+            return False
+
+
+class SevenZipBackend(Backend):
+    name = "7z"
+    _exe = False
+
+    @property
+    def exe(self):
+        if self._exe is False:
+            self._exe = _which("7z", "7zz", "7za", "7zr", extra=SEVEN_ZIP_PATHS)
+        return self._exe
+
+    @property
+    def formats(self):
+        # 7za has no rar codec and 7zr only knows 7z
+        base = os.path.basename(self.exe or "").lower()
+        if base.startswith("7zr"):
+            return ("7z",)
+        if base.startswith("7za"):
+            return ("zip", "7z")
+        return ("zip", "7z", "rar")
+
+    def available(self):
+        return self.exe is not None
+
+    def list(self, archive):
+        out = _capture([self.exe, "l", "-slt", "-ba", str(archive)])
+        if out is None:
+            return None
+        return _parse_listing(out.decode("utf-8", errors="replace"), "Path", "Size",
+                              lambda b: b.get("Folder") == "+" or b.get("Attributes", "").startswith("D"))
+
+    def read(self, archive, member):
+        return _capture([self.exe, "e", "-so", str(archive), member])
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        # -mmt: multithreaded decoding; -bsp1: progress on stdout, -bso0: no file list
+        cmd = [self.exe, "x", str(archive), f"-o{out_dir}", "-y", "-mmt=on", "-bsp1", "-bso0", "-bse1"]
+        if members is not None:
+            cmd.append("@" + str(_listfile(members, out_dir)))
+        try:
+            return _run_with_progress(cmd, progress, cancelled)
+        finally:
+            if members is not None:
+                _remove_listfile(out_dir)
+
+
+class UnrarBackend(Backend):
+    name = "unrar"
+    formats = ("rar",)
+    _exe = False
+
+    @property
+    def exe(self):
+        if self._exe is False:
+            beside_winrar = [os.path.join(os.path.dirname(p), "UnRAR.exe") for p in WINRAR_PATHS]
+            self._exe = _which("unrar", extra=beside_winrar)
+        return self._exe
+
+    def available(self):
+        return self.exe is not None
+
+    def list(self, archive):
+        out = _capture([self.exe, "lt", "-p-", str(archive)])
+        if out is None:
+            return None
+        return _parse_listing(out.decode("utf-8", errors="replace"), "Name", "Size",
+                              lambda b: b.get("Type") == "Directory")
+
+    def read(self, archive, member):
+        return _capture([self.exe, "p", "-inul", "-p-", str(archive), member])
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        cmd = [self.exe, "x", "-o+", "-p-", "-y", str(archive)]
+        if members is not None:
+            cmd.append("@" + str(_listfile(members, out_dir)))
+        cmd.append(str(out_dir) + os.sep)
+        try:
+            return _run_with_progress(cmd, progress, cancelled)
+        finally:
+            if members is not None:
+                _remove_listfile(out_dir)
+
+
+class UnarBackend(Backend):
+    name = "unar"
+    formats = ("zip", "7z", "rar")
+    _exe = False
+
+    @property
+    def exe(self):
+        if self._exe is False:
+            unar = _which("unar")
+            self._exe = (unar, _which("lsar")) if unar else None
+        return self._exe
+
+    def available(self):
+        return self.exe is not None
+
+    def list(self, archive):
+        if not self.exe[1]:
+            return None
+        import json
+
+        out = _capture([self.exe[1], "-j", str(archive)])
+        try:
+            entries = json.loads(out.decode("utf-8"))["lsarContents"]
+        except Exception:
+            return None
+        return {e["XADFileName"].replace("\\", "/"): int(e.get("XADFileSize", 0))
+                for e in entries if not e.get("XADIsDirectory")}
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        # -f: overwrite, -D: no extra wrapping folder; without -q unar prints one line per file
+        cmd = [self.exe[0], "-f", "-D", "-o", str(out_dir), str(archive)]
+        if progress is None:
+            cmd.insert(1, "-q")
+        if members is not None and not _fits_command_line(members):
+            # unar has no list file option: too many names for one command line, take everything
+            members = None
+        count = None
+        if members is not None:
+            cmd += list(members)
+            count = len(members)
+        elif progress is not None:
+            count = len(self.list(archive) or ()) or None
+        # unar prints one line per file
+        return _run_with_progress(cmd, progress, cancelled, count_lines=count)
+
+
+class BsdtarBackend(Backend):
+    name = "bsdtar"
+    formats = ("zip", "7z", "rar")
+    _exe = False
+
+    @property
+    def exe(self):
+        if self._exe is False:
+            self._exe = _which("bsdtar")
+            if self._exe is None:
+                # tar.exe on Windows 10+ is bsdtar; GNU tar can't read zip/7z/rar
+                tar = _which("tar")
+                out = _capture([tar, "--version"], timeout=10) if tar else None
+                self._exe = tar if out and b"bsdtar" in out else None
+        return self._exe
+
+    def available(self):
+        return self.exe is not None
+
+    def read(self, archive, member):
+        return _capture([self.exe, "-xOf", str(archive), member])
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        cmd = [self.exe, "-xvf", str(archive), "-C", str(out_dir)]
+        if members is not None:
+            # Names from a file (-T): a big archive would not fit on the command line
+            cmd += ["-T", str(_listfile(members, out_dir))]
+        # -v prints one line per file; the count comes from the members or a -t listing
+        count = len(members) if members is not None else None
+        if count is None and progress is not None:
+            out = _capture([self.exe, "-tf", str(archive)])
+            count = len([n for n in (out or b"").splitlines() if not n.endswith(b"/")]) or None
+        try:
+            return _run_with_progress(cmd, progress if count else None, cancelled, count_lines=count)
+        finally:
+            if members is not None:
+                _remove_listfile(out_dir)
+
+
+class Py7zrBackend(Backend):
+    """Optional: `pip install py7zr`."""
+
+    name = "py7zr"
+    formats = ("7z",)
+
+    def available(self):
+        import importlib.util
+        return importlib.util.find_spec("py7zr") is not None
+
+    def list(self, archive):
+        import py7zr
+
+        try:
+            with py7zr.SevenZipFile(archive, "r") as z:
+                return {i.filename: i.uncompressed for i in z.list() if not i.is_directory}
+        except Exception:
+            return None
+
+    def read(self, archive, member):
+        import py7zr
+
+        try:
+            with py7zr.SevenZipFile(archive, "r") as z:
+                data = z.read([member]).get(member)
+                return data.read() if data is not None else None
+        except Exception:
+            return None
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        import py7zr
+
+        try:
+            with py7zr.SevenZipFile(archive, "r") as z:
+                if members is None:
+                    z.extractall(out_dir)
+                else:
+                    z.extract(out_dir, targets=list(members))
+        except Exception:
+            return False
+        if progress is not None:
+            progress(1.0)
+        return True
+
+
+class RarfileBackend(Backend):
+    """Optional: `pip install rarfile` (it still needs an unrar-compatible tool)."""
+
+    name = "rarfile"
+    formats = ("rar",)
+
+    def available(self):
+        import importlib.util
+        return importlib.util.find_spec("rarfile") is not None
+
+    def list(self, archive):
+        import rarfile
+
+        try:
+            with rarfile.RarFile(archive) as rf:
+                return {i.filename: i.file_size for i in rf.infolist() if not i.is_dir()}
+        except Exception:
+            return None
+
+    def read(self, archive, member):
+        import rarfile
+
+        try:
+            with rarfile.RarFile(archive) as rf:
+                return rf.read(member)
+        except Exception:
+            return None
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        import rarfile
+
+        try:
+            with rarfile.RarFile(archive) as rf:
+                infos = [i for i in rf.infolist() if members is None or i.filename in members]
+                for n, info in enumerate(infos, start=1):
+                    if cancelled is not None and cancelled():
+                        raise Cancelled()
+                    rf.extract(info, out_dir)
+                    if progress is not None:
+                        progress(n / len(infos))
+            return True
+        except Cancelled:
+            raise
+        except Exception:
+            return False
+
+
+class WinRarBackend(Backend):
+    name = "winrar"
+    formats = ("zip", "7z", "rar")
+    _exe = False
+
+    @property
+    def exe(self):
+        if self._exe is False:
+            self._exe = _which("WinRAR", extra=WINRAR_PATHS) if sys.platform == "win32" else None
+        return self._exe
+
+    def available(self):
+        return self.exe is not None
+
+    def extract(self, archive, out_dir, members=None, progress=None, cancelled=None):
+        cmd = [self.exe, "x", "-ibck", "-y", str(archive)]
+        if members is not None:
+            cmd.append("@" + str(_listfile(members, out_dir)))
+        cmd.append(str(out_dir) + "\\")
+        try:
+            return _run_with_progress(cmd, None, cancelled)
+        finally:
+            if members is not None:
+                _remove_listfile(out_dir)
+
+
+def _remove_listfile(directory):
+    try:
+        os.remove(Path(directory) / ".pum_members.txt")
+    except OSError:
+        pass
+
+
+# Preference order: in-process first, then the fastest tools, WinRAR's GUI binary last
+BACKENDS = [ZipfileBackend(), SevenZipBackend(), UnrarBackend(), UnarBackend(), BsdtarBackend(),
+            Py7zrBackend(), RarfileBackend(), WinRarBackend()]
+
+_available = {}
+
+
+def register(backend, first=False):
+    """Add a backend (e.g. from a plugin); `first` puts it ahead of the built-in ones."""
+    if first:
+        BACKENDS.insert(0, backend)
+    else:
+        BACKENDS.append(backend)
+    _available.pop(backend.name, None)
+
+
+def available_backends():
+    """The backends usable on this machine, in preference order (tool lookup is cached)."""
+    result = []
+    for backend in BACKENDS:
+        if backend.name not in _available:
+            try:
+                _available[backend.name] = bool(backend.available())
+            except Exception:
+                _available[backend.name] = False
+        if _available[backend.name]:
+            result.append(backend)
+    return result
+
+
+def backends_for(archive, can=None):
+    """Available backends that open `archive`'s format; `can` is "list" or "read" to require that too."""
+    fmt = archive_format(archive)
+    result = []
+    for backend in available_backends():
+        if fmt is not None and fmt not in backend.formats:
+            continue
+        if can is not None and getattr(type(backend), can) is getattr(Backend, can):
+            continue
+        result.append(backend)
+    return result
+
+
+def extract(archive, out_dir, members=None, progress=None, cancelled=None):
+    """Extract with the first backend that succeeds. Returns its name, or None if none could.
+
+    Raises Cancelled if `cancelled()` turned true.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    for backend in backends_for(archive):
+        try:
+            if backend.extract(archive, out_dir, members=members, progress=progress, cancelled=cancelled):
+                return backend.name
+        except Cancelled:
+            raise
+        except Exception as e:
+            print(f"Error extracting {Path(archive).name} with {backend.name}: {e}")
+    return None
+
+
+def list_archive(archive):
+    """{member path: size} from the first backend that can list `archive`, or None."""
+    for backend in backends_for(archive, can="list"):
+        files = backend.list(archive)
+        if files is not None:
+            return files
+    return None
+
+
+def read_member(archive, member):
+    """Bytes of one (small) member, or None."""
+    for backend in backends_for(archive, can="read"):
+        data = backend.read(archive, member)
+        if data is not None:
+            return data
+    return None
@@ -0,0 +1,128 @@
+"""
+i18n.py
+
+UI translations: lang/<code>.json files and the `t()` lookup used by main.py.
+
+Nothing is read at import time; the app calls set_language() once with the
+language from its settings, before building any widget.
+"""
+
+import json
+from pathlib import Path
+
+LANG_CODE_MAP = {
+    "english": "en",
+    "en": "en",
+    "spanish": "es",
+    "es": "es",
+    "español": "es",
+    "espanol": "es",
+    "french": "fr",
+    "français": "fr",
+    "francais": "fr",
+    "fr": "fr",
+    "german": "de",
+    "deutsch": "de",
+    "de": "de",
+    "italian": "it",
+    "italiano": "it",
+    "it": "it",
+    "portuguese": "pt",
+    "português": "pt",
+    "portugues": "pt",
+    "pt": "pt",
+    "russian": "ru",
+    "русский": "ru",
+    "ru": "ru",
+    "chinese": "zh",
+    "中文": "zh",
+    "zh": "zh",
+    "japanese": "ja",
+    "日本語": "ja",
+    "ja": "ja",
+}
+
+
+def _guess_lang_code(name: str):
+    if not name:
+        return "en"
+    n = name.lower()
+    for k, v in LANG_CODE_MAP.items():
+        if k in n:
+            return v
+    # fallback to first two letters
+    return n[:2]
+
+
+def _read_lang(code: str):
+    try:
+        with open(Path("lang") / f"{code}.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def load_translations_for(language_name: str):
+    """Translations for `language_name`, with the English text for any key it lacks."""
+    # English first, so keys missing from a translation still show readable text
+    translations = _read_lang("en")
+    code = _guess_lang_code(language_name)
+    if code != "en":
+        translations.update(_read_lang(code))
+    return translations
+
+
+def list_available_languages():
+    """Return list of (code, display_name) for available language JSONs in ./lang.
+    Falls back to a sensible default list if ./lang is missing or incomplete.
+    """
+    mapping = {
+        "en": "English",
+        "es": "Español",
+        "fr": "Français",
+        "de": "Deutsch",
+        "it": "Italiano",
+        "pt": "Português",
+        "ru": "Русский",
+        "zh": "中文",
+        "ja": "日本語",
+    }
+    results = []
+    try:
+        lang_dir = Path("lang")
+        if lang_dir.exists():
+            for p in sorted(lang_dir.glob("*.json")):
+                code = p.stem
+                display = mapping.get(code, code)
+                results.append((code, display))
+    except Exception:
+        results = []
+
+    # Ensure common languages exist in the list in a sane order
+    for code in ["en", "es", "fr", "de", "it", "pt", "ru", "zh", "ja"]:
+        if not any(r[0] == code for r in results):
+            results.append((code, mapping.get(code, code)))
+
+    return results
+
+
+# Active translations (key -> text); empty until set_language() runs, so t() returns the key
+TRANSLATIONS = {}
+
+
+def set_language(language_name: str):
+    """Load `language_name` (English fallback) and make it the one t() uses."""
+    global TRANSLATIONS
+    TRANSLATIONS = load_translations_for(language_name)
+    return TRANSLATIONS
+
+
+def t(key: str, **kwargs):
+    txt = TRANSLATIONS.get(key, key)
+    try:
+        return txt.format(**kwargs) if kwargs else txt
+    except Exception:
+        return txt
@@ -0,0 +1,189 @@
+"""
+install_queue.py
+
+Background installs for dropped files (paks, folders, archives).
+
+Items are installed by a few worker threads, so extracting one archive and
+hashing the paks of another (pak store) overlap instead of running one after
+the other on the UI thread. The installer's `confirm`/`on_collision` callbacks
+still need the user: given `ui` (a function that runs a callable on the UI
+thread, like Tk's `after(0, ...)`), they are run there, one dialog at a time,
+while the worker waits for the answer.
+
+Callbacks are made from the worker threads:
+
+- `on_update(item)` whenever an item changes state or progress,
+- `on_idle(installed)` once the queue drains, with every mod folder installed
+  since it was last idle (the GUI refreshes the list once, there).
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from scripts import installer
+
+# Workers: extraction is mostly I/O plus the external tool's own threads
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def _ui_call(schedule, lock, fn):
+    """Wrap `fn` so calling it from a worker runs it through `schedule` (e.g. Tk's
+    `after(0, ...)`) and blocks until it returns. Calls sharing `lock` never
+    overlap, so only one dialog is open at a time."""
+
+    def call(*args, **kwargs):
+        with lock:
+            done = threading.Event()
+            result = {}
+
+            def run():
+                try:
+                    result["value"] = fn(*args, **kwargs)
+                except Exception as e:
+                    result["error"] = e
+                finally:
+                    done.set()
+
+            schedule(run)
+            done.wait()
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
+
+    return call
+
+
+class InstallItem:
+    """One queued path. `status` is "queued", "running", "done", "failed" or "cancelled"."""
+
+    def __init__(self, item_id, path):
+        self.id = item_id
+        self.path = Path(path)
+        self.status = "queued"
+        self.progress = 0.0
+        self.installed = []
+        self.error = None
+
+
+class InstallQueue:
+    """Installs paths into `mods_folder` on up to `workers` threads.
+
+    `confirm`, `on_collision` and `on_loose_paks` are passed to
+    installer.install_path(), through `ui` if given; `after_install(dirs)` runs
+    on the same worker right after an item is installed, e.g. to intern its paks.
+    """
+
+    def __init__(self, mods_folder, on_update=None, on_idle=None, confirm=None, on_collision=None,
+                 on_loose_paks=None, after_install=None, ui=None, workers=MAX_WORKERS):
+        self.mods_folder = Path(mods_folder)
+        self.on_update = on_update
+        self.on_idle = on_idle
+        if ui is not None:
+            dialog_lock = threading.Lock()
+            confirm, on_collision, on_loose_paks = (fn and _ui_call(ui, dialog_lock, fn)
+                                                    for fn in (confirm, on_collision, on_loose_paks))
+        self.confirm = confirm
+        self.on_collision = on_collision
+        self.on_loose_paks = on_loose_paks
+        self.after_install = after_install
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self._pending = []
+        self._items = []
+        self._threads = 0
+        self._installed = []
+        self._next_id = 0
+
+    def enqueue(self, paths):
+        """Queue `paths`. Returns the new InstallItems."""
+        new = []
+        with self._lock:
+            for path in paths:
+                self._next_id += 1
+                item = InstallItem(self._next_id, path)
+                self._items.append(item)
+                self._pending.append(item)
+                new.append(item)
+            start = min(self.workers - self._threads, len(self._pending))
+            self._threads += start
+        for item in new:
+            self._notify(item)
+        for _ in range(start):
+            threading.Thread(target=self._run, daemon=True).start()
+        return new
+
+    def items(self):
+        with self._lock:
+            return list(self._items)
+
+    def busy(self):
+        with self._lock:
+            return self._threads > 0
+
+    def cancel(self, item_id=None):
+        """Drop a queued item (all queued items if `item_id` is None). Running ones finish."""
+        with self._lock:
+            dropped = [i for i in self._pending if item_id is None or i.id == item_id]
+            self._pending = [i for i in self._pending if i not in dropped]
+            for item in dropped:
+                item.status = "cancelled"
+        for item in dropped:
+            self._notify(item)
+
+    def clear_finished(self):
+        """Forget items that are no longer queued or running."""
+        with self._lock:
+            self._items = [i for i in self._items if i.status in ("queued", "running")]
+
+    def _notify(self, item):
+        if self.on_update is not None:
+            try:
+                self.on_update(item)
+            except Exception as e:
+                print(f"Error updating install queue: {e}")
+
+    def _take(self):
+        with self._lock:
+            if self._pending:
+                item = self._pending.pop(0)
+                item.status = "running"
+                return item
+            self._threads -= 1
+            if self._threads > 0:
+                return None
+            # Last worker out reports everything installed since the queue was last idle
+            installed, self._installed = self._installed, []
+        if self.on_idle is not None:
+            try:
+                self.on_idle(installed)
+            except Exception as e:
+                print(f"Error after installing: {e}")
+        return None
+
+    def _run(self):
+        while True:
+            item = self._take()
+            if item is None:
+                return
+            self._notify(item)
+
+            def progress(fraction, item=item):
+                item.progress = fraction
+                self._notify(item)
+
+            try:
+                item.installed = installer.install_path(item.path, self.mods_folder, confirm=self.confirm,
+                                                        on_collision=self.on_collision,
+                                                        on_loose_paks=self.on_loose_paks, progress=progress)
+                if item.installed and self.after_install is not None:
+                    self.after_install(item.installed)
+                item.status = "done"
+                item.progress = 1.0
+            except Exception as e:
+                print(f"Error installing {item.path.name}: {e}")
+                item.status = "failed"
+                item.error = str(e)
+            with self._lock:
+                self._installed.extend(item.installed)
+            self._notify(item)
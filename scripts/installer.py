@@ -0,0 +1,795 @@
+"""
+installer.py
+
+Installing mods into ./mods, without any UI: loose .pak files, mod folders
+(modinfo.json + assets/), archives (zip natively, rar/7z through whichever
+backend scripts/extractors.py finds) and downloads (GameBanana files).
+
+zipfile, subprocess, tempfile and requests are imported by the functions that
+use them, so importing this module stays cheap for the GUI and the CLI.
+
+Whatever needs the user is passed in as callbacks, so the GUI can show its
+dialogs and the command-line interface can answer from flags:
+
+- `confirm(info)` returns True to go ahead with installing the mod `info`,
+- `on_collision(name)` returns "overwrite", "copy" or "cancel" when
+  ./mods/<name> already exists.
+
+Without callbacks everything is confirmed and existing mods are never
+overwritten.
+
+Work in progress (extractions, downloads, mods being assembled) goes to
+mods/.pum_staging, on the same volume as the library: a finished mod is
+renamed into ./mods, never copied a second time. clean_staging() removes
+what a crashed run left there.
+"""
+
+import json
+import os
+import re
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from scripts import extractors
+
+MODS_DIR = Path("./mods")
+
+
+
+def sanitize_name(name):
+    """Folder/file-safe version of `name`."""
+    return re.sub(r'[<>:"/\\|?*]', '', name or "").strip()
+
+
+def _dest_for(mods_folder, mod_name, on_collision):
+    """(folder to install `mod_name` into, replace existing?), or None if the user cancelled.
+
+    Nothing is deleted here: an overwritten mod is swapped out by _commit()
+    once the new one is ready.
+    """
+    dest = Path(mods_folder) / mod_name
+    if not dest.exists():
+        return dest, False
+    action = on_collision(mod_name) if on_collision is not None else "cancel"
+    if action == "copy":
+        return Path(mods_folder) / f"{mod_name}_{int(time.time())}", False
+    if action == "overwrite":
+        return dest, True
+    return None
+
+
+# --- Staging (inside ./mods, so finished installs are renamed into place) ---
+# Extractions, downloads and half-built mods live in mods/.pum_staging/<id>/,
+# never in the system temp folder: moving the result into ./mods is then a
+# rename on the same volume instead of a second full copy, and a mod only
+# appears in ./mods once it is complete.
+STAGING_NAME = ".pum_staging"
+# Staging folders left behind by a crash; a live install never gets this old
+STALE_STAGING_AGE = 12 * 3600
+
+
+def staging_root(mods_folder=MODS_DIR):
+    return Path(mods_folder) / STAGING_NAME
+
+
+@contextmanager
+def staging_dir(mods_folder=MODS_DIR):
+    """A fresh folder under mods/.pum_staging, removed (with whatever is left in it) on exit."""
+    import tempfile
+
+    from scripts.pak_store import remove_tree
+
+    root = staging_root(mods_folder)
+    root.mkdir(parents=True, exist_ok=True)
+    path = Path(tempfile.mkdtemp(prefix=f"{os.getpid()}_", dir=root))
+    try:
+        yield path
+    finally:
+        remove_tree(path)
+
+
+def _pid_alive(pid):
+    if sys.platform == "win32":
+        return None  # os.kill() would terminate it: fall back to the age check
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists, owned by someone else
+    return True
+
+
+def clean_staging(mods_folder=MODS_DIR, max_age=STALE_STAGING_AGE):
+    """Remove staging folders whose process is gone (or, where that can't be checked,
+    older than `max_age` seconds). Returns the names removed."""
+    from scripts.pak_store import remove_tree
+
+    removed = []
+    try:
+        entries = list(os.scandir(staging_root(mods_folder)))
+    except OSError:
+        return removed
+    now = time.time()
+    for entry in entries:
+        try:
+            pid = int(entry.name.split("_", 1)[0])
+        except ValueError:
+            pid = None
+        if pid == os.getpid():
+            continue
+        alive = _pid_alive(pid) if pid is not None else None
+        try:
+            stale = alive is False or (alive is None and now - entry.stat(follow_symlinks=False).st_mtime > max_age)
+        except OSError:
+            continue
+        if stale:
+            if entry.is_dir(follow_symlinks=False):
+                remove_tree(entry.path)
+            else:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+            removed.append(entry.name)
+    return removed
+
+
+def _move(src, dst):
+    """Rename `src` to `dst` (same volume); shutil.move if that's not possible."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(str(src), str(dst))
+
+
+def _commit(staged, dest, replace=False):
+    """Move the finished mod folder `staged` to `dest` with a rename. Returns the final folder.
+
+    With `replace` an existing `dest` is renamed aside first and deleted only
+    after the new folder is in place. Without it, a `dest` that appeared in
+    the meantime (another install of the same name) is left alone and the mod
+    gets a suffixed name instead.
+    """
+    from scripts.pak_store import remove_tree
+
+    dest = Path(dest)
+    old = None
+    if dest.exists():
+        if replace:
+            old = Path(staged).with_name(Path(staged).name + ".old")
+            _move(dest, old)
+        else:
+            dest = dest.with_name(f"{dest.name}_{int(time.time())}")
+    try:
+        _move(staged, dest)
+    except Exception:
+        if old is not None:
+            _move(old, dest)
+        raise
+    if old is not None:
+        remove_tree(old)
+    return dest
+
+
+def _merge_into(staged, dest):
+    """Move every file of `staged` into `dest` (replacing files with the same path)."""
+    for root, _, files in os.walk(staged):
+        target = Path(dest) / os.path.relpath(root, staged)
+        target.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            _move(Path(root) / name, target / name)
+
+
+def pak_mod_info(file_name):
+    """modinfo.json written for a mod made from the single pak `file_name`."""
+    mod_name = os.path.splitext(file_name)[0]
+    # Remove _P if present for the folder name to be clean
+    if mod_name.endswith("_P"):
+        mod_name = mod_name[:-2]
+    return {
+        "name": mod_name,
+        "version": "1.0",
+        "author": "Unknown",
+        "description": f"Imported from {file_name}",
+        "category": "Other"
+    }
+
+
+def _install_single_pak(file_name, write, mods_folder, confirm, on_collision, archive=None):
+    """Wrap one pak into a new mod; `write(dest_path)` puts the pak's bytes there.
+
+    `archive` (see archive_info) is only shown to `confirm`, never saved.
+    """
+    stem, suffix = os.path.splitext(file_name)
+    info = pak_mod_info(file_name)
+    mod_name = info["name"]
+    if confirm is not None and not confirm(dict(info, archive=archive) if archive else info):
+        return None
+
+    target = _dest_for(mods_folder, mod_name, on_collision)
+    if target is None:
+        return None
+    with staging_dir(mods_folder) as stage:
+        staged = stage / "mod"
+        assets_dir = staged / "assets"
+        assets_dir.mkdir(parents=True)
+
+        # Ensure _P for the file
+        dest_filename = file_name
+        if not stem.endswith("_P"):
+            dest_filename = f"{stem}_P{suffix}"
+        write(assets_dir / dest_filename)
+
+        with open(staged / "modinfo.json", "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=4)
+        return _commit(staged, *target)
+
+
+def install_pak(path, mods_folder=MODS_DIR, confirm=None, on_collision=None, move=False):
+    """Wrap a single .pak into a new mod. Returns the mod folder, or None.
+
+    With `move` the pak is moved instead of copied (for paks extracted into staging).
+    """
+    path = Path(path)
+    write = (lambda dest: _move(path, dest)) if move else (lambda dest: shutil.copy(path, dest))
+    return _install_single_pak(path.name, write, mods_folder, confirm, on_collision)
+
+
+def find_mod_root(path):
+    """First folder under `path` holding modinfo.json and assets/, or None."""
+    for root, dirs, files in os.walk(path):
+        if "modinfo.json" in files and "assets" in dirs:
+            return Path(root)
+    return None
+
+
+def install_mod_from_folder(path, mods_folder=MODS_DIR, fallback_name=None, confirm=None, on_collision=None,
+                            move=False):
+    """Copy a structured mod found under `path` into ./mods. Returns the mod folder, or None.
+
+    With `move` the folder is renamed into place instead (for mods extracted into staging).
+    """
+    source = find_mod_root(path)
+    if source is None:
+        return None
+
+    info = {"name": source.name, "author": "Unknown", "version": "1.0"}
+    try:
+        with open(source / "modinfo.json", "r", encoding="utf-8") as f:
+            info.update(json.load(f))
+    except Exception:
+        pass
+    if confirm is not None and not confirm(info):
+        return None
+
+    mod_name = source.name
+    # If source is a temp dir (random name), use fallback
+    if fallback_name and (len(mod_name) > 20 or "tmp" in mod_name):
+        mod_name = fallback_name
+
+    target = _dest_for(mods_folder, mod_name, on_collision)
+    if target is None:
+        return None
+    if move:
+        return _commit(source, *target)
+    with staging_dir(mods_folder) as stage:
+        staged = stage / "mod"
+        shutil.copytree(source, staged)
+        return _commit(staged, *target)
+
+
+def extract_archive(archive, out_dir, members=None, progress=None, cancelled=None):
+    """Extract everything (or only `members`) with the best available backend
+    (see scripts/extractors.py). Returns True on success."""
+    return extractors.extract(archive, out_dir, members=members, progress=progress,
+                              cancelled=cancelled) is not None
+
+
+# --- Inspection (metadata only, nothing extracted) ---
+def list_external(archive):
+    """{member path: size} of a rar/7z archive from whichever tool can list it, or None."""
+    return extractors.list_archive(archive)
+
+
+def read_external_member(archive, member):
+    """Bytes of one small member (e.g. modinfo.json) printed by an external tool, or None."""
+    return extractors.read_member(archive, member)
+
+
+def describe_archive(files, read_member=None):
+    """Summarise a listing ({member path: size}); `read_member(path)` returns bytes or None.
+
+    Returns {"files", "size", "root", "modinfo", "paks": [(path, size)],
+    "loose_paks": [(path, size)], "install": [path], "other_size"}: `root` is
+    the structured mod find_zip_mod_root() picks (None if there is none),
+    `paks` its assets/ paks, `loose_paks` every pak in the archive and
+    `install` the members that would actually be installed.
+    """
+    root = find_zip_mod_root(files)
+    modinfo = None
+    if root is not None and read_member is not None:
+        try:
+            raw = read_member(root + "modinfo.json")
+            modinfo = json.loads(raw.decode("utf-8-sig")) if raw else None
+        except Exception:
+            modinfo = None
+    loose = sorted((n, size) for n, size in files.items() if n.lower().endswith(".pak"))
+    paks = []
+    if root is not None:
+        members = mod_members(files, root, modinfo)
+        paks = sorted((n, files[n]) for n, rel in members if rel.lower().endswith(".pak"))
+        install = [n for n, _ in members]
+    else:
+        install = [n for n, _ in loose]
+    total = sum(files.values())
+    return {"files": len(files), "size": total, "root": root, "modinfo": modinfo,
+            "paks": paks, "loose_paks": loose, "install": install,
+            "other_size": total - sum(files[n] for n in install)}
+
+
+def inspect_archive(path):
+    """Describe an archive from its metadata only: the zip central directory, or the
+    rar/7z listing from 7-Zip/UnRAR. None if it can't be read that way."""
+    import zipfile
+
+    path = Path(path)
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            files = zip_files(zf)
+            sizes = {name: zi.file_size for name, zi in files.items()}
+            return describe_archive(sizes, lambda name: zf.read(files[name]) if name in files else None)
+    except (zipfile.BadZipFile, OSError):
+        pass
+    sizes = list_external(path)
+    if sizes is None:
+        return None
+    return describe_archive(sizes, lambda name: read_external_member(path, name))
+
+
+def archive_info(inspection, name):
+    """The dict confirm() receives for an archive install: modinfo fields plus an "archive" summary."""
+    info = {"name": name, "author": "Unknown", "version": "1.0"}
+    info.update(inspection.get("modinfo") or {})
+    paks = inspection["paks"] if inspection["root"] is not None else inspection["loose_paks"]
+    info["archive"] = {"files": inspection["files"], "size": inspection["size"], "paks": paks,
+                       "skipped_size": inspection["other_size"]}
+    return info
+
+
+# --- Zip archives, read in place ---
+# Only these members of a structured mod are installed; readmes, videos,
+# source PSDs and the like stay in the archive
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp", ".gif", ".bmp")
+COPY_CHUNK = 1024 * 1024
+
+
+def zip_files(zf):
+    """{member path: ZipInfo} for the files of an open ZipFile.
+
+    Paths use "/", directories are left out, and so is any member that would
+    land outside the destination ("..", absolute paths, drive letters).
+    """
+    files = {}
+    for zi in zf.infolist():
+        if zi.is_dir():
+            continue
+        parts = [p for p in zi.filename.replace("\\", "/").split("/") if p not in ("", ".")]
+        if not parts or ".." in parts or ":" in parts[0]:
+            continue
+        files["/".join(parts)] = zi
+    return files
+
+
+def find_zip_mod_root(names):
+    """Prefix ("" or "dir/.../") of the shallowest modinfo.json with an assets/ folder next to it, or None."""
+    roots = []
+    for name in names:
+        if name == "modinfo.json" or name.endswith("/modinfo.json"):
+            root = name[:-len("modinfo.json")]
+            if any(n.startswith(root + "assets/") for n in names):
+                roots.append(root)
+    if not roots:
+        return None
+    return min(roots, key=lambda r: (r.count("/"), r))
+
+
+def mod_members(names, root, info=None):
+    """[(member path, path inside the mod)] worth installing from the mod at `root`:
+    modinfo.json, its preview images and the paks under assets/."""
+    screenshot = (info or {}).get("screenshot") or "preview.png"
+    picked = []
+    for name in names:
+        if not name.startswith(root):
+            continue
+        rel = name[len(root):]
+        lower = rel.lower()
+        if rel == "modinfo.json" or rel == screenshot:
+            picked.append((name, rel))
+        elif "/" not in rel and lower.endswith(IMAGE_EXTS):
+            picked.append((name, rel))
+        elif lower.startswith("assets/") and lower.endswith(".pak"):
+            picked.append((name, rel))
+    return picked
+
+
+def copy_member(zf, zi, dest):
+    """Stream one member straight to `dest` (no temp copy)."""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with zf.open(zi) as src, open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
+
+
+def _streamable(zi):
+    """zipfile can decode this member (not encrypted, supported compression)."""
+    import zipfile
+
+    readable = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA)
+    return not zi.flag_bits & 0x1 and zi.compress_type in readable
+
+
+def zip_paks(path):
+    """Pak members of the zip at `path` if they can all be streamed with zipfile, else None.
+
+    None for non-zips, encrypted members or compression zipfile can't read,
+    so the caller extracts the archive the usual way instead.
+    """
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(path, "r") as zf:
+            files = zip_files(zf)
+    except (zipfile.BadZipFile, OSError):
+        return None
+    paks = [name for name in files if name.lower().endswith(".pak")]
+    if not all(_streamable(files[name]) for name in paks):
+        return None
+    return paks
+
+
+def _root_name(root, path):
+    """Folder name for the mod at archive prefix `root`."""
+    mod_name = root.rstrip("/").rsplit("/", 1)[-1]
+    # Same rule as install_mod_from_folder: odd/temporary folder names take the archive's name
+    if not mod_name or len(mod_name) > 20 or "tmp" in mod_name:
+        mod_name = path.stem
+    return mod_name
+
+
+def _loose_pak_archive(inspection, name, size):
+    return {"files": inspection["files"], "size": inspection["size"], "paks": [(name, size)],
+            "skipped_size": inspection["size"] - size}
+
+
+def _install_zip(path, mods_folder, confirm, on_collision, on_loose_paks, progress=None):
+    """install_archive() for zips without extracting them. None if the zip can't be read this way."""
+    import zipfile
+
+    try:
+        zf = zipfile.ZipFile(path, "r")
+    except (zipfile.BadZipFile, OSError):
+        return None
+    with zf:
+        files = zip_files(zf)
+        inspection = describe_archive({n: zi.file_size for n, zi in files.items()}, lambda n: zf.read(files[n]))
+        root = inspection["root"]
+        if root is not None:
+            mod_name = _root_name(root, path)
+            info = archive_info(inspection, mod_name)
+            members = mod_members(files, root, info)
+            if not all(_streamable(files[name]) for name, _ in members):
+                # Encrypted or unusual compression: let 7-Zip/WinRAR have a go
+                return None
+            if confirm is not None and not confirm(info):
+                return []
+
+            target = _dest_for(mods_folder, mod_name, on_collision)
+            if target is None:
+                return []
+            with staging_dir(mods_folder) as stage:
+                staged = stage / "mod"
+                total = sum(files[name].file_size for name, _ in members) or 1
+                done = 0
+                for name, rel in members:
+                    copy_member(zf, files[name], staged / rel)
+                    done += files[name].file_size
+                    if progress is not None:
+                        progress(done / total)
+                return [_commit(staged, *target)]
+
+        # If not found, install each loose .pak as its own mod
+        paks = [n for n, _ in inspection["loose_paks"]]
+        if not all(_streamable(files[name]) for name in paks):
+            return None
+        if on_loose_paks is not None:
+            on_loose_paks(paks)
+        installed = []
+        for n, (name, size) in enumerate(inspection["loose_paks"], start=1):
+            zi = files[name]
+            dest = _install_single_pak(name.rsplit("/", 1)[-1], lambda out, zi=zi: copy_member(zf, zi, out),
+                                       mods_folder, confirm, on_collision,
+                                       archive=_loose_pak_archive(inspection, name, size))
+            if dest is not None:
+                installed.append(dest)
+            if progress is not None:
+                progress(n / len(inspection["loose_paks"]))
+        return installed
+
+
+def install_archive(path, mods_folder=MODS_DIR, confirm=None, on_collision=None, on_loose_paks=None,
+                    progress=None):
+    """Install an archive: a structured mod if it has one, else each .pak as its own mod.
+
+    Nothing is extracted before `confirm` has answered: the dict it gets has
+    the mod's modinfo.json fields plus an "archive" summary (see
+    archive_info()) read from the archive's metadata. Zips are then read in
+    place: only the members listed by mod_members() (or the loose paks) are
+    streamed into ./mods. Other formats go through scripts/extractors.py once
+    confirmed, extracting only those same members to a temp folder;
+    `progress(fraction)` follows that extraction.
+
+    `on_loose_paks(paks)` is called before installing loose paks (the GUI uses
+    it to offer "don't ask again" for batches). Returns the installed folders.
+    """
+    path = Path(path)
+    installed = _install_zip(path, mods_folder, confirm, on_collision, on_loose_paks, progress)
+    if installed is not None:
+        return installed
+
+    inspection = inspect_archive(path)
+    if inspection is None:
+        # No tool can list it: extract first, ask afterwards
+        return _install_extracted(path, mods_folder, confirm, on_collision, on_loose_paks, progress)
+
+    root = inspection["root"]
+    if root is not None:
+        if confirm is not None and not confirm(archive_info(inspection, _root_name(root, path))):
+            return []
+        with staging_dir(mods_folder) as stage:
+            out = _extract_dir(stage, path)
+            _extract_members(path, out, inspection["install"], progress)
+            dest = install_mod_from_folder(out / root, mods_folder, fallback_name=path.stem,
+                                           on_collision=on_collision, move=True)
+            return [dest] if dest is not None else []
+
+    paks = [n for n, _ in inspection["loose_paks"]]
+    if on_loose_paks is not None:
+        on_loose_paks(paks)
+    accepted = [name for name, size in inspection["loose_paks"]
+                if confirm is None or confirm(dict(pak_mod_info(name.rsplit("/", 1)[-1]),
+                                                   archive=_loose_pak_archive(inspection, name, size)))]
+    if not accepted:
+        return []
+    installed = []
+    with staging_dir(mods_folder) as stage:
+        out = _extract_dir(stage, path)
+        _extract_members(path, out, accepted, progress)
+        for name in accepted:
+            dest = install_pak(out / name, mods_folder, on_collision=on_collision, move=True)
+            if dest is not None:
+                installed.append(dest)
+    return installed
+
+
+def _extract_dir(stage, path):
+    """Where to extract `path` inside a staging folder: named after the archive, so a
+    mod sitting at the archive's top level gets that name."""
+    out = Path(stage) / (sanitize_name(path.stem) or "mod")
+    out.mkdir()
+    return out
+
+
+def _extract_members(path, out_dir, members, progress=None):
+    """Extract `members` of `path`, or the whole archive if no backend can pick members."""
+    if extract_archive(path, out_dir, members=members, progress=progress):
+        return
+    if not extract_archive(path, out_dir, progress=progress):
+        raise OSError(f"Could not extract {path.name}. Ensure 7-Zip or WinRAR is installed.")
+
+
+def _install_extracted(path, mods_folder, confirm, on_collision, on_loose_paks, progress=None):
+    """Extract everything, then look for a structured mod or loose paks."""
+    with staging_dir(mods_folder) as stage:
+        tmp_path = _extract_dir(stage, path)
+        if not extract_archive(path, tmp_path, progress=progress):
+            raise OSError(f"Could not extract {path.name}. Ensure 7-Zip or WinRAR is installed.")
+        # Try to find a structured mod first
+        if find_mod_root(tmp_path) is not None:
+            dest = install_mod_from_folder(tmp_path, mods_folder, fallback_name=path.stem,
+                                           confirm=confirm, on_collision=on_collision, move=True)
+            return [dest] if dest is not None else []
+
+        # If not found, look for loose .pak files and install them
+        paks = list(tmp_path.rglob("*.pak"))
+        if on_loose_paks is not None:
+            on_loose_paks(paks)
+        installed = []
+        for pak in paks:
+            dest = install_pak(pak, mods_folder, confirm=confirm, on_collision=on_collision, move=True)
+            if dest is not None:
+                installed.append(dest)
+        return installed
+
+
+def install_path(path, mods_folder=MODS_DIR, confirm=None, on_collision=None, on_loose_paks=None, progress=None):
+    """Install whatever `path` is: a mod folder, a .pak or an archive. Returns the installed folders."""
+    path = Path(path)
+    if path.is_dir():
+        dest = install_mod_from_folder(path, mods_folder, confirm=confirm, on_collision=on_collision)
+        installed = [dest] if dest is not None else []
+    elif path.suffix.lower() == ".pak":
+        dest = install_pak(path, mods_folder, confirm=confirm, on_collision=on_collision)
+        installed = [dest] if dest is not None else []
+    else:
+        return install_archive(path, mods_folder, confirm=confirm, on_collision=on_collision,
+                               on_loose_paks=on_loose_paks, progress=progress)
+    if progress is not None:
+        progress(1.0)
+    return installed
+
+
+# --- Downloads ---
+def normalize_url(url):
+    url = (url or "").strip()
+    if url.startswith("//"):
+        url = "https:" + url
+    if not url.startswith("http"):
+        # best-effort: assume https when scheme missing
+        url = "https://" + url
+    return url
+
+
+def download_file(url, dest_dir, progress=None, default_name="download.archive"):
+    """Stream `url` into `dest_dir`, keeping the server's file name. Returns the path.
+
+    `progress(done, total)` is called per chunk (total is 0 if unknown).
+    """
+    import requests
+
+    with requests.get(normalize_url(url), stream=True) as r:
+        r.raise_for_status()
+        filename = default_name
+        # Try Content-Disposition
+        if "Content-Disposition" in r.headers:
+            m = re.search(r'filename="?([^";]+)"?', r.headers["Content-Disposition"])
+            if m:
+                filename = m.group(1)
+        # Fallback to URL
+        if filename == default_name:
+            url_name = url.split("/")[-1].split("?")[0]
+            if url_name and "." in url_name:
+                filename = url_name
+        local = Path(dest_dir) / re.sub(r'[<>:"/\\|?*]', '_', filename)
+
+        total = int(r.headers.get("content-length", 0))
+        done = 0
+        with open(local, "wb") as f:
+            for chunk in r.iter_content(chunk_size=65536):
+                f.write(chunk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+    return local
+
+
+def fetch_page_image(page_url):
+    """Attempt to extract a main image URL from a mod page: og:image, twitter:image, link rel=image_src, or first <img>."""
+    import requests
+
+    try:
+        if not page_url:
+            return None
+        html = requests.get(page_url, timeout=8).text
+        m = re.search(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']', html, re.I)
+        if not m:
+            m = re.search(r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\']([^"\']+)["\']', html, re.I)
+        if not m:
+            m = re.search(r'<link[^>]+rel=["\']image_src["\'][^>]+href=["\']([^"\']+)["\']', html, re.I)
+        if not m:
+            m = re.search(r'<img[^>]+src=["\']([^"\']+)["\']', html, re.I)
+        if m:
+            src = m.group(1)
+            if src.startswith("//"):
+                src = "https:" + src
+            if src.startswith("/"):
+                from urllib.parse import urljoin
+                src = urljoin(page_url, src)
+            return src
+    except Exception:
+        pass
+    return None
+
+
+def download_and_install(meta, file_urls, mods_folder=MODS_DIR, img_url=None, page_url=None, progress=None,
+                         on_bytes=None):
+    """Download every file of a mod, extract them together and install one mod from all their paks.
+
+    With several paks the mod gets options (one per pak). `progress(fraction)`
+    covers all downloads; `on_bytes(done, total)` reports each file's bytes
+    (e.g. for a speed readout). Returns the mod folder.
+    """
+    import requests
+    import zipfile
+
+    file_urls = [normalize_url(u) for u in file_urls]
+    with staging_dir(mods_folder) as tmpdir:
+        extract_root = Path(tmpdir) / "extracted"
+        extract_root.mkdir()
+        zipped = []  # (archive, [pak members]) read in place
+        for idx, url in enumerate(file_urls):
+            download_dir = Path(tmpdir) / f"file_{idx + 1}"
+            download_dir.mkdir()
+
+            def on_chunk(done, total, idx=idx):
+                if on_bytes is not None:
+                    on_bytes(done, total)
+                if progress is not None:
+                    frac = done / total if total > 0 else 0
+                    progress(min(1.0, (idx + frac) / len(file_urls)))
+
+            local = download_file(url, download_dir, on_chunk)
+            # Zips are not extracted: their paks are streamed into the mod folder below
+            members = zip_paks(local)
+            if members is not None:
+                zipped.append((local, members))
+            elif not extract_archive(local, extract_root):
+                raise OSError(f"Could not extract {local.name}. Ensure 7-Zip or WinRAR is installed.")
+
+        paks = list(extract_root.rglob("*.pak"))
+        if not paks and not any(members for _, members in zipped):
+            raise OSError("No .pak files found in archive")
+
+        mod_name = sanitize_name(meta.get("name", "Unnamed Mod")) or "Unnamed Mod"
+        # Built in staging, then moved into ./mods (merged into an existing folder of that name)
+        dest_mod = Path(tmpdir) / "mod"
+        dest_assets = dest_mod / "assets"
+        dest_assets.mkdir(parents=True, exist_ok=True)
+
+        pak_names = []
+        for local, members in zipped:
+            with zipfile.ZipFile(local, "r") as zf:
+                for name in members:
+                    file_name = name.rsplit("/", 1)[-1]
+                    copy_member(zf, zf.getinfo(name), dest_assets / file_name)
+                    pak_names.append(file_name)
+        for p in paks:
+            _move(p, dest_assets / p.name)
+            pak_names.append(p.name)
+        # Same file name in two archives: the later one replaced the earlier
+        pak_names = list(dict.fromkeys(pak_names))
+        pak_list = [{"name": os.path.splitext(n)[0], "file": n} for n in pak_names]
+
+        # Multi-part mods: each pak becomes a selectable option
+        meta["has_options"] = len(pak_list) > 1
+        meta["options"] = pak_list if len(pak_list) > 1 else []
+
+        # Record source URLs and preserve mod page URL if present
+        meta.setdefault("source_urls", [])
+        meta["source_urls"].extend(file_urls)
+        if not meta.get("url"):
+            meta["url"] = page_url or file_urls[0]
+
+        # Preview image: prefer img_url; fallback to mod page main image
+        image_source = img_url or fetch_page_image(meta.get("url"))
+        if image_source:
+            try:
+                img_data = requests.get(image_source, timeout=10).content
+                with open(dest_mod / "preview.png", "wb") as f:
+                    f.write(img_data)
+                meta["screenshot"] = "preview.png"
+            except Exception:
+                pass
+
+        with open(dest_mod / "modinfo.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=4, ensure_ascii=False)
+
+        final = Path(mods_folder) / mod_name
+        if final.exists():
+            _merge_into(dest_mod, final)
+        else:
+            final = _commit(dest_mod, final)
+    return final
@@ -0,0 +1,234 @@
+"""
+mod_catalog.py
+
+Persistent, stat-validated catalog of every `mods/*/modinfo.json`.
+
+The catalog lives in `mods/.pum_index` and maps each mod folder name to the
+size/mtime of its modinfo.json plus the parsed JSON. A scan only stats each
+modinfo.json; files whose size/mtime still match are served from the cache and
+only new or changed folders are opened and parsed again.
+
+The catalog is also kept in memory per mods folder, so repeated scans inside the
+same session don't even re-read the index file.
+
+Folders are listed with os.scandir (dirent type, no extra stat per entry) and
+the per-mod stat/parse work runs on a small thread pool, which is what matters
+on a slow HDD or a network share. Results can be delivered in batches through
+`on_batch` while the scan is still running.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+INDEX_NAME = ".pum_index"
+INDEX_VERSION = 1
+
+# Workers used to stat/parse modinfo.json files; I/O bound, so a few more than cores
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Below this many folders a thread pool costs more than it saves
+PARALLEL_MIN = 32
+
+# { resolved mods folder (str): { folder name: {"stat": [size, mtime_ns], "data": dict | None} } }
+_memory = {}
+
+# One scan at a time: the cached entries are shared per mods folder
+_scan_lock = threading.RLock()
+
+
+def _index_path(mods_folder) -> Path:
+    return Path(mods_folder) / INDEX_NAME
+
+
+def load_index(mods_folder) -> dict:
+    """Return the cached entries for `mods_folder` (empty dict if missing or outdated)."""
+    key = str(Path(mods_folder).resolve())
+    if key in _memory:
+        return _memory[key]
+
+    entries = {}
+    try:
+        with open(_index_path(mods_folder), "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        if isinstance(raw, dict) and raw.get("version") == INDEX_VERSION:
+            entries = raw.get("entries", {}) or {}
+    except Exception:
+        entries = {}
+    _memory[key] = entries
+    return entries
+
+
+def save_index(mods_folder, entries):
+    """Write the catalog atomically so a crash never leaves a half-written index."""
+    path = _index_path(mods_folder)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except Exception as e:
+        print(f"Error saving mod catalog: {e}")
+        try:
+            os.remove(tmp)
+        except Exception:
+            pass
+
+
+def invalidate(mods_folder=None):
+    """Drop the in-memory catalog (all folders if `mods_folder` is None)."""
+    if mods_folder is None:
+        _memory.clear()
+    else:
+        _memory.pop(str(Path(mods_folder).resolve()), None)
+
+
+def _read_modinfo(info_path):
+    try:
+        with open(info_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except Exception:
+        # Corrupt modinfo: cache the failure too so we don't retry until it changes
+        return None
+
+
+def _list_mod_dirs(mods_folder):
+    """[(name, path)] of candidate mod folders, using the dirent type when available."""
+    found = []
+    try:
+        it = os.scandir(mods_folder)
+    except OSError:
+        return found
+    with it:
+        for entry in it:
+            # Skip our own bookkeeping (.pum_index, .pum_* folders) and hidden folders
+            if entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir():
+                    found.append((entry.name, entry.path))
+            except OSError:
+                continue
+    return found
+
+
+def _probe(name, path, cur):
+    """Stat (and parse if needed) one mod folder. Runs on a worker thread.
+
+    Returns (name, path, entry, parsed) or None if the folder has no modinfo.json.
+    `cur` is the cached entry (or None); it is only read here.
+    """
+    info_path = os.path.join(path, "modinfo.json")
+    try:
+        st = os.stat(info_path)
+    except OSError:
+        return None
+    sig = [st.st_size, st.st_mtime_ns]
+    if cur is not None and cur.get("stat") == sig:
+        return name, path, cur, False
+    return name, path, {"stat": sig, "data": _read_modinfo(info_path)}, True
+
+
+def _probe_chunk(chunk):
+    # One task per chunk of folders keeps the per-future overhead small on fast disks
+    return [_probe(name, path, cur) for name, path, cur in chunk]
+
+
+def scan_mods(mods_folder, rebuild=False, stats=None, on_batch=None, workers=None, batch_interval=0.05):
+    """Return the list of mods in `mods_folder` using the catalog.
+
+    Each result is a fresh copy of the modinfo data with `folder_path` added, so
+    callers may mutate it freely. With `rebuild=True` every modinfo.json is
+    parsed again and the catalog is rewritten from scratch. If `stats` is a dict
+    it receives `cached`/`parsed`/`removed` counters.
+
+    If `on_batch` is given it is called (from the scanning thread) with lists of
+    mods as they are read, the first one as soon as possible and then at most
+    every `batch_interval` seconds; the returned list holds the same dicts.
+    `workers` caps the thread pool (1 = scan serially).
+    """
+    mods_folder = Path(mods_folder)
+    key = str(mods_folder.resolve())
+    workers = DEFAULT_WORKERS if workers is None else max(1, int(workers))
+
+    with _scan_lock:
+        if rebuild:
+            _memory[key] = {}
+            entries = _memory[key]
+        else:
+            entries = load_index(mods_folder)
+
+        cached = parsed = 0
+        seen = set()
+        dirty = rebuild
+        mod_list = []
+        batch = []
+        last_emit = 0.0
+
+        def collect(result):
+            nonlocal cached, parsed, dirty, batch, last_emit
+            if result is None:
+                return
+            name, path, entry, was_parsed = result
+            seen.add(name)
+            if was_parsed:
+                entries[name] = entry
+                parsed += 1
+                dirty = True
+            else:
+                cached += 1
+
+            data = entry.get("data")
+            if data is None:
+                return
+            # Shallow copy: callers replace keys (favorite, editor) but never mutate nested values
+            mod = dict(data)
+            mod["folder_path"] = Path(path)
+            mod_list.append(mod)
+
+            if on_batch is not None:
+                batch.append(mod)
+                now = time.monotonic()
+                if now - last_emit >= batch_interval:
+                    on_batch(batch)
+                    batch = []
+                    last_emit = now
+
+        dirs = _list_mod_dirs(mods_folder)
+        if workers == 1 or len(dirs) < PARALLEL_MIN:
+            for name, path in dirs:
+                collect(_probe(name, path, entries.get(name)))
+        else:
+            # Workers only stat/parse; every change to `entries` happens on this thread
+            chunk_size = max(4, min(32, len(dirs) // (workers * 8)))
+            jobs = [(name, path, entries.get(name)) for name, path in dirs]
+            from concurrent.futures import ThreadPoolExecutor, as_completed
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pum-scan") as pool:
+                futures = [pool.submit(_probe_chunk, jobs[i:i + chunk_size]) for i in range(0, len(jobs), chunk_size)]
+                for fut in as_completed(futures):
+                    try:
+                        results = fut.result()
+                    except Exception as e:
+                        print(f"Error scanning mods: {e}")
+                        continue
+                    for result in results:
+                        collect(result)
+
+        if on_batch is not None and batch:
+            on_batch(batch)
+
+        removed = [name for name in entries if name not in seen]
+        for name in removed:
+            del entries[name]
+        if removed:
+            dirty = True
+
+        if dirty:
+            save_index(mods_folder, entries)
+
+    if stats is not None:
+        stats.update({"cached": cached, "parsed": parsed, "removed": len(removed)})
+    return mod_list
@@ -0,0 +1,173 @@
+"""
+mod_import.py
+
+Background import of loose .pak files dropped straight into ./mods.
+
+A loose `Foo.pak` becomes `Foo/assets/Foo.pak` plus a stub `Foo/modinfo.json`,
+which is the layout the rest of PUM expects. This used to happen inside
+mod_info() on every scan; now it is a separate stage that only runs when loose
+paks show up (the watcher reports them, and once at startup), works off the UI
+thread and handles the files in batches.
+"""
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+# Loose paks moved per batch before reporting back
+IMPORT_BATCH = 16
+
+
+def find_loose_paks(mods_folder):
+    """Names of the .pak files sitting directly in `mods_folder`."""
+    found = []
+    try:
+        with os.scandir(mods_folder) as it:
+            for entry in it:
+                try:
+                    if entry.name.lower().endswith(".pak") and entry.is_file():
+                        found.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return sorted(found)
+
+
+def import_loose_pak(mods_folder, pak_path):
+    """Wrap one loose pak into `<stem>/assets/` and write a stub modinfo.json.
+
+    Returns the mod folder name, or None if the pak could not be moved.
+    """
+    mods_folder = Path(mods_folder)
+    p = Path(pak_path)
+    base_name = p.stem
+    target_dir = mods_folder / base_name
+    assets_dir = target_dir / "assets"
+    # Create target structure if missing
+    try:
+        assets_dir.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        pass
+
+    # Move pak into assets (avoid overwriting existing file)
+    dest = assets_dir / p.name
+    if dest.exists():
+        # find a non-colliding name
+        i = 1
+        while True:
+            dest = assets_dir / f"{p.stem}_{i}{p.suffix}"
+            if not dest.exists():
+                break
+            i += 1
+    try:
+        shutil.move(str(p), str(dest))
+    except Exception:
+        # fallback to copy+unlink
+        try:
+            shutil.copy(str(p), str(dest))
+            p.unlink()
+        except Exception as e:
+            print(f"Error importing {p.name}: {e}")
+            return None
+
+    # Create a simple modinfo.json if missing (set sensible defaults)
+    info_path = target_dir / "modinfo.json"
+    if not info_path.exists():
+        simple = {
+            "name": base_name,
+            "version": "1.0",
+            "author": "",
+            "screenshot": "",
+            "description": f"Imported from {p.name}",
+            "category": "Other",
+            "url": "",
+            "has_options": False,
+            "options": []
+        }
+        try:
+            with open(info_path, "w", encoding="utf-8") as wf:
+                json.dump(simple, wf, indent=4, ensure_ascii=False)
+        except Exception:
+            pass
+    return base_name
+
+
+class ImportQueue:
+    """Imports loose paks on a worker thread.
+
+    `enqueue(names)` queues specific pak names, `enqueue()` a sweep of the whole
+    folder. After each batch `on_imported(folders, paks)` is called from the
+    worker thread with the mod folders created/updated and the pak names that
+    were moved, so the caller can refresh (and acknowledge its own changes).
+    """
+
+    def __init__(self, mods_folder, on_imported, batch_size=IMPORT_BATCH):
+        self.mods_folder = Path(mods_folder)
+        self.on_imported = on_imported
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._sweep = False
+        self._thread = None
+        self._stopped = False
+
+    def enqueue(self, names=None):
+        with self._lock:
+            if self._stopped:
+                return
+            if names is None:
+                self._sweep = True
+            else:
+                self._pending.update(n for n in names if n.lower().endswith(".pak"))
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._pending.clear()
+            self._sweep = False
+
+    def _take(self):
+        with self._lock:
+            if self._stopped:
+                return None
+            names = set(self._pending)
+            self._pending.clear()
+            if self._sweep:
+                self._sweep = False
+                names.update(find_loose_paks(self.mods_folder))
+            if not names:
+                # Nothing left: let enqueue() start a fresh thread next time
+                self._thread = None
+                return None
+            return sorted(names)
+
+    def _run(self):
+        while True:
+            names = self._take()
+            if names is None:
+                return
+            for i in range(0, len(names), self.batch_size):
+                if self._stopped:
+                    return
+                folders, paks = [], []
+                for name in names[i:i + self.batch_size]:
+                    path = self.mods_folder / name
+                    # Already handled (or removed) since it was queued
+                    if not path.is_file():
+                        continue
+                    folder = import_loose_pak(self.mods_folder, path)
+                    if folder is not None:
+                        folders.append(folder)
+                        paks.append(name)
+                if folders:
+                    print(f"Imported loose paks: {', '.join(paks)}")
+                    try:
+                        self.on_imported(folders, paks)
+                    except Exception as e:
+                        print(f"Error after import: {e}")
@@ -0,0 +1,598 @@
+"""
+mods_watcher.py
+
+Watches the ./mods library and reports per-mod differences.
+
+`create_watcher(mods_folder, callback)` returns an `InotifyWatcher` on Linux
+and a `WindowsWatcher` (ReadDirectoryChangesW) on Windows: kernel events, no
+polling at all while idle. Anywhere else it falls back to a `PollingWatcher`,
+which only stats the top level of each mod. All of them run on a background
+thread, share the same interface and call `callback(diff)` from that thread,
+so GUI callers must marshal it themselves (e.g. with `after(0, ...)`).
+
+`diff` is a dict:
+    {"added": [...], "removed": [...], "changed": [...], "loose_paks": [...]}
+where the first three hold mod folder names and `loose_paks` holds the names of
+.pak files dropped directly into ./mods.
+
+Bursts of events (an archive being extracted, a folder being copied) are
+coalesced: a diff is only delivered once the folder has been quiet for
+`settle` seconds, or at the latest every `max_delay` seconds while a long
+operation keeps writing.
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+def _is_ignored(name: str) -> bool:
+    # Our own bookkeeping (.pum_index, .pum_* folders, temp files) and hidden entries
+    return not name or name.startswith(".")
+
+
+def entry_signature(mods_folder, name):
+    """Return a cheap, comparable signature for a top-level entry of ./mods.
+
+    Mod folders are identified by their modinfo.json and the contents of
+    assets/, so edits inside assets/ are noticed even though they don't touch
+    the folder mtime. Returns None if the entry doesn't exist.
+    """
+    path = os.path.join(mods_folder, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not os.path.isdir(path):
+        return ("file", st.st_size, st.st_mtime_ns)
+
+    try:
+        info = os.stat(os.path.join(path, "modinfo.json"))
+        info_sig = (info.st_size, info.st_mtime_ns)
+    except OSError:
+        info_sig = None
+
+    assets = []
+    try:
+        with os.scandir(os.path.join(path, "assets")) as it:
+            for e in it:
+                try:
+                    est = e.stat()
+                    assets.append((e.name, est.st_size, est.st_mtime_ns))
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    assets.sort()
+    return ("dir", info_sig, tuple(assets))
+
+
+def light_signature(mods_folder, name):
+    """Like entry_signature() but only stats the entry, its modinfo.json and its
+    assets/ folder (no listing), for polling. Returns None if the entry doesn't exist.
+
+    Adding, removing or renaming a pak changes the assets/ mtime; a pak
+    rewritten in place does not and is only caught by the event backends.
+    """
+    path = os.path.join(mods_folder, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if not os.path.isdir(path):
+        return ("file", st.st_size, st.st_mtime_ns)
+    sigs = [st.st_mtime_ns]
+    for child in ("modinfo.json", "assets"):
+        try:
+            cst = os.stat(os.path.join(path, child))
+            sigs.append((cst.st_size, cst.st_mtime_ns))
+        except OSError:
+            sigs.append(None)
+    return ("dir",) + tuple(sigs)
+
+
+def snapshot(mods_folder, signature=entry_signature):
+    """Return {name: signature(mods_folder, name)} for every visible entry of `mods_folder`."""
+    state = {}
+    try:
+        with os.scandir(mods_folder) as it:
+            for e in it:
+                if _is_ignored(e.name):
+                    continue
+                sig = signature(mods_folder, e.name)
+                if sig is not None:
+                    state[e.name] = sig
+    except OSError:
+        pass
+    return state
+
+
+def diff_states(old, new, names=None):
+    """Compare two snapshots (optionally only `names`) and build a diff dict."""
+    diff = {"added": [], "removed": [], "changed": [], "loose_paks": []}
+    keys = set(old) | set(new) if names is None else set(names)
+    for name in sorted(keys):
+        before = old.get(name)
+        after = new.get(name)
+        if before == after:
+            continue
+        # Loose paks are reported on their own so an import stage can pick them up
+        if after is not None and after[0] == "file":
+            if name.lower().endswith(".pak"):
+                diff["loose_paks"].append(name)
+            continue
+        if before is not None and before[0] == "file" and after is None:
+            continue
+        if before is None:
+            diff["added"].append(name)
+        elif after is None:
+            diff["removed"].append(name)
+        else:
+            diff["changed"].append(name)
+    return diff
+
+
+def diff_is_empty(diff) -> bool:
+    return not any(diff.values())
+
+
+class _BaseWatcher:
+    def __init__(self, mods_folder, callback, settle=0.75, max_delay=10.0):
+        self.mods_folder = str(Path(mods_folder).resolve())
+        self.callback = callback
+        self.settle = settle
+        self.max_delay = max_delay
+        self._state = {}
+        self._pending = set()
+        self._first_event = None
+        self._last_event = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- public interface ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self._state = snapshot(self.mods_folder)
+        self._setup()
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2)
+        self._thread = None
+        self._teardown()
+
+    def acknowledge(self, names=None):
+        """Re-read the signature of `names` (all if None) without reporting it.
+
+        Used after PUM itself changed the library (e.g. saving modinfo.json) so
+        that change is not echoed back as an external modification.
+        """
+        with self._lock:
+            if names is None:
+                self._state = snapshot(self.mods_folder)
+                return
+            for name in names:
+                sig = entry_signature(self.mods_folder, name)
+                if sig is None:
+                    self._state.pop(name, None)
+                else:
+                    self._state[name] = sig
+
+    # --- coalescing ---
+    def _note(self, name):
+        if name is not None and _is_ignored(name):
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._first_event is None:
+                self._first_event = now
+            self._last_event = now
+            if name is None:
+                # Unknown scope (e.g. event queue overflow): rescan everything
+                self._pending.update(self._state.keys())
+                self._pending.update(snapshot(self.mods_folder).keys())
+            else:
+                self._pending.add(name)
+
+    def _time_until_flush(self):
+        """Seconds until pending events should be delivered (None if none pending)."""
+        if self._first_event is None:
+            return None
+        now = time.monotonic()
+        quiet = self._last_event + self.settle - now
+        cap = self._first_event + self.max_delay - now
+        return max(0.0, min(quiet, cap))
+
+    def _flush(self):
+        with self._lock:
+            names = self._pending
+            self._pending = set()
+            self._first_event = self._last_event = None
+            new = {}
+            for name in names:
+                sig = entry_signature(self.mods_folder, name)
+                if sig is not None:
+                    new[name] = sig
+            diff = diff_states({n: self._state[n] for n in names if n in self._state}, new, names)
+            for name in names:
+                if name in new:
+                    self._state[name] = new[name]
+                else:
+                    self._state.pop(name, None)
+        if not diff_is_empty(diff):
+            try:
+                self.callback(diff)
+            except Exception as e:
+                print(f"Error in mods watcher callback: {e}")
+
+    # --- backend hooks ---
+    def _setup(self):
+        pass
+
+    def _teardown(self):
+        pass
+
+    def _wake(self):
+        pass
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class PollingWatcher(_BaseWatcher):
+    """Portable fallback: compares light snapshots every `interval` seconds off the UI thread.
+
+    Each poll costs a listing of ./mods plus three stats per mod; the full
+    entry_signature() (which lists assets/) is only computed for entries whose
+    light signature moved.
+    """
+
+    def __init__(self, mods_folder, callback, interval=2.0, **kwargs):
+        super().__init__(mods_folder, callback, **kwargs)
+        self.interval = interval
+        self._last_poll = {}
+
+    def _setup(self):
+        self._last_poll = snapshot(self.mods_folder, light_signature)
+
+    def _run(self):
+        # _stop.wait() returns as soon as stop() sets the event, no extra wake-up needed
+        while not self._stop.is_set():
+            self._stop.wait(self.interval)
+            if self._stop.is_set():
+                break
+            try:
+                current = snapshot(self.mods_folder, light_signature)
+                # Anything that moved since the previous poll is still being written:
+                # (re)arm the quiet timer so a long extraction is reported once it settles.
+                for name in set(current) | set(self._last_poll):
+                    if current.get(name) != self._last_poll.get(name):
+                        self._note(name)
+                self._last_poll = current
+                wait = self._time_until_flush()
+                if wait is not None and wait <= 0:
+                    self._flush()
+            except Exception as e:
+                print(f"Error polling mods folder: {e}")
+
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# IN_CLOSE_WRITE instead of IN_MODIFY: a 2 GB extraction produces one event per file, not per write
+_WATCH_MASK = (IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+               IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher(_BaseWatcher):
+    """Linux backend: blocks on inotify, so an idle library costs no CPU at all.
+
+    Watches ./mods, every mod folder and each mod's direct subfolders (assets/).
+    """
+
+    def __init__(self, mods_folder, callback, interval=None, **kwargs):
+        # `interval` is accepted for interface parity with PollingWatcher and ignored
+        super().__init__(mods_folder, callback, **kwargs)
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError("inotify is not available")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError("inotify_init1 failed")
+        self._wake_r = self._wake_w = None
+        self._wds = {}  # wd -> (top-level mod name or None for root, absolute path)
+
+    def _setup(self):
+        self._wake_r, self._wake_w = os.pipe()
+        self._add_watch(self.mods_folder, None)
+        for name in list(self._state.keys()):
+            self._watch_mod(name)
+
+    def _teardown(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._fd = self._wake_r = self._wake_w = None
+        self._wds = {}
+
+    def _wake(self):
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
+
+    def _add_watch(self, path, mod_name):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd >= 0:
+            self._wds[wd] = (mod_name, path)
+
+    def _watch_mod(self, name):
+        path = os.path.join(self.mods_folder, name)
+        if not os.path.isdir(path):
+            return
+        self._add_watch(path, name)
+        try:
+            with os.scandir(path) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        self._add_watch(e.path, name)
+        except OSError:
+            pass
+
+    def _handle(self, wd, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            self._note(None)
+            return
+        if mask & IN_IGNORED:
+            self._wds.pop(wd, None)
+            return
+        owner = self._wds.get(wd)
+        if owner is None:
+            return
+        mod_name, path = owner
+        if mod_name is None:
+            # Event directly inside ./mods
+            if _is_ignored(name):
+                return
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_mod(name)
+            self._note(name)
+        else:
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and path == os.path.join(self.mods_folder, mod_name):
+                self._add_watch(os.path.join(path, name), mod_name)
+            self._note(mod_name)
+
+    def _run(self):
+        while not self._stop.is_set():
+            timeout = self._time_until_flush()
+            try:
+                ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+            except (OSError, ValueError):
+                break
+            if self._stop.is_set():
+                break
+            if self._fd in ready:
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    data = b""
+                except OSError:
+                    break
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(data):
+                    wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    raw_name = data[offset:offset + length].split(b"\0", 1)[0]
+                    offset += length
+                    try:
+                        self._handle(wd, mask, os.fsdecode(raw_name))
+                    except Exception as e:
+                        print(f"Error handling inotify event: {e}")
+            wait = self._time_until_flush()
+            if wait is not None and wait <= 0:
+                self._flush()
+
+
+# ReadDirectoryChangesW (winnt.h / winbase.h)
+FILE_LIST_DIRECTORY = 0x0001
+FILE_SHARE_ALL = 0x00000001 | 0x00000002 | 0x00000004
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000
+FILE_FLAG_OVERLAPPED = 0x40000000
+FILE_NOTIFY_CHANGE_FILE_NAME = 0x00000001
+FILE_NOTIFY_CHANGE_DIR_NAME = 0x00000002
+FILE_NOTIFY_CHANGE_ATTRIBUTES = 0x00000004
+FILE_NOTIFY_CHANGE_SIZE = 0x00000008
+FILE_NOTIFY_CHANGE_LAST_WRITE = 0x00000010
+WAIT_OBJECT_0 = 0x00000000
+WAIT_TIMEOUT = 0x00000102
+INFINITE = 0xFFFFFFFF
+
+_NOTIFY_FILTER = (FILE_NOTIFY_CHANGE_FILE_NAME | FILE_NOTIFY_CHANGE_DIR_NAME | FILE_NOTIFY_CHANGE_ATTRIBUTES |
+                  FILE_NOTIFY_CHANGE_SIZE | FILE_NOTIFY_CHANGE_LAST_WRITE)
+_NOTIFY_HEADER = struct.Struct("<III")  # NextEntryOffset, Action, FileNameLength (bytes)
+_NOTIFY_BUFFER = 64 * 1024  # Largest buffer ReadDirectoryChangesW accepts on network shares
+
+
+class _OVERLAPPED(ctypes.Structure):
+    _fields_ = [("Internal", ctypes.c_void_p), ("InternalHigh", ctypes.c_void_p),
+                ("Offset", ctypes.c_uint32), ("OffsetHigh", ctypes.c_uint32), ("hEvent", ctypes.c_void_p)]
+
+
+class WindowsWatcher(_BaseWatcher):
+    """Windows backend: one recursive ReadDirectoryChangesW on ./mods, so an idle
+    library costs no CPU or disk I/O. Events are mapped to their top-level entry.
+    """
+
+    def __init__(self, mods_folder, callback, interval=None, **kwargs):
+        # `interval` is accepted for interface parity with PollingWatcher and ignored
+        super().__init__(mods_folder, callback, **kwargs)
+        self._k32 = _load_kernel32()
+        if self._k32 is None:
+            raise OSError("ReadDirectoryChangesW is not available")
+        self._dir = self._k32.CreateFileW(self.mods_folder, FILE_LIST_DIRECTORY, FILE_SHARE_ALL, None,
+                                          OPEN_EXISTING, FILE_FLAG_BACKUP_SEMANTICS | FILE_FLAG_OVERLAPPED, None)
+        if not self._dir or self._dir == ctypes.c_void_p(-1).value:
+            raise OSError(f"CreateFileW failed ({ctypes.get_last_error()})")
+        self._event = self._k32.CreateEventW(None, True, False, None)
+        self._stop_event = self._k32.CreateEventW(None, True, False, None)
+        if not self._event or not self._stop_event:
+            self._teardown()
+            raise OSError("CreateEventW failed")
+        # DWORD-aligned, as ReadDirectoryChangesW requires
+        self._buffer = (ctypes.c_uint32 * (_NOTIFY_BUFFER // 4))()
+        self._overlapped = _OVERLAPPED()
+
+    def _teardown(self):
+        k32 = self._k32
+        if getattr(self, "_dir", None):
+            k32.CancelIoEx(self._dir, None)
+            k32.CloseHandle(self._dir)
+        for name in ("_event", "_stop_event"):
+            handle = getattr(self, name, None)
+            if handle:
+                k32.CloseHandle(handle)
+        self._dir = self._event = self._stop_event = None
+
+    def _wake(self):
+        if self._stop_event:
+            self._k32.SetEvent(self._stop_event)
+
+    def _read(self):
+        """Queue the next (asynchronous) read of change records."""
+        self._k32.ResetEvent(self._event)
+        self._overlapped = _OVERLAPPED()
+        self._overlapped.hEvent = self._event
+        return self._k32.ReadDirectoryChangesW(self._dir, self._buffer, _NOTIFY_BUFFER, True, _NOTIFY_FILTER,
+                                               None, ctypes.byref(self._overlapped), None)
+
+    def _handle(self, size):
+        if size == 0:
+            # The buffer overflowed and the records were dropped: rescan everything
+            self._note(None)
+            return
+        data = ctypes.string_at(self._buffer, size)
+        offset = 0
+        while offset + _NOTIFY_HEADER.size <= len(data):
+            next_offset, _action, length = _NOTIFY_HEADER.unpack_from(data, offset)
+            start = offset + _NOTIFY_HEADER.size
+            name = data[start:start + length].decode("utf-16-le", "replace")
+            # Path relative to ./mods: the mod is its first component
+            self._note(name.split("\\", 1)[0])
+            if not next_offset:
+                break
+            offset += next_offset
+
+    def _run(self):
+        handles = (ctypes.c_void_p * 2)(self._event, self._stop_event)
+        if not self._read():
+            print(f"Error watching mods folder ({ctypes.get_last_error()})")
+            return
+        while not self._stop.is_set():
+            timeout = self._time_until_flush()
+            ms = INFINITE if timeout is None else int(timeout * 1000)
+            result = self._k32.WaitForMultipleObjects(2, handles, False, ms)
+            if self._stop.is_set():
+                break
+            if result == WAIT_OBJECT_0:
+                size = ctypes.c_uint32(0)
+                if not self._k32.GetOverlappedResult(self._dir, ctypes.byref(self._overlapped), ctypes.byref(size), False):
+                    print(f"Error reading mods folder changes ({ctypes.get_last_error()})")
+                    break
+                try:
+                    self._handle(size.value)
+                except Exception as e:
+                    print(f"Error handling folder change: {e}")
+                if not self._read():
+                    print(f"Error watching mods folder ({ctypes.get_last_error()})")
+                    break
+            elif result != WAIT_TIMEOUT:
+                break
+            wait = self._time_until_flush()
+            if wait is not None and wait <= 0:
+                self._flush()
+
+
+def _load_kernel32():
+    if sys.platform != "win32":
+        return None
+    try:
+        from ctypes import wintypes
+        k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        k32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, ctypes.c_void_p,
+                                    wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+        k32.CreateFileW.restype = ctypes.c_void_p
+        k32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        k32.CreateEventW.restype = ctypes.c_void_p
+        k32.ReadDirectoryChangesW.argtypes = [ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD, wintypes.BOOL,
+                                              wintypes.DWORD, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+        k32.ReadDirectoryChangesW.restype = wintypes.BOOL
+        k32.GetOverlappedResult.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, wintypes.BOOL]
+        k32.GetOverlappedResult.restype = wintypes.BOOL
+        k32.WaitForMultipleObjects.argtypes = [wintypes.DWORD, ctypes.c_void_p, wintypes.BOOL, wintypes.DWORD]
+        k32.WaitForMultipleObjects.restype = wintypes.DWORD
+        for fn in (k32.SetEvent, k32.ResetEvent, k32.CloseHandle):
+            fn.argtypes = [ctypes.c_void_p]
+            fn.restype = wintypes.BOOL
+        k32.CancelIoEx.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+        k32.CancelIoEx.restype = wintypes.BOOL
+        return k32
+    except Exception:
+        return None
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except Exception:
+        return None
+
+
+def create_watcher(mods_folder, callback, **kwargs):
+    """Return the best available watcher for this platform (not started yet)."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(mods_folder, callback, **kwargs)
+        except OSError:
+            pass
+    elif sys.platform == "win32":
+        try:
+            return WindowsWatcher(mods_folder, callback, **kwargs)
+        except OSError:
+            pass
+    return PollingWatcher(mods_folder, callback, **kwargs)
@@ -0,0 +1,352 @@
+"""
+pak_reader.py
+
+Read the footer and file index of an Unreal Engine .pak without loading it.
+
+The pak is memory-mapped and only the bytes actually needed are touched: the
+footer at the end of the file (magic, version, index offset/size, compression
+methods) and the index it points to (mount point plus one entry per asset).
+Both the legacy index (pak version < 10) and the path-hash/full-directory index
+with encoded entries (version 10+, UE 4.25 onwards) are supported. Paks whose
+index is encrypted report that instead of a file list.
+
+`pak_info()` caches results by path and size/mtime, in memory and in
+`mods/.pum_pakinfo`, so the details panel and the conflict index don't parse
+the same pak twice.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+PAK_MAGIC = 0x5A6F12E1
+
+# Pak versions where the on-disk format changes
+_V_NO_TIMESTAMPS = 2
+_V_COMPRESSION_ENCRYPTION = 3
+_V_ENCRYPTION_KEY_GUID = 7
+_V_FNAME_COMPRESSION = 8
+_V_FROZEN_INDEX = 9
+_V_PATH_HASH_INDEX = 10
+
+_COMPRESSION_NAME_LEN = 32
+
+CACHE_NAME = ".pum_pakinfo"
+CACHE_VERSION = 1
+
+
+class PakError(Exception):
+    """The file is not a pak this reader understands."""
+
+
+class _Cursor:
+    """Little-endian reader over a buffer (the mmap), bounds-checked."""
+
+    def __init__(self, buf, pos=0, end=None):
+        self.buf = buf
+        self.pos = pos
+        self.end = len(buf) if end is None else end
+
+    def _take(self, fmt, size):
+        if self.pos + size > self.end:
+            raise PakError("Unexpected end of pak index")
+        value = struct.unpack_from(fmt, self.buf, self.pos)[0]
+        self.pos += size
+        return value
+
+    def u8(self):
+        return self._take("<B", 1)
+
+    def i32(self):
+        return self._take("<i", 4)
+
+    def u32(self):
+        return self._take("<I", 4)
+
+    def i64(self):
+        return self._take("<q", 8)
+
+    def u64(self):
+        return self._take("<Q", 8)
+
+    def skip(self, n):
+        if n < 0 or self.pos + n > self.end:
+            raise PakError("Unexpected end of pak index")
+        self.pos += n
+
+    def fstring(self):
+        # FString: int32 length including the terminator; negative means UTF-16
+        n = self.i32()
+        if n == 0:
+            return ""
+        if n > 0:
+            if self.pos + n > self.end:
+                raise PakError("Bad string in pak index")
+            raw = bytes(self.buf[self.pos:self.pos + n - 1])
+            self.pos += n
+            return raw.decode("utf-8", errors="replace")
+        n = -n * 2
+        if self.pos + n > self.end:
+            raise PakError("Bad string in pak index")
+        raw = bytes(self.buf[self.pos:self.pos + n - 2])
+        self.pos += n
+        return raw.decode("utf-16-le", errors="replace")
+
+
+def _parse_footer(buf):
+    """Locate and parse the FPakInfo footer. Returns a dict."""
+    size = len(buf)
+    tail_start = max(0, size - 256)
+    tail = bytes(buf[tail_start:size])
+    magic = struct.pack("<I", PAK_MAGIC)
+
+    # Scan backwards: the magic sits 17 bytes into the footer on modern versions
+    pos = tail.rfind(magic)
+    while pos != -1:
+        at = tail_start + pos
+        if at + 44 <= size:
+            version, index_offset, index_size = struct.unpack_from("<iqq", buf, at + 4)
+            if 1 <= version <= 32 and 0 <= index_offset and 0 < index_size and index_offset + index_size <= size:
+                after = at + 44  # magic, version, offset, size, sha1
+                if version == _V_FROZEN_INDEX:
+                    after += 1
+                methods = []
+                if version >= _V_FNAME_COMPRESSION:
+                    while after + _COMPRESSION_NAME_LEN <= size:
+                        name = bytes(buf[after:after + _COMPRESSION_NAME_LEN]).split(b"\0", 1)[0]
+                        methods.append(name.decode("ascii", errors="replace"))
+                        after += _COMPRESSION_NAME_LEN
+                encrypted_index = at >= 1 and version >= 4 and buf[at - 1] == 1
+                return {
+                    "version": version,
+                    "index_offset": index_offset,
+                    "index_size": index_size,
+                    "encrypted_index": bool(encrypted_index),
+                    # 4.22 (8A) had 4 compression slots and a uint8 method index
+                    "compression_u8": version == _V_FNAME_COMPRESSION and len(methods) == 4,
+                    "compression_methods": [m for m in methods if m],
+                }
+        pos = tail.rfind(magic, 0, pos)
+    raise PakError("Not an Unreal pak (footer magic not found)")
+
+
+def _read_entry(cur, footer):
+    """FPakEntry as written in the legacy index. Returns (compressed, uncompressed)."""
+    version = footer["version"]
+    cur.skip(8)  # offset
+    size = cur.i64()
+    uncompressed = cur.i64()
+    if version >= _V_FNAME_COMPRESSION:
+        method = cur.u8() if footer["compression_u8"] else cur.u32()
+    else:
+        method = cur.i32()
+    if version < _V_NO_TIMESTAMPS:
+        cur.skip(8)  # timestamp
+    cur.skip(20)  # sha1
+    if version >= _V_COMPRESSION_ENCRYPTION:
+        if method != 0:
+            blocks = cur.i32()
+            cur.skip(16 * blocks)
+        cur.skip(1 + 4)  # encrypted flag, compression block size
+    return size, uncompressed
+
+
+def _decode_entry(buf, pos):
+    """Encoded FPakEntry (version 10+). Returns (compressed, uncompressed)."""
+    cur = _Cursor(buf, pos)
+    value = cur.u32()
+    if value & 0x3F == 0x3F:
+        cur.skip(4)  # explicit compression block size
+    method = (value >> 23) & 0x3F
+    cur.skip(4 if value & (1 << 31) else 8)  # offset
+    uncompressed = cur.u32() if value & (1 << 30) else cur.u64()
+    if method != 0:
+        size = cur.u32() if value & (1 << 29) else cur.u64()
+    else:
+        size = uncompressed
+    return size, uncompressed
+
+
+def _parse_index(buf, footer):
+    cur = _Cursor(buf, footer["index_offset"], footer["index_offset"] + footer["index_size"])
+    mount_point = cur.fstring()
+    count = cur.i32()
+    files = []
+    compressed = uncompressed = 0
+
+    if footer["version"] < _V_PATH_HASH_INDEX:
+        for _ in range(count):
+            name = cur.fstring()
+            size, usize = _read_entry(cur, footer)
+            files.append(name)
+            compressed += size
+            uncompressed += usize
+        return mount_point, files, compressed, uncompressed
+
+    cur.skip(8)  # path hash seed
+    if cur.u32():
+        cur.skip(8 + 8 + 20)  # path hash index: we don't need it
+    has_full_dir = cur.u32()
+    full_dir = None
+    if has_full_dir:
+        full_dir = (cur.i64(), cur.i64())
+        cur.skip(20)
+    encoded_size = cur.i32()
+    encoded_start = cur.pos
+    cur.skip(encoded_size)
+    plain_count = cur.i32()
+    plain = []
+    for _ in range(plain_count):
+        plain.append(_read_entry(cur, footer))
+
+    if full_dir is None:
+        raise PakError("Pak has no full directory index")
+    offset, size = full_dir
+    if offset < 0 or offset + size > len(buf):
+        raise PakError("Bad directory index offset")
+    d = _Cursor(buf, offset, offset + size)
+    for _ in range(d.i32()):
+        directory = d.fstring()
+        for _ in range(d.i32()):
+            name = d.fstring()
+            location = d.i32()
+            if location >= 0:
+                if location >= encoded_size:
+                    raise PakError("Bad encoded entry offset")
+                csize, usize = _decode_entry(buf, encoded_start + location)
+            else:
+                csize, usize = plain[-location - 1]
+            # Directories are stored with a trailing "/" ("/" for the mount root)
+            files.append((directory + name).lstrip("/"))
+            compressed += csize
+            uncompressed += usize
+    return mount_point, files, compressed, uncompressed
+
+
+def read_pak(path):
+    """Parse `path` and return {"version", "mount_point", "asset_count", "files",
+    "compressed_size", "uncompressed_size", "encrypted_index", "compression_methods"}.
+
+    Raises PakError (or OSError) if the file can't be read as a pak.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < 44:
+            raise PakError("File too small to be a pak")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            footer = _parse_footer(buf)
+            info = {
+                "version": footer["version"],
+                "mount_point": "",
+                "asset_count": 0,
+                "files": [],
+                "compressed_size": 0,
+                "uncompressed_size": 0,
+                "encrypted_index": footer["encrypted_index"],
+                "compression_methods": footer["compression_methods"],
+            }
+            if footer["encrypted_index"]:
+                return info
+            mount_point, files, compressed, uncompressed = _parse_index(buf, footer)
+    info.update({
+        "mount_point": mount_point,
+        "asset_count": len(files),
+        "files": files,
+        "compressed_size": compressed,
+        "uncompressed_size": uncompressed,
+    })
+    return info
+
+
+def asset_paths(info):
+    """Full game paths of the assets in `info` ("../../../" mount prefixes stripped)."""
+    mount = info.get("mount_point", "").replace("\\", "/")
+    while mount.startswith("../"):
+        mount = mount[3:]
+    mount = mount.strip("/")
+    prefix = f"{mount}/" if mount else ""
+    return [prefix + f.replace("\\", "/") for f in info.get("files", [])]
+
+
+# --- Cache ---
+# { mods folder: { pak path: {"sig": [size, mtime_ns], "info": dict} } }
+_memory = {}
+_lock = threading.Lock()
+_dirty = set()
+
+
+def _cache_path(mods_folder) -> Path:
+    return Path(mods_folder) / CACHE_NAME
+
+
+def _load_cache(mods_folder):
+    key = str(Path(mods_folder).resolve())
+    if key not in _memory:
+        entries = {}
+        try:
+            with open(_cache_path(mods_folder), "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if isinstance(raw, dict) and raw.get("version") == CACHE_VERSION:
+                entries = raw.get("entries", {}) or {}
+        except Exception:
+            entries = {}
+        _memory[key] = entries
+    return key, _memory[key]
+
+
+def save_cache(mods_folder):
+    """Write the on-disk cache if anything was parsed since the last save."""
+    with _lock:
+        key, entries = _load_cache(mods_folder)
+        if key not in _dirty:
+            return
+        # Forget paks that no longer exist
+        for pak in [p for p in entries if not os.path.exists(p)]:
+            del entries[pak]
+        path = _cache_path(mods_folder)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+            _dirty.discard(key)
+        except Exception as e:
+            print(f"Error saving pak info cache: {e}")
+
+
+def pak_info(path, mods_folder=None, save=True):
+    """read_pak() cached by size/mtime.
+
+    A pak that can't be parsed gives {"error": message} (cached like any other
+    result); None only if the file itself can't be stat'ed.
+
+    With `mods_folder` the cache persists in `mods/.pum_pakinfo`; pass
+    save=False when parsing many paks and call save_cache() once at the end.
+    """
+    path = Path(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    sig = [st.st_size, st.st_mtime_ns]
+    store = mods_folder if mods_folder is not None else path.parent
+    with _lock:
+        key, entries = _load_cache(store)
+        cur = entries.get(str(path))
+        if cur is not None and cur.get("sig") == sig:
+            return cur.get("info")
+
+    try:
+        info = read_pak(path)
+    except (PakError, OSError, ValueError) as e:
+        info = {"error": str(e)}
+
+    with _lock:
+        entries[str(path)] = {"sig": sig, "info": info}
+        if mods_folder is not None:
+            _dirty.add(key)
+    if save and mods_folder is not None:
+        save_cache(mods_folder)
+    return info
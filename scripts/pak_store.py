@@ -0,0 +1,316 @@
+"""
+pak_store.py
+
+Optional content-addressed store for the paks in ./mods.
+
+Blobs live in `mods/.pum_store/objects/<2 hex>/<sha256>` and mod folders keep
+referencing them from `<mod>/assets/<name>.pak`:
+
+- as a hardlink to the blob (preferred: every other part of PUM and the game
+  keep seeing a normal .pak file), or
+- as a pointer file `<name>.pak.pumref` holding the hash, when the volume has
+  no hardlinks (FAT/exFAT). Use `list_paks()`/`resolve_pak()` to read assets
+  so pointers are followed.
+
+Identical paks shipped by several mods (or kept in several versions of a skin)
+are therefore stored once. PUM never writes into an existing pak: installs and
+deploys always create new files, so a shared blob is never modified through
+one of its links. Blobs are also made read-only (which every hardlink shares),
+so another tool overwriting a pak in place fails instead of silently changing
+it for every mod that uses it; remove_tree() deletes such files.
+
+Blobs nobody references any more (link count 1 and no pointer) are removed by
+`gc()`.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+from pathlib import Path
+
+STORE_NAME = ".pum_store"
+POINTER_SUFFIX = ".pumref"
+
+_CHUNK = 1024 * 1024
+
+
+def store_root(mods_folder) -> Path:
+    return Path(mods_folder) / STORE_NAME
+
+
+def _blob_path(mods_folder, digest) -> Path:
+    return store_root(mods_folder) / "objects" / digest[:2] / digest
+
+
+def hash_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _iter_blobs(mods_folder):
+    """Yield (digest, path, stat) for every blob in the store."""
+    objects = store_root(mods_folder) / "objects"
+    try:
+        buckets = list(os.scandir(objects))
+    except OSError:
+        return
+    for bucket in buckets:
+        if not bucket.is_dir():
+            continue
+        try:
+            with os.scandir(bucket.path) as it:
+                for e in it:
+                    if e.name.startswith("."):
+                        continue
+                    try:
+                        # Not e.stat(): on Windows its st_nlink/st_ino/st_dev are 0
+                        yield e.name, Path(e.path), os.stat(e.path)
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+
+
+def _inode_map(mods_folder):
+    """{(st_dev, st_ino): digest} of the store, to spot already-interned paks without hashing."""
+    return {(st.st_dev, st.st_ino): digest for digest, _, st in _iter_blobs(mods_folder)}
+
+
+def _seal(path):
+    """Make a blob read-only (for all its hardlinks)."""
+    try:
+        mode = os.stat(path).st_mode
+        if mode & (stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH):
+            os.chmod(path, stat.S_IREAD)
+    except OSError:
+        pass
+
+
+def seal_store(mods_folder):
+    """Make every blob read-only again.
+
+    On Windows a read-only file can only be deleted after clearing the flag,
+    which also clears it for the blob's other links: call this after deleting
+    mods or deployed links.
+    """
+    for _, path, _ in _iter_blobs(mods_folder):
+        _seal(path)
+
+
+def remove_file(path):
+    """os.remove() that also works on read-only files (Windows)."""
+    try:
+        os.remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IREAD | stat.S_IWRITE)
+        os.remove(path)
+
+
+def remove_tree(path):
+    """shutil.rmtree() that also removes read-only files (stored paks on Windows)."""
+    def on_error(func, p, _exc):
+        try:
+            os.chmod(p, stat.S_IREAD | stat.S_IWRITE)
+            func(p)
+        except OSError:
+            pass
+    if os.path.isdir(path):
+        shutil.rmtree(path, onerror=on_error)
+
+
+def read_pointer(pointer_path):
+    try:
+        with open(pointer_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data.get("hash")
+    except Exception:
+        return None
+
+
+def resolve_pak(mods_folder, path):
+    """Return the real file for an asset path (`x.pak` or its `x.pak.pumref` pointer), or None."""
+    path = Path(path)
+    if path.is_file() and not path.name.endswith(POINTER_SUFFIX):
+        return path
+    pointer = path if path.name.endswith(POINTER_SUFFIX) else path.with_name(path.name + POINTER_SUFFIX)
+    digest = read_pointer(pointer) if pointer.is_file() else None
+    if digest:
+        blob = _blob_path(mods_folder, digest)
+        if blob.is_file():
+            return blob
+    return None
+
+
+def list_paks(assets_dir, mods_folder=None):
+    """[(pak name, real path)] in `assets_dir`, following store pointers.
+
+    `mods_folder` defaults to the parent of the mod folder (./mods).
+    """
+    assets_dir = Path(assets_dir)
+    if mods_folder is None:
+        mods_folder = assets_dir.parent.parent
+    found = []
+    try:
+        entries = list(os.scandir(assets_dir))
+    except OSError:
+        return found
+    for e in entries:
+        name = e.name
+        lower = name.lower()
+        if lower.endswith(".pak"):
+            found.append((name, Path(e.path)))
+        elif lower.endswith(".pak" + POINTER_SUFFIX):
+            real = resolve_pak(mods_folder, e.path)
+            if real is not None:
+                found.append((name[:-len(POINTER_SUFFIX)], real))
+    found.sort()
+    return found
+
+
+def _write_pointer(path, digest, size):
+    pointer = Path(str(path) + POINTER_SUFFIX)
+    with open(pointer, "w", encoding="utf-8") as f:
+        json.dump({"hash": digest, "size": size}, f)
+
+
+def intern_file(mods_folder, path, inodes=None):
+    """Move one pak into the store and leave a link (or pointer) behind.
+
+    Returns the number of bytes saved (size of the pak if an identical blob
+    already existed, else 0). `inodes` is an optional _inode_map() to reuse.
+    """
+    path = Path(path)
+    st = os.stat(path)
+    if inodes is None:
+        inodes = _inode_map(mods_folder)
+    if (st.st_dev, st.st_ino) in inodes:
+        return 0  # Already a link to a blob
+
+    digest = hash_file(path)
+    blob = _blob_path(mods_folder, digest)
+    blob.parent.mkdir(parents=True, exist_ok=True)
+
+    if blob.exists():
+        # Duplicate: swap the file for a link to the existing blob (atomic replace)
+        tmp = path.with_name(f".pum_tmp_{path.name}")
+        try:
+            if os.path.lexists(tmp):
+                os.remove(tmp)
+            os.link(blob, tmp)
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            # No hardlinks here: keep a pointer instead of the duplicate
+            _write_pointer(path, digest, st.st_size)
+            os.remove(path)
+        return st.st_size
+
+    try:
+        # New content: the store just takes another name for the same file
+        os.link(path, blob)
+    except OSError:
+        os.replace(path, blob)
+        _write_pointer(path, digest, st.st_size)
+    _seal(blob)
+    bst = os.stat(blob)
+    inodes[(bst.st_dev, bst.st_ino)] = digest
+    return 0
+
+
+def intern_mods(mods_folder, mod_dirs):
+    """Intern every pak of `mod_dirs`. Returns {"files", "deduped", "bytes_saved", "errors"}."""
+    report = {"files": 0, "deduped": 0, "bytes_saved": 0, "errors": []}
+    inodes = _inode_map(mods_folder)
+    for mod_dir in mod_dirs:
+        assets = Path(mod_dir) / "assets"
+        try:
+            paks = [e.path for e in os.scandir(assets) if e.name.lower().endswith(".pak") and e.is_file()]
+        except OSError:
+            continue
+        for pak in paks:
+            try:
+                saved = intern_file(mods_folder, pak, inodes)
+                report["files"] += 1
+                if saved:
+                    report["deduped"] += 1
+                    report["bytes_saved"] += saved
+            except Exception as e:
+                report["errors"].append(f"{pak}: {e}")
+    seal_store(mods_folder)
+    return report
+
+
+def intern_library(mods_folder):
+    """Intern every mod in `mods_folder` (the first run after enabling the store)."""
+    mods_folder = Path(mods_folder)
+    dirs = []
+    try:
+        with os.scandir(mods_folder) as it:
+            dirs = [e.path for e in it if not e.name.startswith(".") and e.is_dir()]
+    except OSError:
+        pass
+    return intern_mods(mods_folder, dirs)
+
+
+def _pointer_refs(mods_folder):
+    """{digest: count} of pointer files in the library."""
+    refs = {}
+    try:
+        mods = [e.path for e in os.scandir(mods_folder) if not e.name.startswith(".") and e.is_dir()]
+    except OSError:
+        return refs
+    for mod in mods:
+        try:
+            with os.scandir(os.path.join(mod, "assets")) as it:
+                for e in it:
+                    if e.name.endswith(POINTER_SUFFIX):
+                        digest = read_pointer(e.path)
+                        if digest:
+                            refs[digest] = refs.get(digest, 0) + 1
+        except OSError:
+            continue
+    return refs
+
+
+def store_report(mods_folder):
+    """Space used by the store vs what the same references would take as plain files.
+
+    Returns {"blobs", "stored_bytes", "logical_bytes", "reclaimed_bytes", "unreferenced"}.
+    Link counts include copies hardlinked into ~mods by the hardlink deploy mode.
+    """
+    pointers = _pointer_refs(mods_folder)
+    report = {"blobs": 0, "stored_bytes": 0, "logical_bytes": 0, "reclaimed_bytes": 0, "unreferenced": 0}
+    for digest, _, st in _iter_blobs(mods_folder):
+        refs = (st.st_nlink - 1) + pointers.get(digest, 0)
+        report["blobs"] += 1
+        report["stored_bytes"] += st.st_size
+        report["logical_bytes"] += st.st_size * max(refs, 1)
+        if refs <= 0:
+            report["unreferenced"] += 1
+    report["reclaimed_bytes"] = report["logical_bytes"] - report["stored_bytes"]
+    return report
+
+
+def gc(mods_folder, dry_run=False):
+    """Remove blobs no mod references any more. Returns {"removed", "bytes_freed"}."""
+    pointers = _pointer_refs(mods_folder)
+    result = {"removed": 0, "bytes_freed": 0}
+    for digest, path, st in list(_iter_blobs(mods_folder)):
+        if st.st_nlink > 1 or pointers.get(digest):
+            continue
+        try:
+            if not dry_run:
+                remove_file(path)
+            result["removed"] += 1
+            result["bytes_freed"] += st.st_size
+        except OSError as e:
+            print(f"Error removing blob {digest}: {e}")
+    return result
@@ -0,0 +1,199 @@
+"""
+search_index.py
+
+In-memory search index over the scanned mod metadata.
+
+Indexes name, author, category and description as word tokens, plus a trigram
+index over the vocabulary so queries can match prefixes, substrings and words
+with a typo or two ("mirio", "deku skn"). Every word of the query has to match
+something; results are ranked by how well and in which field they matched
+(a hit in the name counts more than one in the description).
+
+The index is updated per mod (`update`/`remove`), so it can follow the list
+reconcile instead of being rebuilt on every refresh.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Field weights: matches in the name rank above author/category/description
+FIELDS = (("name", 4.0), ("author", 2.0), ("category", 1.5), ("description", 1.0))
+
+# How much each kind of match is worth relative to an exact word match
+EXACT, PREFIX, SUBSTRING, FUZZY = 1.0, 0.8, 0.6, 0.45
+
+# Minimum trigram similarity for a typo-tolerant match
+FUZZY_THRESHOLD = 0.45
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text) -> str:
+    """Lowercase and strip accents so 'Pokémon' matches 'pokemon'."""
+    text = unicodedata.normalize("NFKD", str(text or "").lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text) -> List[str]:
+    return _WORD_RE.findall(normalize(text))
+
+
+def _trigrams(token: str):
+    padded = f" {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_edits(a: str, b: str, max_edits: int) -> bool:
+    """Optimal string alignment distance (edits + adjacent swaps) <= max_edits."""
+    if abs(len(a) - len(b)) > max_edits:
+        return False
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if prev2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_edits:
+            return False
+        prev2, prev = prev, cur
+    return prev[-1] <= max_edits
+
+
+class SearchIndex:
+    def __init__(self):
+        self._doc_tokens: Dict[str, Dict[str, float]] = {}  # key -> {token: best field weight}
+        self._postings: Dict[str, Dict[str, float]] = {}    # token -> {key: best field weight}
+        self._trigram_postings: Dict[str, set] = {}          # trigram -> tokens containing it
+        self._sorted_vocab: List[str] = []
+        self._vocab_dirty = False
+        self._names: Dict[str, str] = {}
+
+    def __len__(self):
+        return len(self._doc_tokens)
+
+    # --- Maintenance ---
+    def build(self, items):
+        """(Re)build the index from an iterable of (key, mod_info)."""
+        self.__init__()
+        for key, mod in items:
+            self.update(key, mod)
+
+    def update(self, key, mod):
+        self.remove(key)
+        tokens = {}
+        for field, weight in FIELDS:
+            for tok in tokenize(mod.get(field, "")):
+                if tokens.get(tok, 0) < weight:
+                    tokens[tok] = weight
+        self._doc_tokens[key] = tokens
+        self._names[key] = normalize(mod.get("name", ""))
+        for tok, weight in tokens.items():
+            posting = self._postings.get(tok)
+            if posting is None:
+                posting = self._postings[tok] = {}
+                for tri in _trigrams(tok):
+                    self._trigram_postings.setdefault(tri, set()).add(tok)
+                self._vocab_dirty = True
+            posting[key] = weight
+
+    def remove(self, key):
+        tokens = self._doc_tokens.pop(key, None)
+        self._names.pop(key, None)
+        if not tokens:
+            return
+        for tok in tokens:
+            posting = self._postings.get(tok)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self._postings[tok]
+                for tri in _trigrams(tok):
+                    bucket = self._trigram_postings.get(tri)
+                    if bucket is not None:
+                        bucket.discard(tok)
+                        if not bucket:
+                            del self._trigram_postings[tri]
+                self._vocab_dirty = True
+
+    # --- Querying ---
+    def _vocab(self):
+        if self._vocab_dirty:
+            self._sorted_vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        return self._sorted_vocab
+
+    def _candidate_tokens(self, q: str) -> Dict[str, float]:
+        """Return {vocabulary token: match quality} for one query word."""
+        found = {}
+        if q in self._postings:
+            found[q] = EXACT
+
+        # Prefix matches via the sorted vocabulary
+        vocab = self._vocab()
+        i = bisect_left(vocab, q)
+        while i < len(vocab) and vocab[i].startswith(q):
+            found.setdefault(vocab[i], PREFIX)
+            i += 1
+
+        if len(q) < 3:
+            return found
+
+        # Substring and typo-tolerant matches through shared trigrams
+        q_tris = _trigrams(q)
+        counts = {}
+        for tri in q_tris:
+            for tok in self._trigram_postings.get(tri, ()):
+                counts[tok] = counts.get(tok, 0) + 1
+        max_edits = 1 if len(q) < 8 else 2
+        for tok, shared in counts.items():
+            if tok in found:
+                continue
+            if q in tok:
+                found[tok] = SUBSTRING
+                continue
+            # A padded token of length n has n trigrams
+            similarity = shared / (len(q_tris) + len(tok) - shared)
+            if similarity >= FUZZY_THRESHOLD:
+                found[tok] = FUZZY * min(1.0, similarity)
+            elif _within_edits(q, tok, max_edits):
+                # Short words share few trigrams; fall back to a bounded edit distance
+                found[tok] = FUZZY * 0.8
+        return found
+
+    def search(self, query, limit=None) -> List[Tuple[str, float]]:
+        """Return [(key, score)] best first. An empty query returns []."""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        scores = None
+        for q in dict.fromkeys(words):
+            word_scores = {}
+            for tok, quality in self._candidate_tokens(q).items():
+                for key, weight in self._postings[tok].items():
+                    s = weight * quality
+                    if s > word_scores.get(key, 0):
+                        word_scores[key] = s
+            if scores is None:
+                scores = word_scores
+            else:
+                # Every query word must match: keep the intersection
+                scores = {k: v + word_scores[k] for k, v in scores.items() if k in word_scores}
+            if not scores:
+                return []
+
+        # Small bonus when the whole query appears in the name as typed
+        phrase = normalize(query).strip()
+        if phrase:
+            for key in scores:
+                if phrase in self._names.get(key, ""):
+                    scores[key] += 1.0
+
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], self._names.get(kv[0], "")))
+        return ranked[:limit] if limit else ranked
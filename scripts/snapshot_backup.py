@@ -0,0 +1,372 @@
+"""
+snapshot_backup.py
+
+Deduplicated snapshot backups of the game's ~mods folder.
+
+Instead of zipping every pak again before each deploy, each unique pak is
+stored once in `backups/objects/<2 hex>/<sha256>` and a backup is just a small
+manifest in `backups/snapshots/<id>.json` listing name, size, mtime and hash of
+every pak in ~mods at that moment.
+
+Files whose size/mtime match the previous snapshot reuse its hash without being
+read, so backing up an unchanged ~mods costs a few stats; if nothing changed
+at all no new snapshot is written. Retention keeps the newest N manifests and
+then deletes the objects no remaining manifest references.
+
+Zip backups from older versions (`backups/mods_backup_<timestamp>.zip`) are
+converted into snapshots by `migrate_legacy()`, so they can be listed,
+restored and pruned like the rest.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+from scripts.deploy import copy_with_hash, hash_file
+
+BACKUP_DIR = Path("backups")
+SNAPSHOT_VERSION = 1
+DEFAULT_KEEP = 10
+LEGACY_PREFIX = "mods_backup_"
+
+_CHUNK = 1024 * 1024
+_migrate_lock = threading.Lock()
+
+
+def _objects(backup_root) -> Path:
+    return Path(backup_root) / "objects"
+
+
+def _snapshots(backup_root) -> Path:
+    return Path(backup_root) / "snapshots"
+
+
+def object_path(backup_root, digest) -> Path:
+    return _objects(backup_root) / digest[:2] / digest
+
+
+def list_snapshots(backup_root=BACKUP_DIR):
+    """[{"id", "created", "files", "size"}] newest first."""
+    result = []
+    try:
+        names = [p for p in _snapshots(backup_root).glob("*.json")]
+    except OSError:
+        return result
+    for path in names:
+        snap = load_snapshot(backup_root, path.stem)
+        if snap is None:
+            continue
+        result.append({"id": path.stem, "created": snap.get("created", ""),
+                       "files": len(snap["files"]), "size": sum(f["size"] for f in snap["files"].values())})
+    result.sort(key=lambda s: s["id"], reverse=True)
+    return result
+
+
+def load_snapshot(backup_root, snapshot_id):
+    try:
+        with open(_snapshots(backup_root) / f"{snapshot_id}.json", "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and data.get("version") == SNAPSHOT_VERSION:
+            data.setdefault("files", {})
+            return data
+    except Exception:
+        pass
+    return None
+
+
+def _write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _store_stream(backup_root, src, name):
+    """Write an open binary stream into the object store. Returns (hash, size)."""
+    h = hashlib.sha256()
+    size = 0
+    tmp = _objects(backup_root) / f".tmp_{os.getpid()}_{name}"
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(tmp, "wb") as dst:
+            for chunk in iter(lambda: src.read(_CHUNK), b""):
+                h.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        digest = h.hexdigest()
+        dest = object_path(backup_root, digest)
+        if dest.exists():
+            os.remove(tmp)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, dest)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return digest, size
+
+
+def list_legacy(backup_root=BACKUP_DIR):
+    """Zip backups written by older versions, oldest first."""
+    try:
+        return sorted(Path(backup_root).glob(f"{LEGACY_PREFIX}*.zip"))
+    except OSError:
+        return []
+
+
+def migrate_legacy(backup_root=BACKUP_DIR):
+    """Turn every legacy `mods_backup_<timestamp>.zip` into a snapshot and delete the zip.
+
+    The snapshot id is the zip's timestamp, so it sorts with the others. A zip
+    that cannot be read is left where it is. Returns the new snapshot ids.
+    """
+    backup_root = Path(backup_root)
+    migrated = []
+    with _migrate_lock:
+        for path in list_legacy(backup_root):
+            snapshot_id = path.stem[len(LEGACY_PREFIX):]
+            manifest = _snapshots(backup_root) / f"{snapshot_id}.json"
+            try:
+                files = {}
+                with zipfile.ZipFile(path) as zf:
+                    for info in zf.infolist():
+                        name = info.filename
+                        if info.is_dir() or "/" in name or not name.lower().endswith(".pak"):
+                            continue
+                        with zf.open(info) as src:
+                            digest, size = _store_stream(backup_root, src, name)
+                        mtime = time.mktime(info.date_time + (0, 0, -1))
+                        files[name] = {"hash": digest, "size": size, "mtime_ns": int(mtime * 1_000_000_000)}
+                try:
+                    created = time.strptime(snapshot_id, "%Y%m%d_%H%M%S")
+                except ValueError:
+                    created = time.localtime(path.stat().st_mtime)
+                if not manifest.exists():
+                    _write_json(manifest, {
+                        "version": SNAPSHOT_VERSION,
+                        "created": time.strftime("%Y-%m-%d %H:%M:%S", created),
+                        "target": "",
+                        "files": files,
+                    })
+                    migrated.append(snapshot_id)
+                os.remove(path)
+            except Exception as e:
+                print(f"Error migrating backup {path.name}: {e}")
+    return migrated
+
+
+def create_snapshot(target, backup_root=BACKUP_DIR, keep=DEFAULT_KEEP):
+    """Back up every *.pak in `target`.
+
+    Returns {"id", "files", "reused", "new_objects", "bytes_new", "bytes_total",
+    "unchanged"}; "unchanged" is True when ~mods matched the latest snapshot
+    exactly and no new manifest was written (then "id" is that snapshot's id).
+    """
+    target = Path(target)
+    backup_root = Path(backup_root)
+    # Old zip backups become snapshots, so the retention below covers them too
+    migrated = migrate_legacy(backup_root)
+    latest = list_snapshots(backup_root)
+    previous = load_snapshot(backup_root, latest[0]["id"]) if latest else None
+    prev_files = previous["files"] if previous else {}
+
+    report = {"id": None, "files": 0, "reused": 0, "new_objects": 0, "bytes_new": 0, "bytes_total": 0,
+              "unchanged": False}
+    files = {}
+    for pak in sorted(target.glob("*.pak")):
+        st = pak.stat()
+        prev = prev_files.get(pak.name)
+        report["files"] += 1
+        report["bytes_total"] += st.st_size
+        if prev and prev["size"] == st.st_size and prev["mtime_ns"] == st.st_mtime_ns \
+                and object_path(backup_root, prev["hash"]).exists():
+            # Same size/mtime as last time: reuse the hash without reading the file
+            files[pak.name] = dict(prev)
+            report["reused"] += 1
+            continue
+
+        # Copy to a temp file while hashing, then keep it only if the content is new
+        tmp = _objects(backup_root) / f".tmp_{os.getpid()}_{pak.name}"
+        tmp.parent.mkdir(parents=True, exist_ok=True)
+        digest = copy_with_hash(pak, tmp)
+        dest = object_path(backup_root, digest)
+        if dest.exists():
+            os.remove(tmp)
+        else:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, dest)
+            report["new_objects"] += 1
+            report["bytes_new"] += st.st_size
+        files[pak.name] = {"hash": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    if previous is not None and files == prev_files:
+        report["id"] = latest[0]["id"]
+        report["unchanged"] = True
+        if migrated and keep:
+            prune(backup_root, keep)
+        return report
+
+    snapshot_id = time.strftime("%Y%m%d_%H%M%S")
+    # Two backups in the same second: keep ids unique and sortable
+    n = 1
+    while (_snapshots(backup_root) / f"{snapshot_id}.json").exists():
+        snapshot_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{n}"
+        n += 1
+    _write_json(_snapshots(backup_root) / f"{snapshot_id}.json", {
+        "version": SNAPSHOT_VERSION,
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "target": str(target),
+        "files": files,
+    })
+    report["id"] = snapshot_id
+    if keep:
+        prune(backup_root, keep)
+    return report
+
+
+def prune(backup_root=BACKUP_DIR, keep=DEFAULT_KEEP):
+    """Keep the newest `keep` manifests, then drop objects nothing references.
+
+    Returns {"snapshots_removed", "objects_removed", "bytes_freed"}.
+    """
+    backup_root = Path(backup_root)
+    result = {"snapshots_removed": 0, "objects_removed": 0, "bytes_freed": 0}
+    snaps = list_snapshots(backup_root)
+    for snap in snaps[keep:]:
+        try:
+            os.remove(_snapshots(backup_root) / f"{snap['id']}.json")
+            result["snapshots_removed"] += 1
+        except OSError as e:
+            print(f"Error removing snapshot {snap['id']}: {e}")
+
+    referenced = set()
+    for snap in snaps[:keep]:
+        data = load_snapshot(backup_root, snap["id"])
+        if data is not None:
+            referenced.update(f["hash"] for f in data["files"].values())
+
+    objects = _objects(backup_root)
+    try:
+        buckets = [b for b in objects.iterdir() if b.is_dir()]
+    except OSError:
+        return result
+    for bucket in buckets:
+        for obj in bucket.iterdir():
+            if obj.name in referenced:
+                continue
+            try:
+                size = obj.stat().st_size
+                os.remove(obj)
+                result["objects_removed"] += 1
+                result["bytes_freed"] += size
+            except OSError:
+                pass
+    return result
+
+
+def plan_restore(backup_root, snapshot_id, target):
+    """Diff snapshot `snapshot_id` against the current *.pak files in `target`. No side effects.
+
+    Files with the snapshot's size and mtime are kept as they are; same size
+    but different mtime are hashed to be sure. Returns {"write": [(name, hash,
+    size)], "keep": [(name, size)], "delete": [name], "missing": [name]};
+    "missing" lists files whose object is gone from the store.
+    """
+    snap = load_snapshot(backup_root, snapshot_id)
+    if snap is None:
+        raise FileNotFoundError(f"Backup {snapshot_id} not found")
+    target = Path(target)
+    plan = {"write": [], "keep": [], "delete": [], "missing": []}
+
+    current = {}
+    try:
+        for pak in target.glob("*.pak"):
+            current[pak.name] = pak
+    except OSError:
+        pass
+
+    for name, rec in sorted(snap["files"].items()):
+        if not object_path(backup_root, rec["hash"]).exists():
+            plan["missing"].append(name)
+            continue
+        path = current.get(name)
+        same = False
+        if path is not None:
+            try:
+                st = path.stat()
+                if st.st_size == rec["size"]:
+                    same = st.st_mtime_ns == rec["mtime_ns"] or hash_file(path) == rec["hash"]
+            except OSError:
+                same = False
+        if same:
+            plan["keep"].append((name, rec["size"]))
+        else:
+            plan["write"].append((name, rec["hash"], rec["size"]))
+
+    plan["delete"] = sorted(name for name in current if name not in snap["files"])
+    return plan
+
+
+def restore(backup_root, snapshot_id, target, dry_run=False):
+    """Bring `target` back to snapshot `snapshot_id`, touching only what differs.
+
+    Returns the plan plus {"seconds", "bytes_written", "bytes_kept", "written",
+    "deleted", "errors", "dry_run"}.
+    """
+    start = time.perf_counter()
+    target = Path(target)
+    plan = plan_restore(backup_root, snapshot_id, target)
+    report = dict(plan)
+    report.update({"bytes_written": sum(size for _, _, size in plan["write"]),
+                   "bytes_kept": sum(size for _, size in plan["keep"]),
+                   "written": 0, "deleted": 0, "errors": [], "dry_run": dry_run})
+    if dry_run:
+        report["seconds"] = time.perf_counter() - start
+        return report
+
+    snap = load_snapshot(backup_root, snapshot_id)
+    target.mkdir(parents=True, exist_ok=True)
+    for name in plan["delete"]:
+        try:
+            path = target / name
+            try:
+                os.remove(path)
+            except PermissionError:
+                os.chmod(path, 0o777)
+                os.remove(path)
+            report["deleted"] += 1
+        except OSError as e:
+            report["errors"].append(f"{name}: {e}")
+
+    for name, digest, _size in plan["write"]:
+        dest = target / name
+        tmp = target / f".pum_restore_{name}"
+        try:
+            copy_with_hash(object_path(backup_root, digest), tmp)
+            # Keep the snapshot's mtime so the next backup recognises the file
+            rec = snap["files"][name]
+            os.utime(tmp, ns=(rec["mtime_ns"], rec["mtime_ns"]))
+            if os.path.lexists(dest):
+                try:
+                    os.remove(dest)
+                except PermissionError:
+                    os.chmod(dest, 0o777)
+                    os.remove(dest)
+            os.replace(tmp, dest)
+            report["written"] += 1
+        except OSError as e:
+            report["errors"].append(f"{name}: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    report["seconds"] = time.perf_counter() - start
+    return report